@@ -0,0 +1,90 @@
+# backend/app/api/admin.py
+"""
+Operational endpoints, restricted to ADMIN_EMAILS.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from ..api.auth import get_admin_user, token_verifier
+from ..logs import logging_stats
+from ..services.rate_limit import rate_limiter
+from ..services.scheduler import generation_scheduler
+from ..services.markdown_render import converter_pool, process_renderer, render_cache
+from ..services.presentation_cache import presentation_cache
+from ..services.persistence import write_behind
+from ..services.usage import usage_tracker
+from ..services.profiling import collapsed, profiler
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get("/scheduler")
+async def get_scheduler_stats(admin_user = Depends(get_admin_user)):
+    """Per-user queue depth and wait times of the generation scheduler."""
+    return generation_scheduler.stats()
+
+@router.get("/caches")
+async def get_cache_stats(admin_user = Depends(get_admin_user)):
+    """Hit rates of the in-process caches."""
+    # Imported here so Pygments stays out of the server's startup path
+    from ..services.highlight import highlight_cache
+    return {
+        "markdown_render": {
+            **render_cache.stats(),
+            "converters_created": converter_pool.created,
+            "parallel_renders": process_renderer.parallel_renders,
+        },
+        # Counted in this process only; render pool workers keep their own caches
+        "highlight": highlight_cache.stats(),
+        "auth_tokens": token_verifier.stats(),
+        # Counts the shared SQLite tier's rows, which can wait on another worker
+        "presentations": (
+            await run_in_threadpool(presentation_cache.stats) if presentation_cache.blocking
+            else presentation_cache.stats()
+        ),
+    }
+
+@router.get("/write-behind")
+async def get_write_behind_stats(admin_user = Depends(get_admin_user)):
+    """Grouped commits of bulk job results: writes per commit, queue depth and lag."""
+    return write_behind.stats()
+
+@router.get("/usage")
+async def get_usage_stats(admin_user = Depends(get_admin_user)):
+    """LLM calls, tokens and cost per stage since startup, with token and latency histograms."""
+    return usage_tracker.stats()
+
+@router.get("/logging")
+async def get_logging_stats(admin_user = Depends(get_admin_user)):
+    """Depth of the log queue and records dropped because it was full."""
+    return logging_stats()
+
+@router.get("/profiles/{presentation_id}")
+async def list_profiles(presentation_id: str, admin_user = Depends(get_admin_user)):
+    """Profiles recorded for a presentation, newest first (without the stacks)."""
+    try:
+        return profiler.store.list(presentation_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid presentation ID format")
+
+@router.get("/profiles/{presentation_id}/{profile_id}")
+async def get_profile(
+    presentation_id: str,
+    profile_id: str,
+    format: str = Query("json", pattern="^(json|collapsed)$"),
+    admin_user = Depends(get_admin_user)
+):
+    """One profile; format=collapsed returns flamegraph.pl / speedscope input."""
+    try:
+        profile = profiler.store.get(presentation_id, profile_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid presentation or profile ID")
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(collapsed(profile))
+    return profile
+
+@router.get("/rate-limits")
+async def get_rate_limit_stats(admin_user = Depends(get_admin_user)):
+    """Active rate-limit keys, configured rules and allowed/rejected counts."""
+    return rate_limiter.stats()
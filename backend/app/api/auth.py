@@ -3,17 +3,18 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from ..config import settings
 from ..db import get_db_session
+from ..logs import get_logger
+from ..services.providers import get_supabase, supabase_configured
+from ..services.token_verifier import TokenRejected, TokenVerifier
 import jwt
 from datetime import datetime, timedelta
 import uuid
 from typing import Optional
 from pydantic import BaseModel
 
-router = APIRouter(tags=["Authentication"])
+logger = get_logger("auth")
 
-# Debug information
-print(f"Auth setup - Supabase URL: {settings.supabase_url}")
-print(f"Auth setup - Using Supabase: {bool(settings.supabase_url and settings.supabase_service_key)}")
+router = APIRouter(tags=["Authentication"])
 
 # JWT settings
 JWT_SECRET = settings.jwt_secret or "development_secret_key"
@@ -32,17 +33,18 @@ MOCK_USERS = {
     }
 }
 
-# Try to initialize Supabase client
-supabase = None
-if settings.supabase_url and settings.supabase_service_key: # Check for the SERVICE key
-    try:
-        from supabase import create_client
-        # THE FIX: Initialize the client with the SERVICE_ROLE_KEY
-        supabase = create_client(settings.supabase_url, settings.supabase_service_key)
-        print("Supabase client initialized successfully with SERVICE ROLE.")
-    except Exception as e:
-        print(f"Failed to initialize Supabase client: {e}")
-        supabase = None
+def _remote_user(token: str):
+    user = get_supabase().auth.get_user(token).user
+    return {"id": str(user.id), "email": user.email} if user else None
+
+token_verifier = TokenVerifier(
+    secret=settings.jwt_secret if settings.supabase_jwt_secret_set else "",
+    jwks_url=settings.supabase_jwks_url if supabase_configured() else "",
+    audience=settings.supabase_jwt_audience,
+    revocation_interval=settings.auth_revocation_check_seconds,
+    max_entries=settings.auth_token_cache_size,
+    remote_check=_remote_user if supabase_configured() else None,
+)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -51,26 +53,30 @@ def create_access_token(data: dict):
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
-    print(f"get_current_user called with token: {token[:20]}...")
-    print(f"supabase is None: {supabase is None}")
-    
+    supabase = get_supabase()
+
     if not supabase:
         # Fallback to mock user logic if Supabase isn't configured
-        print("Using mock auth")
         try:
             payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
             user_id = payload.get("sub")
             email = payload.get("email")
-            print(f"Decoded payload: user_id={user_id}, email={email}")
             if not user_id or not email:
                 raise HTTPException(status_code=401, detail="Invalid token")
             return {"id": user_id, "email": email}
         except jwt.PyJWTError as e:
-            print(f"JWT decode error: {e}")
+            logger.info(f"JWT decode error: {e}")
             raise HTTPException(status_code=401, detail="Invalid token")
 
-    # The correct way: Validate the token with Supabase
-    print("Using Supabase auth")
+    if settings.auth_local_verification:
+        # Verified locally and cached; Supabase is only asked about revocation
+        try:
+            return token_verifier.verify(token)
+        except TokenRejected as e:
+            logger.info(f"Supabase auth error: {e}")
+            raise HTTPException(status_code=401, detail="Could not validate credentials")
+
+    # Validate the token with Supabase on every request
     try:
         user_response = supabase.auth.get_user(token)
         user = user_response.user
@@ -80,9 +86,58 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         # Return a consistent user object
         return {"id": str(user.id), "email": user.email}
     except Exception as e:
-        print(f"Supabase auth error: {e}")
+        logger.info(f"Supabase auth error: {e}")
         raise HTTPException(status_code=401, detail="Could not validate credentials")
 
+def user_from_token(token: str, remote: bool = False):
+    """
+    {"id", "email"} of the token's user, or None if it does not verify. Never raises.
+    With AUTH_LOCAL_VERIFICATION=false tokens can only be checked by asking
+    Supabase, which is done only when `remote` is set; otherwise the result is None.
+    """
+    try:
+        if not supabase_configured():
+            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+            return {"id": payload.get("sub"), "email": payload.get("email")}
+        if settings.auth_local_verification:
+            return token_verifier.verify(token)
+        if remote:
+            supabase = get_supabase()
+            user = supabase.auth.get_user(token).user if supabase else None
+            return {"id": str(user.id), "email": user.email} if user else None
+    except (jwt.PyJWTError, TokenRejected):
+        pass
+    except Exception as e:
+        logger.info(f"Supabase auth error: {e}")
+    return None
+
+def token_check_may_block(token: str, remote: bool = False) -> bool:
+    """Whether user_from_token(token, remote) could make a network call (JWKS fetch, revocation check, user lookup)."""
+    if not supabase_configured():
+        return False
+    if settings.auth_local_verification:
+        return not token_verifier.is_cached(token)
+    return remote
+
+def user_id_from_token(token: str):
+    """The user id a token belongs to, or None if it does not verify. Never raises."""
+    user = user_from_token(token)
+    return user["id"] if user else None
+
+def is_admin_token(token: str) -> bool:
+    """
+    Whether the token verifies and belongs to an ADMIN_EMAILS user. Never raises.
+    Asks Supabase when tokens are not verified locally (see token_check_may_block).
+    """
+    user = user_from_token(token, remote=True)
+    return bool(user) and (user.get("email") or "").lower() in settings.admin_emails
+
+async def get_admin_user(current_user = Depends(get_current_user)):
+    """Allow only users whose email is listed in ADMIN_EMAILS."""
+    if (current_user.get("email") or "").lower() not in settings.admin_emails:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
 
 # Add a proper request model
 class UserRegistration(BaseModel):
@@ -92,6 +147,7 @@ class UserRegistration(BaseModel):
 
 @router.post("/auth/register")
 async def register(user_data: UserRegistration):
+    supabase = get_supabase()
     if not supabase:
         # Mock implementation for development
         if user_data.email in MOCK_USERS:
@@ -138,14 +194,12 @@ async def register(user_data: UserRegistration):
 
 @router.post("/auth/token")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    print(f"Login attempt: {form_data.username}")
-    print(f"Available users: {list(MOCK_USERS.keys())}")
+    supabase = get_supabase()
     if not supabase:
         # Mock implementation
         user = MOCK_USERS.get(form_data.username)
-        print(f"Found user: {user is not None}")
         if not user or user["password"] != form_data.password:
-            print(f"Login failed for {form_data.username}")
+            logger.info(f"Login failed for {form_data.username}")
             raise HTTPException(status_code=401, detail="Incorrect email or password")
         
         return {
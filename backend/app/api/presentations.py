@@ -1,124 +1,379 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..db import get_db_session, SessionLocal # Import SessionLocal
+from ..db import get_async_db_session, SessionLocal # Import SessionLocal
 from ..api.auth import get_current_user
 from ..models import Presentation
-from ..schemas import PresentationCreate, PresentationResponse
+from ..config import settings
+from ..logs import get_logger
+from ..schemas import (
+    PresentationCreate, PresentationResponse,
+    PresentationVersionResponse, PresentationVersionDetail, PresentationVersionDiff,
+    BulkGenerateRequest, BulkGenerateResponse, BatchStatusResponse,
+    PresentationSearchResponse,
+)
 from ..llm.graph import build_pipeline
+from ..llm.state import JobContext
+from ..services import versions
+from ..services.persistence import PresentationWrite, persist
+from ..services.search import search_presentations
+from ..services.presentation_cache import cache_key, presentation_cache
+from ..services.profiling import profiled_job
+from ..services.batches import BatchItem, batch_registry
+from ..services.scheduler import generation_scheduler
+from ..services.admission import check_admission
+from ..services.document import chunked
+from ..services.reveal import resolve_local_theme, stream_local_reveal
+from ..services.cancellation import CancellationToken, JobCancelled, JobDeadlineExceeded, job_registry
+import time
 import uuid
 
+logger = get_logger("api.presentations")
+
 router = APIRouter(prefix="/presentations", tags=["Presentations"])
 
-def run_generation_pipeline(presentation_id: str, user_id: str, markdown_input: str, title: str, theme: str = "ai-suggest"):
+def _user_tier(current_user) -> str:
+    """Scheduler tier for a user's interactive requests."""
+    return "paid" if current_user["id"] in settings.paid_user_ids else "interactive"
+
+async def _get_owned_presentation(db: AsyncSession, presentation_id: str, user_id: str) -> Presentation:
+    try:
+        result = await db.execute(select(Presentation).where(
+            Presentation.id == uuid.UUID(presentation_id),
+            Presentation.user_id == uuid.UUID(user_id)
+        ))
+        presentation = result.scalars().first()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid presentation ID format")
+
+    if not presentation:
+        raise HTTPException(status_code=404, detail="Presentation not found")
+    return presentation
+
+async def _cache_call(fn, *args):
+    """Call a presentation cache method, off the event loop when it uses the shared SQLite tier."""
+    if presentation_cache.blocking:
+        return await run_in_threadpool(fn, *args)
+    return fn(*args)
+
+async def _cached_presentation_response(db: AsyncSession, presentation_id: str, user_id: str) -> Response:
+    """The presentation's JSON, from the read-through cache when possible."""
+    try:
+        key = cache_key(user_id, presentation_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid presentation ID format")
+
+    payload = presentation_cache.get_local(key)
+    if payload is None:
+        payload = await _cache_call(presentation_cache.get_shared, key)
+    if payload is None:
+        stamp = presentation_cache.begin()
+        presentation = await _get_owned_presentation(db, presentation_id, user_id)
+        payload = PresentationResponse.model_validate(presentation).model_dump_json().encode("utf-8")
+        await _cache_call(presentation_cache.put, key, payload, presentation.status, stamp)
+    return Response(content=payload, media_type="application/json")
+
+def _mark_failed(db: Session, presentation_id: str, user_id: str, priority: str, job_id: Optional[str]) -> None:
+    persist(db, PresentationWrite(presentation_id, user_id, {"status": "failed"}, expect_job_id=job_id), priority)
+
+@profiled_job
+def run_generation_pipeline(
+    presentation_id: str,
+    user_id: str,
+    markdown_input: str,
+    title: str,
+    theme: str = "ai-suggest",
+    priority: str = "interactive",
+    cancel_token: Optional[CancellationToken] = None,
+    render_mode: str = "llm",
+    upgrade: bool = False,
+    preview_theme: Optional[str] = None,
+) -> str:
     """
     This function runs in the background and manages its own database session.
+    Returns the final status of the presentation.
+    With upgrade=True the job replaces a local preview (rendered with
+    `preview_theme`) with the LLM render: the preview is kept if the job
+    fails or the deck's markdown or theme was edited meanwhile.
     """
+    # Superseded or deleted while still queued: nothing to do
+    if cancel_token and cancel_token.event.is_set():
+        return "cancelled"
+    if cancel_token:
+        cancel_token.arm()
+
     db = SessionLocal() # Create a new, independent session
+    job = JobContext(user_id=user_id, presentation_id=presentation_id, priority=priority, cancel_token=cancel_token)
     try:
-        pipeline = build_pipeline(db, user_id, title)
-        result = pipeline.invoke({"markdown_input": markdown_input, "title": title, "theme": theme})
-
-        presentation = db.query(Presentation).filter(Presentation.id == presentation_id).first()
-        if presentation:
-            # Update with the correct field names from pipeline result
-            presentation.markdown_content = result.get('improved_markdown', result.get('markdown_input', ''))
-            presentation.html_content = result.get('html_content', '')
-            presentation.theme = result.get('theme', 'black')
-            presentation.status = "complete"
-            db.commit()
-    except Exception as e:
-        print(f"Background task failed: {e}")
-        presentation = db.query(Presentation).filter(Presentation.id == presentation_id).first()
-        if presentation:
-            presentation.status = "failed"
-            db.commit()
+        pipeline = build_pipeline(db, user_id, render_mode)
+        # The persist node writes the result; a newer job's token stops this one before it gets there
+        pipeline.invoke({
+            "markdown_input": markdown_input, "title": title, "theme": theme, "job": job,
+            "presentation_id": presentation_id, "upgrade": upgrade, "preview_theme": preview_theme,
+        })
+        return "complete"
+    except JobCancelled as e:
+        db.rollback()
+        if not isinstance(e, JobDeadlineExceeded):
+            logger.info(f"Generation for {presentation_id} stopped: {e}")
+            return "cancelled"
+        logger.warning(f"Generation for {presentation_id} ran past its deadline")
+        if upgrade:
+            return "complete"
+        _mark_failed(db, presentation_id, user_id, priority, cancel_token.id if cancel_token else None)
+        return "failed"
+    except Exception:
+        logger.exception(f"Generation for {presentation_id} failed")
+        db.rollback()
+        if upgrade:
+            # The local preview is still a complete deck
+            return "complete"
+        _mark_failed(db, presentation_id, user_id, priority, cancel_token.id if cancel_token else None)
+        return "failed"
     finally:
         db.close() # Close the independent session
+        if cancel_token:
+            job_registry.finish(presentation_id, cancel_token)
 
-@router.post("/generate", status_code=status.HTTP_202_ACCEPTED)
-async def generate_presentation(
-    data: PresentationCreate,
-    background_tasks: BackgroundTasks,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
-):
-    """Initiate a presentation generation job."""
+def _upsert_pending_presentation(db: Session, user_id: str, data: PresentationCreate, job_id: str) -> str:
+    """
+    Reset the user's presentation with this title to pending (or create it),
+    owned by the job `job_id`, and return its id. The caller registers the
+    job with `job_registry.start` and then commits. Handlers call it through
+    `AsyncSession.run_sync`, like the other synchronous service helpers.
+    """
     # Check if user already has a presentation with this title
     existing_presentation = db.query(Presentation).filter(
-        Presentation.user_id == current_user["id"],
+        Presentation.user_id == uuid.UUID(user_id),
         Presentation.title == (data.title or "Untitled")
     ).first()
     
     if existing_presentation:
+        # Keep the content we are about to overwrite if it predates version history
+        if existing_presentation.html_content and not versions.list_versions(db, existing_presentation.id):
+            versions.record_version(db, existing_presentation, source="import")
+
         # Update existing presentation
         existing_presentation.markdown_content = data.markdown_input
         existing_presentation.theme = data.theme or "default"
         existing_presentation.status = "pending"
         existing_presentation.html_content = ""
-        presentation_id = str(existing_presentation.id)
-    else:
-        # Create new presentation
-        new_presentation = Presentation(
-            id=uuid.uuid4(),
+        existing_presentation.job_id = job_id
+        return str(existing_presentation.id)
+
+    # Create new presentation
+    new_presentation = Presentation(
+        id=uuid.uuid4(),
+        user_id=uuid.UUID(user_id),
+        title=data.title or "Untitled",
+        theme=data.theme or "default",
+        status="pending",
+        markdown_content=data.markdown_input,
+        html_content="",
+        job_id=job_id,
+    )
+    db.add(new_presentation)
+    return str(new_presentation.id)
+
+def _submit_llm_job(current_user, presentation_id: str, data: PresentationCreate, cancel_token: CancellationToken, upgrade: bool = False) -> None:
+    """Queue the LLM render of a deck behind the fair scheduler."""
+    generation_scheduler.submit(
+        current_user["id"],
+        run_generation_pipeline,
+        {
+            "presentation_id": presentation_id,
+            "user_id": current_user["id"],
+            "markdown_input": data.markdown_input,
+            "title": data.title,
+            "theme": data.theme,
+            "cancel_token": cancel_token,
+            "upgrade": upgrade,
+            "preview_theme": resolve_local_theme(data.markdown_input, data.theme or "ai-suggest") if upgrade else None,
+        },
+        tier=_user_tier(current_user),
+    )
+
+@router.post("/generate", status_code=status.HTTP_202_ACCEPTED)
+async def generate_presentation(
+    data: PresentationCreate,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Initiate a presentation generation job."""
+    admission = check_admission()
+    # Local renders make no LLM calls and skip the queue, so only LLM renders are refused
+    if admission.action == "reject" and data.render_mode != "local":
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Generation queue is full; try again later",
+            headers={"Retry-After": str(admission.retry_after)},
+        )
+
+    job_id = uuid.uuid4().hex
+    presentation_id = await db.run_sync(_upsert_pending_presentation, current_user["id"], data, job_id)
+    # Cancels any job still running for this presentation before the new pending state is visible
+    cancel_token = job_registry.start(presentation_id, job_id)
+
+    try:
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        job_registry.finish(presentation_id, cancel_token)
+        raise
+    await _cache_call(presentation_cache.invalidate, current_user["id"], presentation_id)
+
+    if data.render_mode == "local" or admission.action == "degrade":
+        # Build the deck locally right away; when degraded we are too far behind for an LLM render.
+        # The LLM enhancement is only queued while admission accepts new LLM work.
+        final_status = await run_in_threadpool(
+            run_generation_pipeline,
+            presentation_id=presentation_id,
             user_id=current_user["id"],
-            title=data.title or "Untitled",
-            theme=data.theme or "default",
-            status="pending",
-            markdown_content=data.markdown_input,
-            html_content=""
+            markdown_input=data.markdown_input,
+            title=data.title,
+            theme=data.theme,
+            cancel_token=cancel_token,
+            render_mode="local",
         )
-        db.add(new_presentation)
-        presentation_id = str(new_presentation.id)
-    
+        enhancing = (
+            data.render_mode == "local" and data.enhance
+            and admission.action == "accept" and final_status == "complete"
+        )
+        if enhancing:
+            # The upgrade continues the same job: it keeps the row's job id
+            _submit_llm_job(current_user, presentation_id, data, job_registry.start(presentation_id, job_id), upgrade=True)
+        return {"presentation_id": presentation_id, "status": final_status, "render_mode": "local", "enhancing": enhancing}
+
+    _submit_llm_job(current_user, presentation_id, data, cancel_token)
+    return {"presentation_id": presentation_id, "status": "pending", "render_mode": "llm", "enhancing": False}
+
+@router.post("/bulk", status_code=status.HTTP_202_ACCEPTED, response_model=BulkGenerateResponse)
+async def bulk_generate_presentations(
+    data: BulkGenerateRequest,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Submit many decks at once; they run as one batch with bounded concurrency."""
+    user_id = current_user["id"]
+    if len(data.decks) > settings.bulk_max_items:
+        raise HTTPException(status_code=400, detail=f"A batch can contain at most {settings.bulk_max_items} decks")
+
+    titles = [deck.title or "Untitled" for deck in data.decks]
+    if len(set(titles)) != len(titles):
+        raise HTTPException(status_code=400, detail="Deck titles in a batch must be unique")
+
+    # Backpressure: refuse new work instead of queueing without bound
+    if batch_registry.active_batches(user_id) >= settings.bulk_max_active_batches:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many batches in progress; wait for one to finish",
+            headers={"Retry-After": "60"},
+        )
+    if batch_registry.queued_items() + len(data.decks) > settings.bulk_max_queued_items:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Bulk generation queue is full; try again later",
+            headers={"Retry-After": "60"},
+        )
+
+    job_ids = [uuid.uuid4().hex for _ in data.decks]
+
+    def upsert_all(sync_db: Session) -> List[BatchItem]:
+        return [
+            BatchItem(presentation_id=_upsert_pending_presentation(sync_db, user_id, deck, job_id), title=deck.title or "Untitled")
+            for deck, job_id in zip(data.decks, job_ids)
+        ]
+
+    items = await db.run_sync(upsert_all)
+    # Supersede running jobs before the new pending rows are visible
+    tokens = {item.presentation_id: job_registry.start(item.presentation_id, job_id) for item, job_id in zip(items, job_ids)}
     try:
-        db.commit()
+        await db.commit()
     except Exception:
-        db.rollback()
+        await db.rollback()
+        for presentation_id, token in tokens.items():
+            job_registry.finish(presentation_id, token)
         raise
+    def _invalidate_items():
+        for item in items:
+            presentation_cache.invalidate(user_id, item.presentation_id)
+    await _cache_call(_invalidate_items)
 
-    # Add the long-running task to the background
-    background_tasks.add_task(
-        run_generation_pipeline,
-        presentation_id=presentation_id,
-        user_id=current_user["id"],
-        markdown_input=data.markdown_input,
-        title=data.title,
-        theme=data.theme,
-    )
+    decks = {item.presentation_id: deck for item, deck in zip(items, data.decks)}
+
+    def run_item(item: BatchItem) -> str:
+        deck = decks[item.presentation_id]
+        return run_generation_pipeline(
+            presentation_id=item.presentation_id,
+            user_id=user_id,
+            markdown_input=deck.markdown_input,
+            title=item.title,
+            theme=deck.theme,
+            priority="bulk",
+            cancel_token=tokens[item.presentation_id],
+            render_mode=deck.render_mode,
+        )
 
-    return {"presentation_id": presentation_id, "status": "pending"}
+    batch = batch_registry.submit(user_id, items, run_item, data.concurrency or 0)
+    return {"batch_id": batch.id, "items": [{"presentation_id": i.presentation_id, "title": i.title} for i in items]}
+
+@router.get("/batches/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(
+    batch_id: str,
+    current_user = Depends(get_current_user)
+):
+    """Per-item progress and aggregate results of a bulk generation batch."""
+    batch = batch_registry.get(batch_id)
+    if not batch or batch.user_id != current_user["id"]:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    durations = [i.finished_at - i.started_at for i in batch.items if i.finished_at and i.started_at]
+    end = batch.finished_at or time.time()
+    return {
+        "batch_id": batch.id,
+        "status": "complete" if batch.done else "running",
+        "total": len(batch.items),
+        "counts": batch.counts(),
+        "concurrency": batch.concurrency,
+        "elapsed_seconds": round(end - batch.created_at, 3),
+        "avg_item_seconds": round(sum(durations) / len(durations), 3) if durations else None,
+        "items": [
+            {
+                "presentation_id": i.presentation_id,
+                "title": i.title,
+                "status": i.status,
+                "error": i.error,
+                "duration_seconds": round(i.finished_at - i.started_at, 3) if i.finished_at and i.started_at else None,
+            }
+            for i in batch.items
+        ],
+    }
 
 
 @router.get("/{presentation_id}/status", response_model=PresentationResponse)
 async def get_presentation_status(
     presentation_id: str,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     """Check the status of a presentation generation job."""
-    presentation = db.query(Presentation).filter(
-        Presentation.id == presentation_id,
-        Presentation.user_id == current_user["id"]
-    ).first()
-
-    if not presentation:
-        raise HTTPException(status_code=404, detail="Presentation not found")
-
-    return presentation
+    return await _cached_presentation_response(db, presentation_id, current_user["id"])
 
 @router.get("", response_model=List[PresentationResponse])
 async def list_presentations(
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     user_id = current_user["id"]
-    print(f"Fetching presentations for user_id: {user_id}")
     try:
-        presentations = db.query(Presentation).filter(
+        result = await db.execute(select(Presentation).where(
             Presentation.user_id == uuid.UUID(user_id)
-        ).order_by(Presentation.created_at.desc()).all()
-        print(f"Found {len(presentations)} presentations for user {user_id}")
+        ).order_by(Presentation.created_at.desc()))
+        presentations = result.scalars().all()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid user ID format")
 
@@ -127,49 +382,58 @@ async def list_presentations(
     return presentations
 
 
-@router.get("/{presentation_id}", response_model=PresentationResponse)
-async def get_presentation(
-    presentation_id: str,
+@router.get("/search", response_model=PresentationSearchResponse)
+async def search_user_presentations(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
+    """Full-text search over the user's deck titles and markdown, best matches first."""
     try:
-        presentation = db.query(Presentation).filter(
-            Presentation.id == uuid.UUID(presentation_id),
-            Presentation.user_id == uuid.UUID(current_user["id"]) 
-        ).first()
+        total, hits = await db.run_sync(search_presentations, current_user["id"], q, limit, offset)
     except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid presentation ID format")
+        raise HTTPException(status_code=400, detail="Invalid user ID format")
+    return {"query": q, "total": total, "limit": limit, "offset": offset, "results": hits}
 
-    if not presentation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Presentation not found"
-        )
+@router.get("/{presentation_id}/preview")
+async def stream_presentation_preview(
+    presentation_id: str,
+    theme: Optional[str] = None,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """
+    Stream a locally rendered Reveal.js document of the deck's markdown. The
+    head is sent before any slide is rendered, so the browser starts early and
+    large decks are never held in memory as one string.
+    """
+    presentation = await _get_owned_presentation(db, presentation_id, current_user["id"])
+    document = stream_local_reveal(
+        presentation.title or "Untitled",
+        presentation.markdown_content or "",
+        theme or presentation.theme or "ai-suggest",
+    )
+    return StreamingResponse(chunked(document), media_type="text/html; charset=utf-8")
 
-    # This was the bug. It was not returning all fields.
-    # By returning the presentation object directly, FastAPI will correctly
-    # map it to the PresentationResponse model.
-    return presentation
+@router.get("/{presentation_id}", response_model=PresentationResponse)
+async def get_presentation(
+    presentation_id: str,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    return await _cached_presentation_response(db, presentation_id, current_user["id"])
 
 @router.put("/{presentation_id}", response_model=PresentationResponse)
 async def update_presentation(
     presentation_id: str,
     data: PresentationCreate,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     """Update an existing presentation."""
-    try:
-        presentation = db.query(Presentation).filter(
-            Presentation.id == uuid.UUID(presentation_id),
-            Presentation.user_id == uuid.UUID(current_user["id"])
-        ).first()
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid presentation ID format")
-
-    if not presentation:
-        raise HTTPException(status_code=404, detail="Presentation not found")
+    presentation = await _get_owned_presentation(db, presentation_id, current_user["id"])
 
     # Update fields
     if data.title:
@@ -179,12 +443,15 @@ async def update_presentation(
     if data.theme:
         presentation.theme = data.theme
 
+    await db.run_sync(versions.record_version, presentation, "update")
+
     try:
-        db.commit()
-        db.refresh(presentation)
+        await db.commit()
+        await db.refresh(presentation)
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update presentation")
+    await _cache_call(presentation_cache.invalidate, current_user["id"], presentation.id)
 
     return presentation
 
@@ -192,24 +459,83 @@ async def update_presentation(
 async def delete_presentation(
     presentation_id: str,
     current_user = Depends(get_current_user), 
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
-    presentation = db.query(Presentation).filter(
-        Presentation.id == presentation_id,
-        Presentation.user_id == current_user["id"] 
-    ).first()
-
-    if not presentation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Presentation not found"
-        )
+    presentation = await _get_owned_presentation(db, presentation_id, current_user["id"])
+    # Stop spending tokens on a job whose result would be thrown away
+    job_registry.cancel(str(presentation.id), "deleted")
 
     try:
-        db.delete(presentation)
-        db.commit()
+        await db.run_sync(versions.delete_versions, presentation.id)
+        await db.delete(presentation)
+        await db.commit()
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to delete presentation")
+    await _cache_call(presentation_cache.invalidate, current_user["id"], presentation.id)
     
-    return {"message": "Presentation deleted successfully"}
\ No newline at end of file
+    return {"message": "Presentation deleted successfully"}
+
+@router.get("/{presentation_id}/versions", response_model=List[PresentationVersionResponse])
+async def list_presentation_versions(
+    presentation_id: str,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """List the version history of a presentation, newest first."""
+    presentation = await _get_owned_presentation(db, presentation_id, current_user["id"])
+    return await db.run_sync(versions.list_versions, presentation.id)
+
+@router.get("/{presentation_id}/versions/diff", response_model=PresentationVersionDiff)
+async def diff_presentation_versions(
+    presentation_id: str,
+    from_version: int,
+    to_version: int,
+    field: Literal["markdown", "html"] = "markdown",
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Unified diff between two versions of a presentation."""
+    presentation = await _get_owned_presentation(db, presentation_id, current_user["id"])
+    diff = await db.run_sync(versions.diff_versions, presentation.id, from_version, to_version, field)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+
+    return PresentationVersionDiff(from_version=from_version, to_version=to_version, field=field, diff=diff)
+
+@router.get("/{presentation_id}/versions/{version}", response_model=PresentationVersionDetail)
+async def get_presentation_version(
+    presentation_id: str,
+    version: int,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Reconstruct the full content of one version."""
+    presentation = await _get_owned_presentation(db, presentation_id, current_user["id"])
+    content = await db.run_sync(versions.get_version_content, presentation.id, version)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+
+    return content
+
+@router.post("/{presentation_id}/versions/{version}/restore", response_model=PresentationResponse)
+async def restore_presentation_version(
+    presentation_id: str,
+    version: int,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Restore a presentation to an earlier version (recorded as a new version)."""
+    presentation = await _get_owned_presentation(db, presentation_id, current_user["id"])
+    if await db.run_sync(versions.restore_version, presentation, version) is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+
+    try:
+        await db.commit()
+        await db.refresh(presentation)
+    except Exception:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to restore presentation")
+    await _cache_call(presentation_cache.invalidate, current_user["id"], presentation.id)
+
+    return presentation
@@ -0,0 +1,24 @@
+# backend/app/api/usage.py
+"""
+The current user's LLM token usage and cost.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..api.auth import get_current_user
+from ..db import get_async_db_session
+from ..schemas import UsageResponse
+from ..services.usage import usage_summary, usage_tracker
+
+router = APIRouter(prefix="/usage", tags=["Usage"])
+
+@router.get("", response_model=UsageResponse)
+async def get_usage(
+    days: int = Query(30, ge=1, le=365),
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Tokens and estimated cost of the user's generations, per stage and per presentation."""
+    try:
+        return await db.run_sync(usage_summary, current_user["id"], days, usage_tracker)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user ID format")
@@ -1,6 +1,7 @@
 # backend/app/config.py
 import os
 import json
+import tempfile
 from typing import List
 from pathlib import Path
 from dotenv import load_dotenv
@@ -10,9 +11,6 @@ env_path = Path(__file__).parent / '.env'
 # Load environment variables from .env file
 load_dotenv(dotenv_path=env_path)
 
-# Print loaded variables for debugging (remove in production)
-print(f"SUPABASE_URL from env: {os.getenv('SUPABASE_URL')}")
-
 class Settings:
     app_name: str = "SlideGenius Backend"
     api_prefix: str = "/api"
@@ -23,14 +21,144 @@ class Settings:
     supabase_key: str = os.getenv("SUPABASE_ANON_KEY", "")
     supabase_service_key: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
     jwt_secret: str = os.getenv("SUPABASE_JWT_SECRET", "secure_development_key")
+
+    # Supabase tokens are verified locally with the JWT secret (HS256) or the
+    # project's JWKS (asymmetric keys); the remote get_user call only runs as a
+    # revocation check every AUTH_REVOCATION_CHECK_SECONDS per token (0 = never)
+    supabase_jwt_secret_set: bool = bool(os.getenv("SUPABASE_JWT_SECRET"))
+    supabase_jwks_url: str = os.getenv(
+        "SUPABASE_JWKS_URL",
+        f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json" if supabase_url else "",
+    )
+    supabase_jwt_audience: str = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+    auth_local_verification: bool = os.getenv("AUTH_LOCAL_VERIFICATION", "true").lower() == "true"
+    auth_revocation_check_seconds: int = int(os.getenv("AUTH_REVOCATION_CHECK_SECONDS", "300"))
+    auth_token_cache_size: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
     
     # Database
     database_url: str = os.getenv("DATABASE_URL", "")
+    # Single-node SQLite (a sqlite file URL, or DATABASE_URL unset): WAL, tuned pragmas on
+    # every connection, a pool of read-only connections, one serialized writer and a
+    # periodic WAL checkpoint (0 disables it). SQLITE_TUNED=false keeps the driver defaults.
+    sqlite_tuned: bool = os.getenv("SQLITE_TUNED", "true").lower() == "true"
+    sqlite_read_pool_size: int = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+    sqlite_cache_size_kb: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+    sqlite_mmap_size_bytes: int = int(os.getenv("SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024)))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_checkpoint_seconds: int = int(os.getenv("SQLITE_CHECKPOINT_SECONDS", "300"))
 
     # LLM settings
     groq_api_key: str = os.getenv("GROQ_API_KEY", "")
+    hf_api_key: str = os.getenv("HUGGINGFACE_API_KEY", "")
     use_mock_llm: bool = not bool(os.getenv("GROQ_API_KEY"))
 
+    # Token usage per provider call, flushed to the llm_usage table in batches. Prices are
+    # "model=input/output" in USD per million tokens, for the cost column and /usage.
+    usage_tracking_enabled: bool = os.getenv("USAGE_TRACKING_ENABLED", "true").lower() == "true"
+    usage_flush_seconds: float = float(os.getenv("USAGE_FLUSH_SECONDS", "5"))
+    usage_flush_batch: int = int(os.getenv("USAGE_FLUSH_BATCH", "200"))
+    llm_prices: str = os.getenv("LLM_PRICES", "meta-llama/llama-4-maverick-17b-128e-instruct=0.20/0.60")
+
+    # Logging goes through a bounded queue written out by a background thread (records
+    # are dropped when it is full). LOG_LEVELS overrides single loggers, e.g.
+    # "slidegenius.llm=DEBUG". LLM prompts and responses are logged as hashes and sizes;
+    # a sampled fraction of calls also logs the bodies, cut at LLM_LOG_MAX_BODY_CHARS.
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    log_levels: str = os.getenv("LOG_LEVELS", "")
+    log_format: str = os.getenv("LOG_FORMAT", "json")
+    log_queue_size: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    llm_log_sample_rate: float = float(os.getenv("LLM_LOG_SAMPLE_RATE", "0"))
+    llm_log_max_body_chars: int = int(os.getenv("LLM_LOG_MAX_BODY_CHARS", "2000"))
+
+    # Sampling profiler for a request and the generation it starts: admins send
+    # "X-Profile: 1", or PROFILING_ENABLED profiles every presentation request. Flame
+    # data is kept per presentation (newest PROFILING_KEEP) and served by /admin/profiles.
+    profiling_enabled: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    profiling_interval_ms: float = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+    profiling_dir: str = os.getenv("PROFILING_DIR", os.path.join(tempfile.gettempdir(), "slidegenius-profiles"))
+    profiling_keep: int = int(os.getenv("PROFILING_KEEP", "20"))
+
+    # Provider rate limit shared by every generation job (0 disables it)
+    llm_requests_per_minute: int = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+    # Requests bulk jobs must leave in the bucket for interactive users
+    llm_interactive_reserve: int = int(os.getenv("LLM_INTERACTIVE_RESERVE", "2"))
+
+    # Generation scheduler: worker threads, per-user running cap and tier weights
+    generation_workers: int = int(os.getenv("GENERATION_WORKERS", "4"))
+    generation_per_user_limit: int = int(os.getenv("GENERATION_PER_USER_LIMIT", "2"))
+    scheduler_tier_weights: str = os.getenv("SCHEDULER_TIER_WEIGHTS", "paid=4,interactive=2,bulk=1")
+    # Always serve the highest-weight tier first instead of sharing proportionally
+    scheduler_strict_priority: bool = os.getenv("SCHEDULER_STRICT_PRIORITY", "false").lower() == "true"
+    paid_user_ids: List[str] = [u.strip() for u in os.getenv("PAID_USER_IDS", "").split(",") if u.strip()]
+    admin_emails: List[str] = [e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()]
+
+    # Admission control on LLM renders from /generate (0 disables a threshold). Over a
+    # hard limit they get 429; over a soft limit they are downgraded to the local
+    # renderer. Local renders are never refused. The drain-time limits are opt-in and
+    # only apply once the scheduler has timed a real job (ADMISSION_INITIAL_JOB_SECONDS
+    # is just the starting guess for that average).
+    admission_max_queue_depth: int = int(os.getenv("ADMISSION_MAX_QUEUE_DEPTH", "200"))
+    admission_max_drain_seconds: int = int(os.getenv("ADMISSION_MAX_DRAIN_SECONDS", "0"))
+    admission_soft_queue_depth: int = int(os.getenv("ADMISSION_SOFT_QUEUE_DEPTH", "0"))
+    admission_soft_drain_seconds: int = int(os.getenv("ADMISSION_SOFT_DRAIN_SECONDS", "0"))
+    admission_initial_job_seconds: float = float(os.getenv("ADMISSION_INITIAL_JOB_SECONDS", "20"))
+
+    # Per-user, per-route sliding-window rate limits as "requests/seconds". RATE_LIMIT_RULES
+    # overrides the default for specific routes ("METHOD /path=limit/seconds", comma-separated;
+    # "=0/1" exempts a route). The sqlite backend shares counters between worker processes.
+    rate_limit_enabled: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    rate_limit_default: str = os.getenv("RATE_LIMIT_DEFAULT", "120/60")
+    rate_limit_rules: str = os.getenv(
+        "RATE_LIMIT_RULES",
+        "POST /api/presentations/generate=10/60,POST /api/presentations/bulk=3/60,"
+        "GET /api/presentations/{presentation_id}/status=120/60,POST /api/auth/token=10/60,"
+        "POST /api/auth/register=5/300",
+    )
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    rate_limit_sqlite_path: str = os.getenv(
+        "RATE_LIMIT_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "slidegenius_rate_limits.db")
+    )
+    rate_limit_max_keys: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+    # Bulk jobs queue their result writes and a background thread commits them in groups
+    write_behind_enabled: bool = os.getenv("WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    write_behind_max_batch: int = int(os.getenv("WRITE_BEHIND_MAX_BATCH", "50"))
+    write_behind_max_delay_ms: int = int(os.getenv("WRITE_BEHIND_MAX_DELAY_MS", "50"))
+
+    # Deadline for a generation job, from when it starts running; queue time does not count (0 disables it)
+    generation_deadline_seconds: int = int(os.getenv("GENERATION_DEADLINE_SECONDS", "300"))
+
+    # Bulk generation
+    bulk_max_items: int = int(os.getenv("BULK_MAX_ITEMS", "100"))
+    bulk_concurrency: int = int(os.getenv("BULK_CONCURRENCY", "2"))
+    bulk_max_active_batches: int = int(os.getenv("BULK_MAX_ACTIVE_BATCHES", "2"))
+    bulk_max_queued_items: int = int(os.getenv("BULK_MAX_QUEUED_ITEMS", "500"))
+    bulk_batch_ttl_seconds: int = int(os.getenv("BULK_BATCH_TTL_SECONDS", "3600"))
+
+    # Markdown rendering: idle converters kept per extension set, rendered slides memoized
+    markdown_pool_size: int = int(os.getenv("MARKDOWN_POOL_SIZE", "8"))
+    markdown_cache_size: int = int(os.getenv("MARKDOWN_CACHE_SIZE", "4096"))
+    # Decks past either threshold render their slides in a process pool (0 processes = always serial)
+    render_processes: int = int(os.getenv("RENDER_PROCESSES", str(min(os.cpu_count() or 1, 4))))
+    render_parallel_min_slides: int = int(os.getenv("RENDER_PARALLEL_MIN_SLIDES", "80"))
+    render_parallel_min_code_blocks: int = int(os.getenv("RENDER_PARALLEL_MIN_CODE_BLOCKS", "30"))
+    # Upper bound on the total size of cached syntax-highlighted code blocks
+    highlight_cache_bytes: int = int(os.getenv("HIGHLIGHT_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+    # Read-through cache of get/status payloads. Completed decks stay cached until a write
+    # invalidates them; pending ones expire after PRESENTATION_CACHE_PENDING_TTL_SECONDS.
+    # A shared path adds a SQLite tier for all worker processes on the host, and then local
+    # entries also expire after PRESENTATION_CACHE_LOCAL_TTL_SECONDS.
+    presentation_cache_enabled: bool = os.getenv("PRESENTATION_CACHE_ENABLED", "true").lower() == "true"
+    presentation_cache_size: int = int(os.getenv("PRESENTATION_CACHE_SIZE", "1000"))
+    presentation_cache_bytes: int = int(os.getenv("PRESENTATION_CACHE_BYTES", str(64 * 1024 * 1024)))
+    presentation_cache_pending_ttl_seconds: float = float(os.getenv("PRESENTATION_CACHE_PENDING_TTL_SECONDS", "2"))
+    presentation_cache_shared_path: str = os.getenv("PRESENTATION_CACHE_SHARED_PATH", "")
+    presentation_cache_local_ttl_seconds: float = float(os.getenv("PRESENTATION_CACHE_LOCAL_TTL_SECONDS", "5"))
+
+    # Version history: store a full snapshot every N versions, deltas in between
+    version_snapshot_interval: int = int(os.getenv("VERSION_SNAPSHOT_INTERVAL", "20"))
+
     # CORS
     allowed_origins_str = os.getenv("ALLOWED_ORIGINS", "http://localhost:8080")
     # Parse the comma-separated string into a list
@@ -1,31 +1,223 @@
 # backend/app/db.py
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
 from .config import settings
+from .logs import get_logger
 import os
 
+logger = get_logger("db")
+
 # Check if database URL is provided; if not, use SQLite for development
 if not settings.database_url:
     # Create the data directory if it doesn't exist
     os.makedirs("./data", exist_ok=True)
     database_url = "sqlite:///./data/slidegenius.db"
-    print(f"Using SQLite database for development: {database_url}")
 else:
     database_url = settings.database_url
-    print(f"Using configured database: {database_url}")
-
-# Create the SQLAlchemy engine
-engine = create_engine(
-    database_url, 
-    connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
-    future=True, 
-    pool_pre_ping=True
-)
 
-# Create a SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _async_database_url(url: str):
+    """The same database through its asyncio driver (aiosqlite or asyncpg), plus connect args."""
+    url = make_url(url)
+    connect_args = {}
+    if url.drivername.startswith("sqlite"):
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif url.drivername.startswith("postgres"):
+        # asyncpg takes the libpq sslmode as its `ssl` argument
+        sslmode = url.query.get("sslmode")
+        url = url.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+        if sslmode:
+            connect_args["ssl"] = sslmode
+    return url, connect_args
+
+def is_tuned_sqlite(url: str) -> bool:
+    """File-backed SQLite with SQLITE_TUNED on (in-memory databases can't use WAL)."""
+    url = make_url(url)
+    return settings.sqlite_tuned and url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+# --- Single-node SQLite ------------------------------------------------------
+# WAL lets readers run alongside the writer, so reads get their own pool of
+# query-only connections. Writes go through one connection per engine and take
+# the write lock up front (BEGIN IMMEDIATE): writers queue on the pool instead
+# of failing with "database is locked" when a deferred transaction tries to
+# upgrade its lock after another writer committed.
+
+def _set_pragmas(dbapi_connection, writer: bool) -> None:
+    cursor = dbapi_connection.cursor()
+    if writer:
+        # Persistent in the database file; only a writer may switch it
+        cursor.execute("PRAGMA journal_mode=WAL")
+    # Durable across application crashes; only a power loss can drop the last commits
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kb}")
+    cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+    if not writer:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+def tune_sqlite_engine(sync_engine, writer: bool) -> None:
+    """Apply the pragmas to every new connection; writers also begin IMMEDIATE transactions."""
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself instead of the driver's implicit deferred BEGIN
+        dbapi_connection.isolation_level = None
+        _set_pragmas(dbapi_connection, writer)
+
+    @event.listens_for(sync_engine, "begin")
+    def on_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if writer else "BEGIN")
+
+def _is_write(clause) -> bool:
+    if isinstance(clause, UpdateBase):
+        return True
+    if isinstance(clause, TextClause):
+        return not clause.text.lstrip().upper().startswith(("SELECT", "WITH"))
+    return False
+
+class RoutingSession(Session):
+    """
+    Sends flushes and INSERT/UPDATE/DELETE statements to the writer engine
+    and queries to the read pool. Once a transaction has written, its reads
+    go to the writer too so they see their own uncommitted changes.
+    """
+    writer_engine = None
+    reader_engine = None
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if self._flushing or _is_write(clause) or self.info.get("wrote"):
+            self.info["wrote"] = True
+            return self.writer_engine
+        return self.reader_engine
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("wrote", None)
+
+def routing_session_class(writer_engine, reader_engine):
+    return type("BoundRoutingSession", (RoutingSession,), {
+        "writer_engine": writer_engine,
+        "reader_engine": reader_engine,
+    })
+
+def create_tuned_sqlite_engines(url: str):
+    """(writer, reader) sync engines for a SQLite file."""
+    connect_args = {"check_same_thread": False}
+    writer = create_engine(url, connect_args=connect_args, pool_size=1, max_overflow=0, pool_timeout=60)
+    reader = create_engine(
+        url, connect_args=connect_args,
+        pool_size=settings.sqlite_read_pool_size, max_overflow=settings.sqlite_read_pool_size,
+    )
+    tune_sqlite_engine(writer, writer=True)
+    tune_sqlite_engine(reader, writer=False)
+    return writer, reader
+
+def create_tuned_sqlite_async_engines(url: str):
+    """(writer, reader) async engines for a SQLite file."""
+    writer = create_async_engine(url, pool_size=1, max_overflow=0, pool_timeout=60)
+    reader = create_async_engine(
+        url, pool_size=settings.sqlite_read_pool_size, max_overflow=settings.sqlite_read_pool_size,
+    )
+    tune_sqlite_engine(writer.sync_engine, writer=True)
+    tune_sqlite_engine(reader.sync_engine, writer=False)
+    return writer, reader
+
+class WalCheckpointer:
+    """
+    Periodically checkpoints the WAL and truncates it. SQLite's automatic
+    checkpoints never shrink the file, and one that finds a reader mid-way
+    leaves the WAL growing under constant polling.
+    """
+
+    def __init__(self, engine, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.last_result = None
+
+    def checkpoint(self):
+        """Returns (busy, wal pages, checkpointed pages)."""
+        # Raw connection: a checkpoint can't run inside the BEGIN IMMEDIATE the engine would open.
+        # It holds the writer slot, so no write is in progress meanwhile.
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            # Don't hold up writers waiting for long readers; the next run catches up
+            cursor.execute("PRAGMA busy_timeout=200")
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.last_result = tuple(cursor.fetchone())
+            cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+            cursor.close()
+        finally:
+            conn.close()
+        return self.last_result
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.checkpoint()
+            except Exception as e:
+                logger.warning(f"WAL checkpoint failed: {e}")
+
+    def start(self):
+        if self.interval > 0 and self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, name="wal-checkpoint", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+            try:
+                self.checkpoint()
+            except Exception as e:
+                logger.warning(f"WAL checkpoint failed: {e}")
+
+wal_checkpointer = None
+async_database_url, async_connect_args = _async_database_url(database_url)
+
+if is_tuned_sqlite(database_url):
+    # `engine` is the writer; DDL and bulk loads go through it
+    engine, read_engine = create_tuned_sqlite_engines(database_url)
+    SessionLocal = sessionmaker(class_=routing_session_class(engine, read_engine), autocommit=False, autoflush=False)
+    async_engine, async_read_engine = create_tuned_sqlite_async_engines(async_database_url)
+    async_session_class = routing_session_class(async_engine.sync_engine, async_read_engine.sync_engine)
+    wal_checkpointer = WalCheckpointer(engine, settings.sqlite_checkpoint_seconds)
+else:
+    # Create the SQLAlchemy engine
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
+        future=True,
+        pool_pre_ping=True
+    )
+    read_engine = engine
+
+    # Create a SessionLocal class
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    # Async engine for the request handlers, so queries don't block the event loop.
+    # Background generation jobs run on worker threads and keep using SessionLocal.
+    async_engine = create_async_engine(async_database_url, connect_args=async_connect_args, pool_pre_ping=True)
+    async_read_engine = async_engine
+    async_session_class = Session
+
+# expire_on_commit=False: handlers return ORM objects after committing, and an
+# expired attribute can't be lazily reloaded outside the session's greenlet
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, expire_on_commit=False, sync_session_class=async_session_class
+)
 
 # Create a Base class for declarative models
 Base = declarative_base()
@@ -37,4 +229,9 @@ def get_db_session() -> Session:
         yield db
     finally:
         db.close()
-        
\ No newline at end of file
+
+
+async def get_async_db_session() -> AsyncSession:
+    """Get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,35 +1,54 @@
 # backend/app/llm/graph.py
+from functools import wraps
 from typing import Callable, Dict, Any
-from langgraph.graph import StateGraph, END
 from sqlalchemy.orm import Session
 
 from .state import PipelineState
 from .nodes import suggest_and_improve_node
 from .nodes import _generate_html_node
+from .nodes import _local_render_node
 from .nodes import _persist_node_factory
-from ..services.reveal import convert_markdown_to_reveal
 
 
-
-def build_pipeline(db_session: Session, user_id: str, title: str):
+def _checkpoint(name: str, node: Callable[[PipelineState], PipelineState]):
+    """
+    Stop the job between nodes once it has been cancelled or run out of time,
+    and tag the job with the running node for usage accounting.
+    """
+    @wraps(node)
+    def run(state: PipelineState) -> PipelineState:
+        job = state.get("job")
+        if job:
+            job.check()
+            job.node = name
+        return node(state)
+    return run
+
+def build_pipeline(db_session: Session, user_id: str, render_mode: str = "llm"):
     """
     Build and compile the LangGraph pipeline with provided DB session and user context.
+    The presentation to write is passed in the state (`presentation_id`).
     Graph: suggest -> generate_html -> persist -> END
+    With render_mode="local": local_render -> persist -> END (no LLM calls)
     """
-    print(f"build_pipeline received db_session of type: {type(db_session)}")
-    print(f"db_session has add method: {hasattr(db_session, 'add')}")
-    print(f"db_session dir: {dir(db_session)[:10]}...")  # Print first 10 attributes
+    # LangGraph is the slowest import in the app; load it with the first job, not at startup
+    from langgraph.graph import StateGraph, END
 
     graph = StateGraph(PipelineState)
 
     # Make sure you're using async functions consistently
-    graph.add_node("suggest", suggest_and_improve_node)
-    graph.add_node("generate_html", _generate_html_node)
-    graph.add_node("persist", _persist_node_factory(db_session, user_id, title))
-
-    graph.set_entry_point("suggest")
-    graph.add_edge("suggest", "generate_html")
-    graph.add_edge("generate_html", "persist")
+    graph.add_node("persist", _checkpoint("persist", _persist_node_factory(db_session, user_id)))
+
+    if render_mode == "local":
+        graph.add_node("local_render", _checkpoint("local_render", _local_render_node))
+        graph.set_entry_point("local_render")
+        graph.add_edge("local_render", "persist")
+    else:
+        graph.add_node("suggest", _checkpoint("suggest", suggest_and_improve_node))
+        graph.add_node("generate_html", _checkpoint("generate_html", _generate_html_node))
+        graph.set_entry_point("suggest")
+        graph.add_edge("suggest", "generate_html")
+        graph.add_edge("generate_html", "persist")
     graph.add_edge("persist", END)
 
     app = graph.compile()
@@ -1,23 +1,26 @@
 # backend/app/llm/nodes.py
 from typing import Dict, Any
-from ..services.groq_service import groq_service
-from ..services.reveal import convert_markdown_to_reveal
-from ..models import Presentation
+from ..logs import get_logger
+from ..services.providers import get_groq_service
+from ..services.reveal import convert_markdown_to_reveal, render_local_reveal
+from ..services.persistence import PresentationWrite, persist
 from .state import PipelineState
-import uuid
+
+logger = get_logger("llm.pipeline")
 
 def suggest_and_improve_node(state: PipelineState) -> PipelineState:
     """Node to suggest improvements to markdown and choose a theme"""
     markdown_input = state.get("markdown_input", "")
     title = state.get("title", "")
     user_theme = state.get("theme", "ai-suggest")
+    job = state.get("job")
     
-    # Use Groq service
-    improved_markdown = groq_service.improve_markdown(title, markdown_input)
+    groq_service = get_groq_service()
+    improved_markdown = groq_service.improve_markdown(title, markdown_input, job)
     
     # Use AI suggestion only if user chose 'ai-suggest', otherwise use user's choice
     if user_theme == "ai-suggest":
-        theme = groq_service.suggest_theme(improved_markdown)
+        theme = groq_service.suggest_theme(improved_markdown, job)
     else:
         theme = user_theme
     
@@ -31,43 +34,55 @@ def _generate_html_node(state: PipelineState) -> PipelineState:
     title = state.get("title") or "Untitled"
     md = state.get("improved_markdown") or state.get("markdown_input") or ""
     theme = state.get("theme") or "black"
-    html = convert_markdown_to_reveal(title, md, theme)
+    html = convert_markdown_to_reveal(title, md, theme, state.get("job"))
     return {**state, "html_content": html}
 
-def _persist_node_factory(db_session, user_id: str, title: str):
+def _local_render_node(state: PipelineState) -> PipelineState:
+    """Render the deck without any LLM call (render_mode="local" and overload fallback)."""
+    title = state.get("title") or "Untitled"
+    md = state.get("markdown_input") or ""
+    html, theme = render_local_reveal(title, md, state.get("theme") or "ai-suggest")
+    return {**state, "improved_markdown": md, "theme": theme, "html_content": html}
+
+def _persist_node_factory(db_session, user_id: str):
     """
-    Create a node that updates the existing presentation in the database.
-    
+    Create a node that writes the job's result to its presentation row.
+
     Args:
         db_session: SQLAlchemy session (should be an actual session, not a context manager)
-        user_id: User ID to associate with the presentation
-        title: Presentation title
+        user_id: User ID the presentation belongs to
     """
     def _persist_node(state: PipelineState) -> PipelineState:
-        print(f"In persist node. DB session type: {type(db_session)}")
-        
+        presentation_id = state["presentation_id"]
+        markdown = state.get("improved_markdown") or state.get("markdown_input", "")
+        write = PresentationWrite(
+            presentation_id=presentation_id,
+            user_id=user_id,
+            values={
+                "markdown_content": markdown,
+                "html_content": state.get("html_content", ""),
+                "theme": state.get("theme", "black"),
+                "status": "complete",
+            },
+            expect_markdown=state.get("markdown_input", "") if state.get("upgrade") else None,
+            expect_theme=state.get("preview_theme") if state.get("upgrade") else None,
+            version_source="generate",
+        )
+        job = state.get("job")
+        if job and job.cancel_token:
+            write.expect_job_id = job.cancel_token.id
         try:
-            # Find the existing presentation by title and user_id (since we don't have presentation_id in state)
-            presentation = db_session.query(Presentation).filter(
-                Presentation.user_id == uuid.UUID(user_id),
-                Presentation.title == title,
-                Presentation.status == "pending"
-            ).order_by(Presentation.created_at.desc()).first()
-            
-            if presentation:
-                # Update existing presentation
-                presentation.markdown_content = state.get("improved_markdown") or state.get("markdown_input", "")
-                presentation.html_content = state.get("html_content", "")
-                presentation.theme = state.get("theme", "black")
-                presentation.status = "complete"
-                db_session.commit()
-                print(f"Updated existing presentation: {presentation.id}")
-            else:
-                print("No pending presentation found to update")
-            
-            return state
+            matched = persist(db_session, write, job.priority if job else "interactive")
         except Exception as e:
-            print(f"Error in persist node: {str(e)}")
+            db_session.rollback()
+            logger.error(f"Error in persist node: {e}")
             raise
-    
+
+        if matched is False:
+            if state.get("upgrade"):
+                logger.info(f"Presentation {presentation_id} was edited; keeping it instead of the LLM render")
+            else:
+                logger.info(f"Presentation {presentation_id} is no longer pending; result discarded")
+        return state
+
     return _persist_node
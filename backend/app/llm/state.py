@@ -1,11 +1,28 @@
 # backend/app/llm/state.py
+from dataclasses import dataclass
 from typing import TypedDict, Optional
+from ..services.cancellation import CancellationToken
+
+@dataclass
+class JobContext:
+    """Per-job information that provider calls need (not part of the LLM output)."""
+    user_id: str = ""
+    presentation_id: str = ""
+    priority: str = "interactive"  # 'interactive' or 'bulk'
+    node: str = ""  # pipeline node currently running, for usage accounting
+    cancel_token: Optional[CancellationToken] = None
+
+    def check(self) -> None:
+        """Raise if the job was cancelled or ran out of time."""
+        if self.cancel_token:
+            self.cancel_token.check()
 
 class PipelineState(TypedDict, total=False):
     # Inputs
     markdown_input: str
     title: str
     theme: str  # User-selected theme or 'ai-suggest'
+    job: JobContext
 
     # LLM results
     improved_markdown: str
@@ -15,6 +32,10 @@ class PipelineState(TypedDict, total=False):
 
     # Persistence
     presentation_id: str
+    # Replace a local preview, unless its markdown or theme was edited since
+    upgrade: bool
+    # Theme the local preview was rendered with (upgrades only)
+    preview_theme: Optional[str]
 
     # Error info
-    error: Optional[str]
\ No newline at end of file
+    error: Optional[str]
@@ -0,0 +1,193 @@
+# backend/app/logs.py
+"""
+Structured logging that never blocks the caller on stdout.
+
+Loggers under "slidegenius" hand records to a bounded in-memory queue; one
+listener thread formats them (JSON lines or plain text, LOG_FORMAT) and
+writes them out. When the queue is full, records are dropped and counted
+rather than stalling a generation job.
+
+LLM prompts and responses are logged by `log_llm_exchange` as SHA-256
+prefixes and sizes. A sampled fraction of calls (LLM_LOG_SAMPLE_RATE) also
+carries the bodies, truncated to LLM_LOG_MAX_BODY_CHARS.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+from .config import settings
+
+ROOT_LOGGER = "slidegenius"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        # Tracebacks are formatted by the queue handler before the record crosses threads
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues without blocking; counts what didn't fit."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener's formatter does the work; only resolve the message here
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """'slidegenius.llm=DEBUG,...' -> {logger name: level}."""
+    levels = {}
+    for part in spec.split(","):
+        name, _, level = part.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging() -> None:
+    """Install the queue handler and start the listener thread (idempotent)."""
+    global _handler, _listener
+    with _lock:
+        if _handler is None:
+            _handler = DroppingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+            root = logging.getLogger(ROOT_LOGGER)
+            root.addHandler(_handler)
+            root.setLevel(settings.log_level.upper())
+            # Records stop here instead of also reaching the root logger's handlers
+            root.propagate = False
+            for name, level in _parse_levels(settings.log_levels).items():
+                logging.getLogger(name).setLevel(level)
+            atexit.register(stop_logging)
+        if _listener is None:
+            # Also restarts the listener when the app starts again after a shutdown
+            stream = logging.StreamHandler(sys.stdout)
+            stream.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+            _listener = logging.handlers.QueueListener(_handler.queue, stream, respect_handler_level=True)
+            _listener.start()
+
+
+def stop_logging() -> None:
+    """Write out everything queued and stop the listener thread."""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the "slidegenius" tree, e.g. get_logger("llm.groq")."""
+    configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def logging_stats() -> Dict[str, Any]:
+    with _lock:
+        handler = _handler
+    if handler is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "queued": handler.queue.qsize(),
+        "max_queued": settings.log_queue_size,
+        "dropped": handler.dropped,
+    }
+
+
+def _digest(text: str) -> Dict[str, Any]:
+    data = text.encode("utf-8", "replace")
+    return {"sha256": hashlib.sha256(data).hexdigest()[:16], "bytes": len(data)}
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} more chars]"
+
+
+def log_llm_exchange(
+    logger: logging.Logger,
+    provider: str,
+    stage: str,
+    model: str,
+    prompt: str,
+    response: Optional[str],
+    latency_ms: float,
+    job=None,
+) -> None:
+    """One record per provider call: hashes and sizes, bodies only when sampled."""
+    level = logging.INFO if response is not None else logging.WARNING
+    if not logger.isEnabledFor(level):
+        return
+    prompt_digest = _digest(prompt)
+    fields: Dict[str, Any] = {
+        "provider": provider,
+        "stage": stage,
+        "model": model,
+        "latency_ms": round(latency_ms, 1),
+        "prompt_sha256": prompt_digest["sha256"],
+        "prompt_bytes": prompt_digest["bytes"],
+    }
+    if response is not None:
+        response_digest = _digest(response)
+        fields["response_sha256"] = response_digest["sha256"]
+        fields["response_bytes"] = response_digest["bytes"]
+    if job is not None:
+        fields["user_id"] = job.user_id or None
+        fields["presentation_id"] = job.presentation_id or None
+        fields["node"] = job.node or None
+    if settings.llm_log_sample_rate > 0 and random.random() < settings.llm_log_sample_rate:
+        limit = settings.llm_log_max_body_chars
+        fields["prompt"] = _truncate(prompt, limit)
+        if response is not None:
+            fields["response"] = _truncate(response, limit)
+    message = f"{provider} {stage} {'ok' if response is not None else 'failed'}"
+    logger.log(level, message, extra={"fields": fields})
@@ -1,23 +1,45 @@
 # backend/app/main.py
 from fastapi import FastAPI
 from .config import settings
-from .db import Base, engine
-from .middleware import apply_cors
+from .db import engine, wal_checkpointer
+from .logs import configure_logging, stop_logging
+from .middleware import apply_cors, apply_profiling, apply_rate_limits
 from .api.auth import router as auth_router
 from .api.presentations import router as presentations_router
+from .api.admin import router as admin_router
+from .api.usage import router as usage_router
+from .services.markdown_render import process_renderer
+from .services.persistence import write_behind
+from .services.usage import usage_tracker
+from .migrations import run_migrations
 
 def create_app() -> FastAPI:
     app = FastAPI(title=settings.app_name)
+    apply_profiling(app)
+    apply_rate_limits(app)
     apply_cors(app)
     
     # Include routers
     app.include_router(auth_router, prefix=settings.api_prefix)
     app.include_router(presentations_router, prefix=settings.api_prefix)
+    app.include_router(admin_router, prefix=settings.api_prefix)
+    app.include_router(usage_router, prefix=settings.api_prefix)
 
     @app.on_event("startup")
     def on_startup():
-        # Create tables (for development; use proper migrations in production)
-        Base.metadata.create_all(bind=engine)
+        configure_logging()
+        run_migrations(engine)
+        if wal_checkpointer:
+            wal_checkpointer.start()
+
+    @app.on_event("shutdown")
+    def on_shutdown():
+        process_renderer.shutdown()
+        write_behind.stop()
+        usage_tracker.stop()
+        if wal_checkpointer:
+            wal_checkpointer.stop()
+        stop_logging()
 
     @app.get("/")
     def read_root():
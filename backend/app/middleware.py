@@ -1,7 +1,13 @@
 # backend/app/middleware.py
+import json
+import re
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from .config import settings
+from .api.auth import is_admin_token, token_check_may_block, user_id_from_token
+from .services.profiling import profile_request
+from .services.rate_limit import rate_limiter
 
 def apply_cors(app: FastAPI):
     app.add_middleware(
@@ -10,4 +16,132 @@ def apply_cors(app: FastAPI):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-    )
\ No newline at end of file
+    )
+
+class RateLimitMiddleware:
+    """
+    Sliding-window limits per user and route (see services/rate_limit.py).
+    Requests are keyed by route template and by the authenticated user,
+    falling back to the client address for anonymous or invalid tokens.
+    Added inside CORS so rejections still carry CORS headers.
+
+    Token checks that may go to the network and hits on the shared SQLite
+    store run in the thread pool, so a slow JWKS fetch or a worker holding
+    the counter file's lock never stalls the event loop.
+    """
+
+    def __init__(self, app, limiter=rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def _identity(self, scope) -> str:
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    if token_check_may_block(token):
+                        user_id = await run_in_threadpool(user_id_from_token, token)
+                    else:
+                        user_id = user_id_from_token(token)
+                    if user_id:
+                        return f"user:{user_id}"
+                break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        # Only API routes are limited; health checks and docs are left alone
+        path = scope["path"]
+        result = None
+        if path.startswith(settings.api_prefix):
+            identity = await self._identity(scope)
+            if self.limiter.blocking:
+                result = await run_in_threadpool(self.limiter.hit, identity, scope["method"], path)
+            else:
+                result = self.limiter.hit(identity, scope["method"], path)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = [
+            (b"x-ratelimit-limit", str(result.limit).encode()),
+            (b"x-ratelimit-remaining", str(result.remaining).encode()),
+        ]
+        if not result.allowed:
+            body = json.dumps({"detail": "Rate limit exceeded, try again later"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers + [
+                    (b"retry-after", str(result.retry_after).encode()),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+def apply_rate_limits(app: FastAPI):
+    if settings.rate_limit_enabled:
+        app.add_middleware(RateLimitMiddleware)
+
+class ProfilingMiddleware:
+    """
+    Samples a presentation request, and the generation it starts, when an
+    admin sends "X-Profile: 1" or PROFILING_ENABLED is set (see
+    services/profiling.py). The profile id is returned in X-Profile-Id.
+    Added innermost so the profile covers the handler, not the other middleware.
+    """
+
+    PRESENTATION_ID = re.compile(r"/presentations/([0-9a-fA-F-]{36})(?:/|$)")
+
+    def __init__(self, app):
+        self.app = app
+        self.prefix = f"{settings.api_prefix}/presentations"
+
+    async def _requested(self, scope) -> bool:
+        flag = authorization = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-profile":
+                flag = value
+            elif name == b"authorization":
+                authorization = value
+        if flag is None or flag.lower() not in (b"1", b"true") or authorization is None:
+            return False
+        scheme, _, token = authorization.decode("latin-1").partition(" ")
+        if scheme.lower() != "bearer":
+            return False
+        if token_check_may_block(token, remote=True):
+            return await run_in_threadpool(is_admin_token, token)
+        return is_admin_token(token)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.prefix)
+            or not (settings.profiling_enabled or await self._requested(scope))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        match = self.PRESENTATION_ID.search(scope["path"])
+        with profile_request(f"{scope['method']} {scope['path']}", match.group(1) if match else None) as session:
+            async def send_with_profile_id(message):
+                if message["type"] == "http.response.start":
+                    message = {**message, "headers": list(message.get("headers", [])) + [(b"x-profile-id", session.id.encode())]}
+                await send(message)
+
+            await self.app(scope, receive, send_with_profile_id)
+
+def apply_profiling(app: FastAPI):
+    app.add_middleware(ProfilingMiddleware)
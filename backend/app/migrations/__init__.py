@@ -0,0 +1,74 @@
+# backend/app/migrations/__init__.py
+"""
+Versioned schema migrations.
+
+Each migration in `steps.MIGRATIONS` runs once, in version order, in its own
+transaction together with its row in `schema_migrations`. Concurrent workers
+starting at the same time serialize on a lock (an advisory lock on Postgres;
+the writer's BEGIN IMMEDIATE on tuned SQLite) and re-check what is applied,
+so each step runs exactly once.
+
+Databases created by the old `create_all` startup path are adopted as-is:
+the early steps only create what is missing.
+
+CLI: python -m app.migrations [upgrade | status | explain]
+"""
+from datetime import datetime, timezone
+from typing import List, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from ..logs import get_logger
+from .steps import MIGRATIONS, Migration
+
+logger = get_logger("migrations")
+
+SCHEMA_TABLE = "schema_migrations"
+# Arbitrary, fixed key for pg_advisory_xact_lock
+_ADVISORY_LOCK_KEY = 0x51DE6E
+
+
+def _lock(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+
+def _ensure_schema_table(conn: Connection) -> None:
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            applied_at TIMESTAMP NOT NULL
+        )
+    """))
+
+
+def applied_versions(conn: Connection) -> Set[int]:
+    return {row[0] for row in conn.execute(text(f"SELECT version FROM {SCHEMA_TABLE}"))}
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    with engine.begin() as conn:
+        _ensure_schema_table(conn)
+        applied = applied_versions(conn)
+    return [m for m in MIGRATIONS if m.version not in applied]
+
+
+def run_migrations(engine: Engine) -> List[Migration]:
+    """Apply every pending migration; returns the ones this call applied."""
+    applied_now = []
+    for migration in pending_migrations(engine):
+        with engine.begin() as conn:
+            _lock(conn)
+            # Another worker may have applied it while we waited for the lock
+            if migration.version in applied_versions(conn):
+                continue
+            migration.upgrade(conn)
+            conn.execute(
+                text(f"INSERT INTO {SCHEMA_TABLE} (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+                {"version": migration.version, "name": migration.name, "applied_at": datetime.now(timezone.utc)},
+            )
+        logger.info(f"Applied migration {migration.version:04d}_{migration.name}")
+        applied_now.append(migration)
+    return applied_now
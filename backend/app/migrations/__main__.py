@@ -0,0 +1,58 @@
+# backend/app/migrations/__main__.py
+"""
+python -m app.migrations upgrade   apply pending migrations (also done at startup)
+python -m app.migrations status    list applied and pending migrations
+python -m app.migrations explain   migrate, then check the hot query plans; exits 1 on a full scan
+"""
+import argparse
+import sys
+
+from sqlalchemy import text
+
+from ..db import engine
+from . import SCHEMA_TABLE, pending_migrations, run_migrations
+from .explain import check_query_plans
+
+
+def _status() -> int:
+    pending = pending_migrations(engine)
+    with engine.connect() as conn:
+        applied = conn.execute(text(f"SELECT version, name, applied_at FROM {SCHEMA_TABLE} ORDER BY version")).all()
+    for row in applied:
+        print(f"  applied  {row.version:04d}_{row.name}  {row.applied_at}")
+    for migration in pending:
+        print(f"  pending  {migration.version:04d}_{migration.name}")
+    return 0
+
+
+def _explain() -> int:
+    run_migrations(engine)
+    failed = 0
+    for result in check_query_plans(engine):
+        print(f"{'ok  ' if result.ok else 'FAIL'}  {result.query.name}")
+        for line in result.plan:
+            print(f"        {line}")
+        for problem in result.problems:
+            print(f"      ! {problem}")
+        failed += not result.ok
+    if failed:
+        print(f"{failed} hot quer{'y' if failed == 1 else 'ies'} fall back to a full scan or sort")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["upgrade", "status", "explain"], nargs="?", default="upgrade")
+    args = parser.parse_args()
+    if args.command == "upgrade":
+        applied = run_migrations(engine)
+        print(f"{len(applied)} migration(s) applied")
+        return 0
+    if args.command == "status":
+        return _status()
+    return _explain()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
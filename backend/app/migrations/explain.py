@@ -0,0 +1,175 @@
+# backend/app/migrations/explain.py
+"""
+Plan check for the hot queries: EXPLAIN each one against the migrated schema
+and report any that would read a whole table (or sort rows the index should
+already deliver in order). Run it after adding a query or changing an index:
+
+    python -m app.migrations explain
+
+The queries mirror the application's filters; keep them in step with the
+call sites named next to each one.
+"""
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.engine import Connection, Engine
+
+from ..models import LlmUsage, Presentation, PresentationVersion
+from ..services.search import TITLE_WEIGHT, _fts5_query
+
+# Tables whose full scan is never acceptable on a hot path
+_TABLES = ("presentations", "presentation_versions", "profiles", "llm_usage")
+
+
+@dataclass
+class HotQuery:
+    name: str
+    # SQL for the dialect, and its bind parameters
+    build: Callable[[Connection], tuple]
+    # Rows must come off the index in ORDER BY order, without a sort step
+    ordered: bool = False
+
+
+@dataclass
+class PlanResult:
+    query: HotQuery
+    plan: List[str]
+    problems: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+def _compiled(statement) -> Callable[[Connection], tuple]:
+    def build(conn: Connection):
+        sql = statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+        return str(sql), {}
+    return build
+
+
+def _search(conn: Connection):
+    user_id = uuid.uuid4()
+    if conn.dialect.name == "sqlite":
+        sql = f"""
+            SELECT rowid, rank, count(*) OVER () AS total
+            FROM presentations_fts
+            WHERE presentations_fts MATCH :q AND rank MATCH 'bm25({TITLE_WEIGHT}, 1.0, 0.0)'
+            ORDER BY rank LIMIT 20
+        """
+        return sql, {"q": _fts5_query(user_id, ["deck"])}
+    sql = """
+        SELECT id FROM presentations
+        WHERE user_id = :uid AND search_vector @@ to_tsquery('english', :q)
+    """
+    return sql, {"uid": user_id, "q": "deck:*"}
+
+
+def hot_queries() -> List[HotQuery]:
+    user_id, presentation_id = uuid.uuid4(), uuid.uuid4()
+    return [
+        # api/presentations.py: _upsert_pending_presentation
+        HotQuery("upsert lookup by (user_id, title)", _compiled(
+            select(Presentation).where(
+                Presentation.user_id == user_id, Presentation.title == "Untitled",
+            ).limit(1)
+        )),
+        # services/persistence.py: apply_write (the pipeline's single result write)
+        HotQuery("conditional result UPDATE by (id, user_id)", _compiled(
+            update(Presentation).where(
+                Presentation.id == presentation_id, Presentation.user_id == user_id,
+                Presentation.job_id == "job", Presentation.status == "pending",
+            ).values(markdown_content="", html_content="", status="complete")
+            .returning(Presentation.title, Presentation.theme)
+        )),
+        # api/presentations.py: list_presentations
+        HotQuery("list a user's decks newest first", _compiled(
+            select(Presentation).where(Presentation.user_id == user_id)
+            .order_by(Presentation.created_at.desc())
+        ), ordered=True),
+        # api/presentations.py: _get_owned_presentation (status, get, update, delete)
+        HotQuery("owned lookup by (id, user_id)", _compiled(
+            select(Presentation).where(Presentation.id == presentation_id, Presentation.user_id == user_id)
+        )),
+        # services/versions.py: _latest_version, list_versions
+        HotQuery("versions of a deck, newest first", _compiled(
+            select(PresentationVersion).where(PresentationVersion.presentation_id == presentation_id)
+            .order_by(PresentationVersion.version.desc())
+        ), ordered=True),
+        # services/search.py: search_presentations
+        HotQuery("full-text search", _search),
+        # services/usage.py: usage_summary
+        HotQuery("a user's LLM usage over a window", _compiled(
+            select(LlmUsage.stage, func.sum(LlmUsage.prompt_tokens)).where(
+                LlmUsage.user_id == user_id, LlmUsage.created_at >= datetime(2000, 1, 1),
+            ).group_by(LlmUsage.stage)
+        )),
+    ]
+
+
+def _sqlite_plan(conn: Connection, sql: str, params: Dict) -> List[str]:
+    return [row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql), params)]
+
+
+def _sqlite_problems(plan: List[str], ordered: bool) -> List[str]:
+    problems = []
+    for detail in plan:
+        words = detail.split()
+        # "SCAN presentations_fts VIRTUAL TABLE INDEX ..." is the FTS5 index itself
+        if len(words) > 1 and words[0] == "SCAN" and words[1] in _TABLES:
+            problems.append(detail)
+        if ordered and detail.startswith("USE TEMP B-TREE FOR") and "ORDER BY" in detail:
+            problems.append(detail)
+    return problems
+
+
+def _postgres_plan(conn: Connection, sql: str, params: Dict) -> List[dict]:
+    # Small development tables make a sequential scan the cheapest plan even
+    # when a usable index exists; ask what the planner does when it can't
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    raw = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql), params).scalar()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    nodes, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+
+def _postgres_problems(nodes: List[dict], ordered: bool) -> List[str]:
+    problems = []
+    for node in nodes:
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in _TABLES:
+            problems.append(f"Seq Scan on {node['Relation Name']}")
+        if ordered and node["Node Type"] in ("Sort", "Incremental Sort"):
+            problems.append(f"{node['Node Type']} on {', '.join(node.get('Sort Key', []))}")
+    return problems
+
+
+def _describe(node: dict) -> str:
+    target = node.get("Index Name") or node.get("Relation Name") or ""
+    return f"{node['Node Type']} {target}".strip()
+
+
+def check_query_plans(engine: Engine, queries: Optional[List[HotQuery]] = None) -> List[PlanResult]:
+    dialect = engine.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        raise NotImplementedError(f"Plan checks are not supported on {dialect}")
+    results = []
+    for query in queries or hot_queries():
+        with engine.connect() as conn, conn.begin() as transaction:
+            sql, params = query.build(conn)
+            if dialect == "sqlite":
+                plan = _sqlite_plan(conn, sql, params)
+                results.append(PlanResult(query, plan, _sqlite_problems(plan, query.ordered)))
+            else:
+                nodes = _postgres_plan(conn, sql, params)
+                plan = [_describe(node) for node in nodes]
+                results.append(PlanResult(query, plan, _postgres_problems(nodes, query.ordered)))
+            transaction.rollback()
+    return results
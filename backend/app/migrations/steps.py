@@ -0,0 +1,189 @@
+# backend/app/migrations/steps.py
+"""
+The migrations themselves. Append new steps with the next version number;
+never edit a step that has shipped. Steps define the tables they touch
+inline instead of importing the models, so they keep meaning what they
+meant when they were written.
+"""
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+    UniqueConstraint, func, inspect, text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Connection
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _initial_schema(conn: Connection) -> None:
+    """The schema `create_all` used to build at startup."""
+    metadata = MetaData()
+    Table(
+        "profiles", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("user_id", UUID(as_uuid=True), unique=True, nullable=False),
+        Column("email", Text, nullable=True),
+        Column("full_name", Text, nullable=True),
+        Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+        Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    )
+    Table(
+        "presentations", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("user_id", UUID(as_uuid=True), ForeignKey("profiles.user_id"), nullable=False),
+        Column("title", Text, nullable=False),
+        Column("markdown_content", Text, nullable=False),
+        Column("html_content", Text, nullable=False),
+        Column("theme", Text, nullable=False),
+        Column("status", String, nullable=True),
+        Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+        Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+        Index("ix_presentations_user_id", "user_id"),
+    )
+    Table(
+        "presentation_versions", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("presentation_id", UUID(as_uuid=True), ForeignKey("presentations.id", ondelete="CASCADE"), nullable=False),
+        Column("version", Integer, nullable=False),
+        Column("is_snapshot", Boolean, nullable=False),
+        Column("markdown_data", Text, nullable=False),
+        Column("html_data", Text, nullable=False),
+        Column("title", Text, nullable=False),
+        Column("theme", Text, nullable=False),
+        Column("source", String, nullable=False),
+        Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+        UniqueConstraint("presentation_id", "version", name="uq_presentation_versions_presentation_version"),
+    )
+    # Existing tables (from create_all or the Supabase schema) are left alone
+    metadata.create_all(conn, checkfirst=True)
+
+
+_SQLITE_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS presentations_fts USING fts5(
+        title, markdown_content, user_id,
+        content='presentations', content_rowid='rowid',
+        tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS presentations_fts_ai AFTER INSERT ON presentations BEGIN
+        INSERT INTO presentations_fts(rowid, title, markdown_content, user_id)
+        VALUES (new.rowid, new.title, new.markdown_content, new.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS presentations_fts_ad AFTER DELETE ON presentations BEGIN
+        INSERT INTO presentations_fts(presentations_fts, rowid, title, markdown_content, user_id)
+        VALUES ('delete', old.rowid, old.title, old.markdown_content, old.user_id);
+    END""",
+    # Only reindex when searchable columns change, not on every status update
+    """CREATE TRIGGER IF NOT EXISTS presentations_fts_au
+    AFTER UPDATE OF title, markdown_content, user_id ON presentations BEGIN
+        INSERT INTO presentations_fts(presentations_fts, rowid, title, markdown_content, user_id)
+        VALUES ('delete', old.rowid, old.title, old.markdown_content, old.user_id);
+        INSERT INTO presentations_fts(rowid, title, markdown_content, user_id)
+        VALUES (new.rowid, new.title, new.markdown_content, new.user_id);
+    END""",
+]
+
+_POSTGRES_SEARCH_DDL = [
+    """ALTER TABLE presentations ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(markdown_content, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_presentations_search_vector ON presentations USING GIN (search_vector)",
+]
+
+
+def _search_index(conn: Connection) -> None:
+    """Full-text index over title and markdown (see services/search.py)."""
+    if conn.dialect.name == "sqlite":
+        existed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='presentations_fts'")
+        ).first()
+        for ddl in _SQLITE_SEARCH_DDL:
+            conn.execute(text(ddl))
+        if not existed:
+            # Index the rows written before the triggers existed
+            conn.execute(text("INSERT INTO presentations_fts(presentations_fts) VALUES ('rebuild')"))
+    elif conn.dialect.name == "postgresql":
+        for ddl in _POSTGRES_SEARCH_DDL:
+            conn.execute(text(ddl))
+
+
+def _presentation_access_paths(conn: Connection) -> None:
+    """
+    Composite indexes for the hot presentation queries:
+    - (user_id, title, status, created_at): the title upsert in /generate uses
+      its (user_id, title) prefix; the pipeline's persist step looks up the
+      newest pending row for a title and reads it straight off the index.
+    - (user_id, created_at): listing a user's decks newest first, without a sort.
+    The single-column user_id index is a prefix of both and is dropped.
+    """
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_presentations_user_title_status_created "
+        "ON presentations (user_id, title, status, created_at)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_presentations_user_created ON presentations (user_id, created_at)"
+    ))
+    conn.execute(text("DROP INDEX IF EXISTS ix_presentations_user_id"))
+
+
+def _llm_usage(conn: Connection) -> None:
+    """Per-call token usage and cost, written in batches by services/usage.py."""
+    metadata = MetaData()
+    Table(
+        "llm_usage", metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("user_id", UUID(as_uuid=True), nullable=True),
+        Column("presentation_id", UUID(as_uuid=True), nullable=True),
+        Column("node", String, nullable=True),
+        Column("stage", String, nullable=False),
+        Column("provider", String, nullable=False),
+        Column("model", String, nullable=False),
+        Column("prompt_tokens", Integer, nullable=False),
+        Column("completion_tokens", Integer, nullable=False),
+        Column("estimated", Boolean, nullable=False),
+        Column("latency_ms", Integer, nullable=False),
+        Column("ok", Boolean, nullable=False),
+        Column("cost_usd", Float, nullable=False),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+        Index("ix_llm_usage_user_created", "user_id", "created_at"),
+        Index("ix_llm_usage_presentation_id", "presentation_id"),
+    )
+    metadata.create_all(conn, checkfirst=True)
+
+
+def _presentation_title_index(conn: Connection) -> None:
+    """
+    Narrow the upsert index to (user_id, title). The pipeline now writes its
+    result by primary key (services/persistence.py: apply_write), so no query
+    filters on status or orders a title's rows by created_at any more.
+    """
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_presentations_user_title ON presentations (user_id, title)"
+    ))
+    conn.execute(text("DROP INDEX IF EXISTS ix_presentations_user_title_status_created"))
+
+
+def _presentation_job_id(conn: Connection) -> None:
+    """Id of the generation job that owns each row (see services/persistence.py)."""
+    columns = {column["name"] for column in inspect(conn).get_columns("presentations")}
+    if "job_id" not in columns:
+        conn.execute(text("ALTER TABLE presentations ADD COLUMN job_id VARCHAR"))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "initial_schema", _initial_schema),
+    Migration(2, "search_index", _search_index),
+    Migration(3, "presentation_access_paths", _presentation_access_paths),
+    Migration(4, "llm_usage", _llm_usage),
+    Migration(5, "presentation_title_index", _presentation_title_index),
+    Migration(6, "presentation_job_id", _presentation_job_id),
+]
@@ -1,6 +1,6 @@
 # backend/app/models.py
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, func, Index
+from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean, Float, func, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.schema import ForeignKey
 from .db import Base
@@ -25,9 +25,57 @@ class Presentation(Base):
     html_content = Column(Text, nullable=False)
     theme = Column(Text, nullable=False, default="default")
     status = Column(String, nullable=True, default="pending")
+    # Token id of the generation job that owns the row; only that job may write its result
+    job_id = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Created by migrations 0003 and 0005; see app/migrations/explain.py for the queries they serve
     __table_args__ = (
-        Index('ix_presentations_user_id', 'user_id'),
-    )
\ No newline at end of file
+        Index('ix_presentations_user_title', 'user_id', 'title'),
+        Index('ix_presentations_user_created', 'user_id', 'created_at'),
+    )
+
+class PresentationVersion(Base):
+    __tablename__ = "presentation_versions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    presentation_id = Column(UUID(as_uuid=True), ForeignKey("presentations.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False)
+    # Snapshots hold the full text; other rows hold a JSON delta against the previous version
+    is_snapshot = Column(Boolean, nullable=False, default=False)
+    markdown_data = Column(Text, nullable=False)
+    html_data = Column(Text, nullable=False)
+    title = Column(Text, nullable=False)
+    theme = Column(Text, nullable=False, default="default")
+    source = Column(String, nullable=False, default="generate")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('presentation_id', 'version', name='uq_presentation_versions_presentation_version'),
+    )
+
+class LlmUsage(Base):
+    """One provider call. No foreign keys: usage outlives deleted decks."""
+    __tablename__ = "llm_usage"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    presentation_id = Column(UUID(as_uuid=True), nullable=True)
+    node = Column(String, nullable=True)  # pipeline node that made the call
+    stage = Column(String, nullable=False)  # the prompt, e.g. improve_markdown
+    provider = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    # Token counts guessed from text length because the provider didn't report them
+    estimated = Column(Boolean, nullable=False, default=False)
+    latency_ms = Column(Integer, nullable=False)
+    ok = Column(Boolean, nullable=False, default=True)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index('ix_llm_usage_user_created', 'user_id', 'created_at'),
+        Index('ix_llm_usage_presentation_id', 'presentation_id'),
+    )
@@ -1,5 +1,5 @@
 # backend/app/schemas.py
-from typing import Optional, Literal, List
+from typing import Optional, Literal, List, Dict
 from pydantic import BaseModel, Field
 from datetime import datetime
 from uuid import UUID
@@ -46,7 +46,12 @@ class PresentationBase(BaseModel):
 
 class PresentationCreate(PresentationBase):
     """Schema for creating a new presentation"""
-    pass
+    render_mode: Literal["llm", "local"] = Field(
+        "llm", description="'local' returns a deck rendered without any LLM call right away"
+    )
+    enhance: bool = Field(
+        True, description="With render_mode 'local', replace the preview with an LLM render in the background"
+    )
 
 class PresentationUpdate(BaseModel):
     """Schema for updating an existing presentation"""
@@ -75,6 +80,94 @@ class PresentationListResponse(BaseModel):
     theme: str
     created_at: datetime
 
+class PresentationSearchHit(BaseModel):
+    id: UUID
+    title: str
+    status: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    snippet: str = Field(..., description="Matching excerpt of the markdown, matches wrapped in <mark>")
+    rank: float
+
+    class Config:
+        from_attributes = True
+
+class PresentationSearchResponse(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[PresentationSearchHit]
+
+class BulkGenerateRequest(BaseModel):
+    """Schema for submitting many decks as one batch"""
+    decks: List[PresentationCreate] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(None, ge=1, description="Max decks generated at once (capped by server config)")
+
+class BulkGenerateItem(BaseModel):
+    presentation_id: str
+    title: str
+
+class BulkGenerateResponse(BaseModel):
+    batch_id: str
+    items: List[BulkGenerateItem]
+
+class BatchItemStatus(BulkGenerateItem):
+    status: str
+    error: Optional[str] = None
+    duration_seconds: Optional[float] = None
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    status: Literal["running", "complete"]
+    total: int
+    counts: Dict[str, int]
+    concurrency: int
+    elapsed_seconds: float
+    avg_item_seconds: Optional[float] = None
+    items: List[BatchItemStatus]
+
+class PresentationVersionResponse(BaseModel):
+    """Schema for an entry in a presentation's version history"""
+    version: int
+    title: str
+    theme: str
+    source: str
+    is_snapshot: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class PresentationVersionDetail(BaseModel):
+    """Schema for the reconstructed content of a single version"""
+    version: int
+    title: str
+    theme: str
+    source: str
+    created_at: datetime
+    markdown_content: str
+    html_content: str
+
+class PresentationVersionDiff(BaseModel):
+    from_version: int
+    to_version: int
+    field: Literal["markdown", "html"]
+    diff: str
+
+class UsageBreakdown(BaseModel):
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cost_usd: float
+
+class UsageResponse(BaseModel):
+    """Schema for a user's LLM token usage and cost over a window"""
+    since: datetime
+    totals: UsageBreakdown
+    by_stage: Dict[str, UsageBreakdown]
+    by_presentation: Dict[str, UsageBreakdown]
+
 # User Schemas
 class UserBase(BaseModel):
     email: str
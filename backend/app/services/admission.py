@@ -0,0 +1,48 @@
+# backend/app/services/admission.py
+"""
+Admission control for new LLM generation jobs, based on the scheduler's
+queue depth and its estimate of how long that queue takes to drain.
+
+Only LLM work is shed: /generate always serves local renders, which never
+enter the scheduler queue. The drain estimate multiplies the queue depth by
+the measured average job time, so the drain-time limits are ignored until
+at least one job has finished and that average is real.
+"""
+import math
+from dataclasses import dataclass
+
+from ..config import settings
+from .scheduler import generation_scheduler
+
+
+@dataclass
+class AdmissionDecision:
+    action: str  # 'accept', 'degrade' (render locally) or 'reject'
+    queue_depth: int
+    drain_seconds: float
+    retry_after: int = 0
+
+
+def _over(value: float, limit: float) -> bool:
+    return bool(limit) and value >= limit
+
+
+def check_admission() -> AdmissionDecision:
+    depth = generation_scheduler.queue_depth()
+    drain = generation_scheduler.estimated_drain_seconds(depth)
+    measured = generation_scheduler.jobs_measured > 0
+    max_drain = settings.admission_max_drain_seconds if measured else 0
+    soft_drain = settings.admission_soft_drain_seconds if measured else 0
+
+    if _over(depth, settings.admission_max_queue_depth) or _over(drain, max_drain):
+        # Time until the queue is back under both hard limits
+        per_job = generation_scheduler.avg_job_seconds / generation_scheduler.workers
+        excess_jobs = depth - settings.admission_max_queue_depth + 1 if settings.admission_max_queue_depth else 0
+        excess_drain = drain - max_drain + per_job if max_drain else 0
+        retry_after = max(excess_jobs * per_job, excess_drain, 1)
+        return AdmissionDecision("reject", depth, drain, math.ceil(retry_after))
+
+    if _over(depth, settings.admission_soft_queue_depth) or _over(drain, soft_drain):
+        return AdmissionDecision("degrade", depth, drain)
+
+    return AdmissionDecision("accept", depth, drain)
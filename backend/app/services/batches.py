@@ -0,0 +1,123 @@
+# backend/app/services/batches.py
+"""
+Bulk generation batches.
+
+A batch never has more than `settings.bulk_concurrency` items in the
+generation scheduler at a time, and submits them with the low-weight "bulk"
+tier so large imports cannot starve interactive users.
+"""
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from ..config import settings
+from .scheduler import generation_scheduler
+
+
+@dataclass
+class BatchItem:
+    presentation_id: str
+    title: str
+    status: str = "queued"  # queued -> running -> complete | failed
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+@dataclass
+class Batch:
+    id: str
+    user_id: str
+    items: List[BatchItem]
+    concurrency: int
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    next_index: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"queued": 0, "running": 0, "complete": 0, "failed": 0}
+        for item in self.items:
+            counts[item.status] = counts.get(item.status, 0) + 1
+        return counts
+
+
+class BatchRegistry:
+    """In-process registry and runner for bulk generation batches."""
+
+    def __init__(self):
+        self.batches: Dict[str, Batch] = {}
+        self.lock = threading.Lock()
+
+    def _evict_expired(self) -> None:
+        cutoff = time.time() - settings.bulk_batch_ttl_seconds
+        for batch_id in [b.id for b in self.batches.values() if b.done and b.finished_at < cutoff]:
+            del self.batches[batch_id]
+
+    def queued_items(self) -> int:
+        with self.lock:
+            return sum(b.counts()["queued"] for b in self.batches.values())
+
+    def active_batches(self, user_id: str) -> int:
+        with self.lock:
+            return sum(1 for b in self.batches.values() if b.user_id == user_id and not b.done)
+
+    def get(self, batch_id: str) -> Optional[Batch]:
+        with self.lock:
+            return self.batches.get(batch_id)
+
+    def submit(self, user_id: str, items: List[BatchItem], run_item: Callable[[BatchItem], str], concurrency: int = 0) -> Batch:
+        """
+        Register a batch and start its first `concurrency` items. `run_item`
+        runs one item to completion and returns its final status.
+        """
+        limit = max(settings.bulk_concurrency, 1)
+        batch = Batch(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            items=items,
+            concurrency=min(concurrency or limit, limit),
+        )
+        with self.lock:
+            self._evict_expired()
+            self.batches[batch.id] = batch
+            for _ in range(batch.concurrency):
+                self._start_next(batch, run_item)
+        return batch
+
+    def _start_next(self, batch: Batch, run_item: Callable[[BatchItem], str]) -> None:
+        # Called with the lock held
+        if batch.next_index >= len(batch.items):
+            if not any(item.status in ("queued", "running") for item in batch.items):
+                batch.finished_at = time.time()
+            return
+
+        item = batch.items[batch.next_index]
+        batch.next_index += 1
+        generation_scheduler.submit(
+            batch.user_id,
+            self._run,
+            {"batch": batch, "item": item, "run_item": run_item},
+            tier="bulk",
+        )
+
+    def _run(self, batch: Batch, item: BatchItem, run_item: Callable[[BatchItem], str]) -> None:
+        item.status = "running"
+        item.started_at = time.time()
+        try:
+            item.status = run_item(item)
+        except Exception as e:
+            item.status = "failed"
+            item.error = str(e)
+        item.finished_at = time.time()
+
+        with self.lock:
+            self._start_next(batch, run_item)
+
+
+batch_registry = BatchRegistry()
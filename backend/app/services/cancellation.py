@@ -0,0 +1,115 @@
+# backend/app/services/cancellation.py
+"""
+Cancellation tokens and end-to-end deadlines for generation jobs.
+
+A token is created when a job is submitted and registered under its
+presentation id. Submitting a new job for the same presentation, or deleting
+the presentation, cancels the previous token. The pipeline checks the token
+between graph nodes and provider calls abort their HTTP request when it fires.
+
+The deadline covers running time only: its clock starts when the job is
+dispatched (`arm`, called by run_generation_pipeline), not when it is
+queued. Time spent waiting in the scheduler or behind earlier items of a
+bulk batch is bounded by admission control and the bulk limits instead.
+"""
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from ..config import settings
+
+
+class JobCancelled(Exception):
+    """Raised inside a job whose token was cancelled."""
+
+
+class JobDeadlineExceeded(JobCancelled):
+    """Raised inside a job that ran past its end-to-end deadline."""
+
+
+class CancellationToken:
+    def __init__(self, deadline_seconds: Optional[float] = None, job_id: Optional[str] = None):
+        # Stored on the presentation row when the job is submitted; the job's
+        # result is only written while the row still carries it
+        self.id = job_id or uuid.uuid4().hex
+        self.event = threading.Event()
+        self.reason: Optional[str] = None
+        self.deadline_seconds = deadline_seconds
+        # Set by arm(); until then the job is queued and has no deadline
+        self.deadline: Optional[float] = None
+
+    def arm(self) -> None:
+        """Start the deadline clock when the job starts running (idempotent)."""
+        if self.deadline is None and self.deadline_seconds:
+            self.deadline = time.monotonic() + self.deadline_seconds
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self.event.is_set():
+            self.reason = reason
+            self.event.set()
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def cancelled(self) -> bool:
+        return self.event.is_set() or self.expired
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None when there is no deadline."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to `seconds`, waking early on cancellation. Returns True if cancelled."""
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        self.event.wait(seconds)
+        return self.cancelled
+
+    def check(self) -> None:
+        if self.event.is_set():
+            raise JobCancelled(self.reason)
+        if self.expired:
+            raise JobDeadlineExceeded("deadline exceeded")
+
+
+class JobRegistry:
+    """Tracks the live token of each presentation's current job."""
+
+    def __init__(self):
+        self.tokens: Dict[str, CancellationToken] = {}
+        self.lock = threading.Lock()
+
+    def start(self, presentation_id: str, job_id: Optional[str] = None) -> CancellationToken:
+        """
+        Register a new job, superseding (cancelling) any job already running for it.
+        Call it before committing the new pending state, so the old job is
+        already cancelled when that state becomes visible.
+        """
+        token = CancellationToken(settings.generation_deadline_seconds or None, job_id)
+        with self.lock:
+            previous = self.tokens.get(presentation_id)
+            self.tokens[presentation_id] = token
+        if previous:
+            previous.cancel("superseded")
+        return token
+
+    def cancel(self, presentation_id: str, reason: str = "cancelled") -> bool:
+        with self.lock:
+            token = self.tokens.pop(presentation_id, None)
+        if token:
+            token.cancel(reason)
+        return token is not None
+
+    def finish(self, presentation_id: str, token: CancellationToken) -> None:
+        with self.lock:
+            if self.tokens.get(presentation_id) is token:
+                del self.tokens[presentation_id]
+
+
+job_registry = JobRegistry()
@@ -0,0 +1,93 @@
+# backend/app/services/document.py
+"""
+Reveal.js document skeleton shared by the LLM and local render paths.
+"""
+from typing import Iterable, Iterator, List
+
+REVEAL_CSS_CDN = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/reveal.min.css"
+REVEAL_JS_CDN = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/reveal.min.js"
+REVEAL_THEME_BASE = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/theme"
+
+# Fixed layout for locally rendered decks, following the rules the LLM is asked
+# to apply: centered content, fluid type sizes, and scrolling instead of overflow
+LAYOUT_CSS = """
+    .reveal .slides section { display: flex; flex-direction: column; justify-content: center; padding: 2rem; box-sizing: border-box; height: 100%; overflow-y: auto; }
+    .reveal h1 { font-size: clamp(2rem, 4vw, 3.5rem); text-align: center; }
+    .reveal h2 { font-size: clamp(1.5rem, 3vw, 2.5rem); }
+    .reveal h3 { font-size: clamp(1.2rem, 2.5vw, 2rem); }
+    .reveal p, .reveal li { font-size: clamp(1rem, 2vw, 1.5rem); line-height: 1.6; }
+    .reveal ul, .reveal ol { display: block; text-align: left; margin: 0.5rem auto; }
+    .reveal ul { list-style: disc; }
+    .reveal pre { width: 100%; max-height: 60vh; overflow: auto; font-size: clamp(0.7rem, 1.4vw, 1rem); }
+    .reveal table { margin: 1rem auto; border-collapse: collapse; font-size: clamp(0.8rem, 1.6vw, 1.2rem); }
+    .reveal th, .reveal td { padding: 0.4rem 0.8rem; border-bottom: 1px solid currentColor; }
+    .reveal img { max-width: 100%; max-height: 60vh; object-fit: contain; }
+"""
+
+def _document_head(title: str, theme: str, css: str) -> str:
+    style = f"\n  <style>{css}  </style>" if css else ""
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{title} - SlideGenius</title>
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <link rel="stylesheet" href="{REVEAL_CSS_CDN}">
+  <link rel="stylesheet" href="{REVEAL_THEME_BASE}/{theme}.min.css" id="theme">{style}
+</head>
+<body>
+  <div class="reveal">
+    <div class="slides">
+      """
+
+
+_DOCUMENT_TAIL = f"""
+    </div>
+  </div>
+  <script src="{REVEAL_JS_CDN}"></script>
+  <script>
+    Reveal.initialize({{
+      hash: true,
+      slideNumber: true,
+      controls: true,
+      progress: true,
+      transition: 'slide',
+      center: false,
+      height: '100%',
+      margin: 0.1,
+      minScale: 0.5,
+      maxScale: 1.5
+    }});
+  </script>
+</body>
+</html>"""
+
+
+def reveal_document(title: str, slides_html: str, theme: str, css: str = "") -> str:
+    """Wrap rendered <section> elements in a complete Reveal.js HTML document."""
+    return _document_head(title, theme, css) + slides_html + _DOCUMENT_TAIL
+
+
+def iter_reveal_document(title: str, sections: Iterable[str], theme: str, css: str = "") -> Iterator[str]:
+    """
+    Yield the same document as `reveal_document` piece by piece: the head, each
+    section as it is produced, then the tail. Nothing is joined in memory.
+    """
+    yield _document_head(title, theme, css)
+    for i, section in enumerate(sections):
+        yield section if i == 0 else "\n" + section
+    yield _DOCUMENT_TAIL
+
+
+def chunked(parts: Iterable[str], size: int = 64 * 1024) -> Iterator[bytes]:
+    """Coalesce small string parts into encoded chunks of roughly `size` bytes."""
+    buffer: List[str] = []
+    buffered = 0
+    for part in parts:
+        buffer.append(part)
+        buffered += len(part)
+        if buffered >= size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
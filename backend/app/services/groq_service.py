@@ -1,59 +1,223 @@
-import requests
 from ..config import settings
-import sys
+from .cancellation import JobCancelled
+from .document import reveal_document
+from .markdown_render import render_slides, SLIDE_EXTENSIONS
+from .slides import iter_slides
+from .throttle import TokenBucket
+from .usage import usage_tracker
+from ..logs import get_logger, log_llm_exchange
+import json
+import queue
+import re
+import threading
+import time
 
-def log(message):
-    """Log with immediate output"""
-    print(message, flush=True)
-    sys.stdout.flush()
+logger = get_logger("llm.groq")
 
-REVEAL_CSS_CDN = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/reveal.min.css"
-REVEAL_JS_CDN = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/reveal.min.js"
-REVEAL_THEME_BASE = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/theme"
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_MODEL = "meta-llama/llama-4-maverick-17b-128e-instruct"
+# How often a streaming call checks its job's cancellation token while waiting for data
+_CANCEL_POLL = 0.2
+_END_OF_STREAM = object()
+
+def keyword_theme(markdown: str) -> str:
+    """Pick a theme from keywords in the content, without calling the LLM"""
+    content_lower = markdown.lower()
+    if any(word in content_lower for word in ['business', 'corporate', 'professional']):
+        return "simple"
+    elif any(word in content_lower for word in ['tech', 'code', 'development', 'programming']):
+        return "night"
+    elif any(word in content_lower for word in ['creative', 'design', 'art']):
+        return "sky"
+    elif any(word in content_lower for word in ['history', 'ancient', 'culture']):
+        return "serif"
+    else:
+        return "white"
+
+_FENCE = re.compile(r"^[ \t]*(`{3,})[ \t]*([\w+-]*)[ \t\r]*$", re.MULTILINE)
+
+
+def unwrap_markdown_fence(text: str) -> str:
+    """
+    Take the deck out of a reply that is one ```markdown (```md or bare ```)
+    block: the first non-blank line opens the fence and its matching closing
+    fence is the last non-blank line. Anything else, such as a deck that
+    starts with its own code block, is returned unchanged.
+    """
+    body = text.strip()
+    fences = _FENCE.finditer(body)
+    opener = next(fences, None)
+    if opener is None or opener.start() != 0 or opener.group(2).lower() not in ("", "markdown", "md"):
+        return text
+    width = len(opener.group(1))
+    # Code blocks inside the deck: a fence with an info string opens one, a bare fence closes it
+    depth = 0
+    for fence in fences:
+        if fence.group(2):
+            depth += 1
+        elif depth:
+            depth -= 1
+        elif len(fence.group(1)) >= width:
+            # Closes the outer fence; it only wraps the reply if nothing follows
+            return body[opener.end():fence.start()].strip() if fence.end() == len(body) else text
+    return text
 
 class GroqService:
     def __init__(self):
         self.groq_api_key = settings.groq_api_key
         self.use_mock = settings.use_mock_llm or not self.groq_api_key
+        # Shared by every job so bulk imports cannot exhaust the provider quota
+        self.rate_limiter = TokenBucket(settings.llm_requests_per_minute)
         
         if self.use_mock:
-            log("WARNING: Using mock LLM responses - set GROQ_API_KEY to use real API")
+            logger.warning("Using mock LLM responses - set GROQ_API_KEY to use real API")
         else:
-            log("Using real Groq API")
+            logger.info("Using real Groq API")
             
-    def generate_text(self, prompt: str) -> str:
-        """Generate text using Groq API"""
-        log(f"The prompt: {prompt}\n==================================\n")
+    def generate_text(self, prompt: str, job=None, stage: str = "generate_text") -> str:
+        """
+        Generate text using Groq API.
+        When the job carries a cancellation token the completion is streamed and
+        the token is checked while waiting for each chunk, so cancelling closes
+        the connection (and stops generation) even before the first byte.
+        Token usage is recorded under `stage`, successful or not.
+        """
+        import requests
+
+        token = job.cancel_token if job else None
+        # Bulk jobs leave headroom in the shared budget for interactive users
+        reserve = settings.llm_interactive_reserve if job and job.priority == "bulk" else 0
+        waited = self.rate_limiter.acquire(reserve, token)
+        if waited:
+            logger.info(f"Waited {waited:.1f}s for the provider rate limit")
+        if job:
+            job.check()
 
+        payload = {
+            "model": GROQ_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.7,
+            "max_tokens": 4096
+        }
+        result, usage = None, None
+        started = time.perf_counter()
         try:
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.groq_api_key}"
-                },
-                json={
-                    "model": "meta-llama/llama-4-maverick-17b-128e-instruct",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.7,
-                    "max_tokens": 4096
-                },
-                timeout=30
-            )
-            if response.status_code == 200:
-                result = response.json()["choices"][0]["message"]["content"]
-                log(f"Successfully generated text with Groq API")
-                log(f"Response: {result}")
-                log("\n=========================================================\n")
-                return result
+            if token:
+                result, usage = self._stream_completion(payload, token)
             else:
-                log(f"Groq API failed: {response.status_code} - {response.text}")
+                response = requests.post(GROQ_CHAT_URL, headers=self._headers(), json=payload, timeout=30)
+                if response.status_code == 200:
+                    body = response.json()
+                    result = body["choices"][0]["message"]["content"]
+                    usage = body.get("usage")
+                else:
+                    logger.warning(f"Groq API failed: {response.status_code} - {response.text}")
+            if result is not None:
+                return result
+        except JobCancelled:
+            raise
         except Exception as e:
-            log(f"Groq API error: {str(e)}")
+            logger.warning(f"Groq API error: {str(e)}")
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            log_llm_exchange(logger, "groq", stage, GROQ_MODEL, prompt, result, latency_ms, job)
+            usage = usage or {}
+            usage_tracker.record(
+                stage, "groq", GROQ_MODEL,
+                usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                latency_ms,
+                ok=result is not None, job=job, prompt=prompt, completion=result or "",
+            )
         
         return "Failed to generate content"
+
+    def _headers(self) -> dict:
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.groq_api_key}"
+        }
+
+    def _stream_completion(self, payload: dict, token):
+        """
+        Stream a chat completion, aborting the request as soon as `token` fires.
+        Returns (text, usage); Groq reports usage in the last chunk.
+
+        The HTTP exchange runs on a reader thread that hands lines over a queue,
+        and this thread checks `token` every _CANCEL_POLL seconds while it waits.
+        A cancelled job therefore stops even before the first byte arrives,
+        instead of sitting out the read timeout.
+        """
+        import requests
+
+        # The read timeout bounds the gap between chunks; the token enforces the overall deadline
+        timeout = 30
+        remaining = token.remaining()
+        if remaining is not None:
+            timeout = max(min(timeout, remaining), 0.1)
+
+        lines: "queue.Queue" = queue.Queue()
+        # Set by the reader once a 200 response is open, so this thread can close it
+        opened = {}
+
+        def _read():
+            try:
+                response = requests.post(
+                    GROQ_CHAT_URL,
+                    headers=self._headers(),
+                    json={**payload, "stream": True},
+                    stream=True,
+                    timeout=timeout
+                )
+                # Closing an unfinished streamed response drops the connection
+                with response:
+                    if token.cancelled:
+                        return
+                    if response.status_code != 200:
+                        logger.warning(f"Groq API failed: {response.status_code} - {response.text}")
+                        return
+                    opened["response"] = response
+                    # chunk_size=None hands over data as it arrives instead of buffering
+                    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                        if token.cancelled:
+                            return
+                        lines.put(line)
+            except Exception as e:
+                lines.put(e)
+            finally:
+                lines.put(_END_OF_STREAM)
+
+        threading.Thread(target=_read, name="groq-stream", daemon=True).start()
+
+        parts = []
+        usage = None
+        try:
+            while True:
+                try:
+                    item = lines.get(timeout=_CANCEL_POLL)
+                except queue.Empty:
+                    token.check()
+                    continue
+                token.check()
+                if item is _END_OF_STREAM:
+                    return ("".join(parts), usage) if opened else (None, None)
+                if isinstance(item, Exception):
+                    raise item
+                if not item or not item.startswith("data:"):
+                    continue
+                data = item[len("data:"):].strip()
+                if data == "[DONE]":
+                    return "".join(parts), usage
+                chunk = json.loads(data)
+                usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage") or usage
+                choices = chunk.get("choices") or []
+                if choices:
+                    parts.append(choices[0].get("delta", {}).get("content") or "")
+        finally:
+            if opened and token.cancelled:
+                # Wake the reader now rather than at its next chunk
+                opened["response"].close()
     
-    def improve_markdown(self, title: str, markdown: str) -> str:
+    def improve_markdown(self, title: str, markdown: str, job=None) -> str:
         """Improve markdown content for presentations"""
         prompt = f"""You are a presentation expert. Enhance the following markdown for a slide deck titled "{title}".
 
@@ -72,16 +236,10 @@ Original markdown:
 
 Return ONLY the enhanced markdown with all original content preserved without any thought process."""
         
-        improved = self.generate_text(prompt)
+        improved = self.generate_text(prompt, job, stage="improve_markdown")
         
         # Clean up the response
-        if "```markdown" in improved:
-            improved = improved.split("```markdown")[1].split("```")[0].strip()
-        elif "```" in improved:
-            # Find content between first set of backticks
-            parts = improved.split("```")
-            if len(parts) >= 3:
-                improved = parts[1].strip()
+        improved = unwrap_markdown_fence(improved)
         
         # Remove any leading explanatory text
         lines = improved.split('\n')
@@ -96,21 +254,11 @@ Return ONLY the enhanced markdown with all original content preserved without an
             
         return improved if improved and len(improved) > 10 else markdown
         
-    def suggest_theme(self, markdown: str) -> str:
+    def suggest_theme(self, markdown: str, job=None) -> str:
         """Suggest a theme for the presentation based on content"""
         if self.use_mock:
             # Return varied themes for mock mode
-            content_lower = markdown.lower()
-            if any(word in content_lower for word in ['business', 'corporate', 'professional']):
-                return "simple"
-            elif any(word in content_lower for word in ['tech', 'code', 'development', 'programming']):
-                return "night"
-            elif any(word in content_lower for word in ['creative', 'design', 'art']):
-                return "sky"
-            elif any(word in content_lower for word in ['history', 'ancient', 'culture']):
-                return "serif"
-            else:
-                return "white"
+            return keyword_theme(markdown)
         
         prompt = f"""Based on this presentation content, choose the most appropriate reveal.js theme from this exact list:
 
@@ -122,8 +270,8 @@ Content preview:
 
 Consider the topic, tone, and audience. Respond with ONLY ONE theme name from the list above, nothing else."""
         
-        theme = self.generate_text(prompt).strip().lower()
-        log(f"AI suggested theme: '{theme}'")
+        theme = self.generate_text(prompt, job, stage="suggest_theme").strip().lower()
+        logger.info(f"AI suggested theme: '{theme}'")
         
         # Clean up response and validate
         theme = theme.replace('"', '').replace("'", "").replace('.', '').strip()
@@ -131,56 +279,26 @@ Consider the topic, tone, and audience. Respond with ONLY ONE theme name from th
         
         # Find exact match
         if theme in valid_themes:
-            log(f"Using theme: {theme}")
+            logger.info(f"Using theme: {theme}")
             return theme
         
         # Find partial match
         for valid_theme in valid_themes:
             if valid_theme in theme:
-                log(f"Using partial match theme: {valid_theme}")
+                logger.info(f"Using partial match theme: {valid_theme}")
                 return valid_theme
         
         # Default fallback
-        log("Using fallback theme: white")
+        logger.info("Using fallback theme: white")
         return "white"
     
-    def generateStyledHTML(self, title: str, markdown: str, theme: str) -> str:
+    def generateStyledHTML(self, title: str, markdown: str, theme: str, job=None) -> str:
         """Generate complete HTML presentation from markdown"""
-        log(f"Generating HTML with theme: {theme}")
+        logger.info(f"Generating HTML with theme: {theme}")
         slides_html = self._markdown_to_slides(markdown)
         
-        base_html = f"""<!doctype html>
-<html lang="en">
-<head>
-  <meta charset="utf-8">
-  <title>{title} - SlideGenius</title>
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <link rel="stylesheet" href="{REVEAL_CSS_CDN}">
-  <link rel="stylesheet" href="{REVEAL_THEME_BASE}/{theme}.min.css" id="theme">
-</head>
-<body>
-  <div class="reveal">
-    <div class="slides">
-      {slides_html}
-    </div>
-  </div>
-  <script src="{REVEAL_JS_CDN}"></script>
-  <script>
-    Reveal.initialize({{
-      hash: true,
-      slideNumber: true,
-      controls: true,
-      progress: true,
-      transition: 'slide',
-      center: false,
-      height: '100%',
-      margin: 0.1,
-      minScale: 0.5,
-      maxScale: 1.5
-    }});
-  </script>
-</body>
-</html>"""
+        from .highlight import style_css, style_for_theme
+        base_html = reveal_document(title, slides_html, theme, style_css(style_for_theme(theme)))
         
         prompt = f"""Enhance this Reveal.js presentation HTML with proper layout and styling while keeping the "{theme}" theme.
 
@@ -208,7 +326,7 @@ Return ONLY the complete HTML with proper "{theme}" theme applied:
 
 {base_html}"""
         
-        enhanced = self.generate_text(prompt)
+        enhanced = self.generate_text(prompt, job, stage="generate_html")
         
         # Ensure we have complete HTML
         if "<!doctype html>" in enhanced.lower():
@@ -226,31 +344,12 @@ Return ONLY the complete HTML with proper "{theme}" theme applied:
     
     def _markdown_to_slides(self, markdown: str) -> str:
         """Convert markdown to individual slide sections"""
-        import re
-        from markdown import markdown as md_to_html
-        
-        # Split by slide separators or headings
-        if "---" in markdown:
-            slides = [s.strip() for s in markdown.split("---") if s.strip()]
-        else:
-            # Split by main headings (# )
-            parts = re.split(r'\n(?=#\s)', markdown)
-            slides = [part.strip() for part in parts if part.strip()]
-        
-        if not slides:
-            slides = [markdown]
-        
-        # Convert each slide to HTML with proper extensions
-        slide_sections = []
-        for slide_content in slides:
-            if slide_content.strip():
-                # Use extensions that handle tables, code, and other elements properly
-                html_content = md_to_html(
-                    slide_content, 
-                    extensions=['extra', 'tables', 'codehilite', 'fenced_code', 'toc']
-                )
-                slide_sections.append(f"<section>\n{html_content}\n</section>")
+        # Split on '---' lines outside code fences, or on top-level headings
+        # Use extensions that handle tables, code, and other elements properly;
+        # big decks are rendered in parallel
+        slide_sections = [
+            f"<section>\n{html_content}\n</section>"
+            for html_content in render_slides(iter_slides(markdown), SLIDE_EXTENSIONS)
+        ]
         
         return "\n".join(slide_sections)
-
-groq_service = GroqService()
\ No newline at end of file
@@ -0,0 +1,178 @@
+# backend/app/services/highlight.py
+"""
+Cached syntax highlighting for markdown code blocks.
+
+The same snippets show up in deck after deck, so highlighted HTML is kept in
+an LRU keyed by (language, code hash, style, formatter options) and bounded
+by total size. Pygments lexers and formatters are resolved once per language
+and option set instead of once per block, and the stylesheet for each
+Pygments style is generated once.
+
+Both `codehilite` (indented blocks) and `fenced_code` (fenced blocks, when
+codehilite is enabled) look up the `CodeHilite` class from their own module
+globals, so `install()` points both at `CachedCodeHilite`. Output is
+identical; only repeated work is skipped.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from markdown.extensions import codehilite, fenced_code
+from markdown.extensions.codehilite import CodeHilite
+from pygments import highlight
+from pygments.formatters import HtmlFormatter, get_formatter_by_name
+from pygments.lexers import get_lexer_by_name, guess_lexer
+from pygments.util import ClassNotFound
+
+from ..config import settings
+
+# Reveal.js themes with a dark background get a dark Pygments style
+DARK_THEMES = {"black", "league", "night", "moon", "blood"}
+DARK_STYLE = "monokai"
+LIGHT_STYLE = "friendly"
+
+
+class HighlightCache:
+    """Thread-safe LRU of highlighted HTML, bounded by the total size of the entries."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.lexers_resolved = 0
+
+    def get(self, key) -> Optional[str]:
+        with self.lock:
+            html = self.entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def put(self, key, html: str) -> None:
+        if len(html) > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self.entries[key] = html
+            self.size += len(html)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "lexers_resolved": self.lexers_resolved,
+            }
+
+
+highlight_cache = HighlightCache(max_bytes=settings.highlight_cache_bytes)
+
+# Lexers and formatters keyed by (name, options); None marks an unknown language
+_lexers: Dict[Tuple, Any] = {}
+_formatters: Dict[Tuple, Any] = {}
+_lock = threading.Lock()
+
+
+def _resolve_lexer(lang: Optional[str], options_key: Tuple, options: Dict[str, Any]):
+    key = (lang, options_key)
+    with _lock:
+        if key in _lexers:
+            return _lexers[key]
+    try:
+        lexer = get_lexer_by_name(lang, **options) if lang else None
+    except ValueError:
+        lexer = None
+    with _lock:
+        _lexers[key] = lexer
+    with highlight_cache.lock:
+        highlight_cache.lexers_resolved += 1
+    return lexer
+
+
+def _resolve_formatter(name: str, options_key: Tuple, options: Dict[str, Any]):
+    key = (name, options_key)
+    with _lock:
+        formatter = _formatters.get(key)
+    if formatter is None:
+        try:
+            formatter = get_formatter_by_name(name, **options)
+        except ClassNotFound:
+            formatter = get_formatter_by_name("html", **options)
+        with _lock:
+            _formatters[key] = formatter
+    return formatter
+
+
+@lru_cache(maxsize=None)
+def style_css(style: str, selector: str = ".codehilite") -> str:
+    """Stylesheet for a Pygments style, generated once per (style, selector)."""
+    return HtmlFormatter(style=style).get_style_defs(selector)
+
+
+def style_for_theme(theme: str) -> str:
+    return DARK_STYLE if theme in DARK_THEMES else LIGHT_STYLE
+
+
+class CachedCodeHilite(CodeHilite):
+    def hilite(self, shebang: bool = True) -> str:
+        self.src = self.src.strip("\n")
+        if self.lang is None and shebang:
+            self._parseHeader()
+        if not self.use_pygments or not isinstance(self.pygments_formatter, str):
+            return super().hilite(shebang=False)
+
+        options_key = tuple(sorted((k, repr(v)) for k, v in self.options.items()))
+        key = (
+            self.lang or "",
+            hashlib.sha1(self.src.encode("utf-8")).hexdigest(),
+            self.options.get("style"),
+            self.pygments_formatter,
+            options_key,
+        )
+        html = highlight_cache.get(key)
+        if html is not None:
+            return html
+
+        lexer = _resolve_lexer(self.lang, options_key, self.options)
+        if lexer is None:
+            # Guessing depends on the code itself, so it is only cached through the HTML
+            try:
+                lexer = guess_lexer(self.src, **self.options) if self.guess_lang else None
+            except ValueError:
+                lexer = None
+            if lexer is None:
+                lexer = _resolve_lexer("text", options_key, self.options)
+        formatter = _resolve_formatter(self.pygments_formatter, options_key, self.options)
+
+        html = highlight(self.src, lexer, formatter)
+        highlight_cache.put(key, html)
+        return html
+
+
+def install() -> None:
+    """Make `codehilite` and `fenced_code` highlight through the cache."""
+    codehilite.CodeHilite = CachedCodeHilite
+    fenced_code.CodeHilite = CachedCodeHilite
+
+
+def uninstall() -> None:
+    codehilite.CodeHilite = CodeHilite
+    fenced_code.CodeHilite = CodeHilite
@@ -1,13 +1,13 @@
-import requests
 from ..config import settings
-import sys
-from huggingface_hub import InferenceClient
+from ..logs import get_logger, log_llm_exchange
 import json
+import time
+from .groq_service import unwrap_markdown_fence
+from .markdown_render import render_slides
+from .slides import iter_slides
+from .usage import usage_tracker
 
-def log(message):
-    """Log with immediate output"""
-    print(message, flush=True)
-    sys.stdout.flush()
+logger = get_logger("llm.huggingface")
 
 REVEAL_CSS_CDN = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/reveal.min.css"
 REVEAL_JS_CDN = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/reveal.min.js"
@@ -19,18 +19,32 @@ class HuggingFaceService:
         self.use_mock = settings.use_mock_llm or not self.api_key
         
         if self.use_mock:
-            log("WARNING: Using mock LLM responses - set HUGGINGFACE_API_KEY to use real API")
+            logger.warning("Using mock LLM responses - set HUGGINGFACE_API_KEY to use real API")
         else:
-            log("Using real Hugging Face API")
+            logger.info("Using real Hugging Face API")
+            from huggingface_hub import InferenceClient
             self.client = InferenceClient(token=self.api_key)
             
-    def generate_text(self, prompt: str, model_id: str = "deepseek-ai/DeepSeek-V3-0324") -> str:
+    def generate_text(self, prompt: str, model_id: str = "deepseek-ai/DeepSeek-V3-0324", stage: str = "generate_text") -> str:
         """Generate text using Hugging Face Inference API with conversational interface"""
         if self.use_mock:
             return "This is a mock response for prompt: " + prompt[:50] + "..."
 
-        log(f"The prompt: {prompt}\n==================================\n")
+        started = time.perf_counter()
+        result, usage = self._generate(prompt, model_id)
+        latency_ms = (time.perf_counter() - started) * 1000
+        ok = result != "Failed to generate content"
+        log_llm_exchange(logger, "huggingface", stage, model_id, prompt, result if ok else None, latency_ms)
+        usage_tracker.record(
+            stage, "huggingface", model_id,
+            getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None),
+            latency_ms,
+            ok=ok, prompt=prompt, completion=result,
+        )
+        return result
 
+    def _generate(self, prompt: str, model_id: str):
+        """Returns (text, provider-reported usage or None)."""
         try:
             response = self.client.chat.completions.create(
                 model=model_id,
@@ -47,18 +61,14 @@ class HuggingFaceService:
                 presence_penalty=0,   # Encourages new topics (-2.0 to 2.0)
             )
             if response:
-                log(f"Successfully generated text with conversational interface: {model_id}")
-                log(response)
-                log(response.choices[0].message.content)
-                log("\n=========================================================\n")
-                return response.choices[0].message.content
+                return response.choices[0].message.content, getattr(response, "usage", None)
         except Exception as conv_error:
-            log(f"Conversational interface failed for {model_id}: {str(conv_error)}")
+            logger.warning(f"Conversational interface failed for {model_id}: {str(conv_error)}")
         
 
         # If the model fail, try direct API approach as fallback
-        log("All InferenceClient attempts failed, trying direct API...")
-        return self._direct_api_call(prompt, model_id)
+        logger.info("All InferenceClient attempts failed, trying direct API...")
+        return self._direct_api_call(prompt, model_id), None
     
     def _direct_api_call(self, prompt: str, model: str) -> str:
         """Fallback direct API call method - tries both conversational and text generation"""
@@ -68,7 +78,7 @@ class HuggingFaceService:
             if response:
                 return response
         except Exception as e:
-            log(f"Direct conversational API failed: {str(e)}")
+            logger.warning(f"Direct conversational API failed: {str(e)}")
         
         try:
             # Fallback to text generation endpoint
@@ -76,7 +86,7 @@ class HuggingFaceService:
             if response:
                 return response
         except Exception as e:
-            log(f"Direct text generation API failed: {str(e)}")
+            logger.warning(f"Direct text generation API failed: {str(e)}")
         
         return "Failed to generate content"
     
@@ -108,7 +118,7 @@ class HuggingFaceService:
                 return str(response).strip()
                 
         except Exception as e:
-            log(f"Chat completion failed: {str(e)}")
+            logger.warning(f"Chat completion failed: {str(e)}")
             raise e
     
     # Currently not used
@@ -150,6 +160,7 @@ class HuggingFaceService:
             "top_p": 0.95
         }
         
+        import requests
         response = requests.post(api_url, headers=headers, json=payload, timeout=30)
         
         if response.status_code == 200:
@@ -177,6 +188,7 @@ class HuggingFaceService:
             }
         }
         
+        import requests
         response = requests.post(api_url, headers=headers, json=payload, timeout=30)
         
         if response.status_code == 200:
@@ -209,16 +221,10 @@ Original markdown:
 
 Please provide only the improved markdown content, no explanations or additional text or clarifications."""
         
-        improved = self.generate_text(prompt)
+        improved = self.generate_text(prompt, stage="improve_markdown")
         
         # Clean up the response
-        if "```markdown" in improved:
-            improved = improved.split("```markdown")[1].split("```")[0].strip()
-        elif "```" in improved:
-            # Find content between first set of backticks
-            parts = improved.split("```")
-            if len(parts) >= 3:
-                improved = parts[1].strip()
+        improved = unwrap_markdown_fence(improved)
         
         # Remove any leading explanatory text
         lines = improved.split('\n')
@@ -244,7 +250,7 @@ Content preview:
 
 Consider the topic, tone, and audience. Respond with ONLY ONE theme name from the list above, nothing else."""
         
-        theme = self.generate_text(prompt).strip().lower()
+        theme = self.generate_text(prompt, stage="suggest_theme").strip().lower()
         
         # Clean up response and validate
         theme = theme.replace('"', '').replace("'", "").replace('.', '').strip()
@@ -319,7 +325,7 @@ Base HTML to enhance:
 
 Return ONLY the complete HTML code with creative styling."""
         
-        result = self.generate_text(prompt)
+        result = self.generate_text(prompt, stage="generate_html")
         
         # Clean the response
         if "<!doctype html>" in result.lower():
@@ -334,28 +340,10 @@ Return ONLY the complete HTML code with creative styling."""
     
     def _markdown_to_slides(self, markdown: str) -> str:
         """Convert markdown to individual slide sections"""
-        import re
-        from markdown import markdown as md_to_html
-        
-        # Split by slide separators or headings
-        if "---" in markdown:
-            slides = [s.strip() for s in markdown.split("---") if s.strip()]
-        else:
-            # Split by main headings (# )
-            parts = re.split(r'\n(?=#\s)', markdown)
-            slides = [part.strip() for part in parts if part.strip()]
-        
-        if not slides:
-            slides = [markdown]
-        
-        # Convert each slide to HTML
-        slide_sections = []
-        for slide_content in slides:
-            if slide_content.strip():
-                html_content = md_to_html(slide_content, extensions=['extra', 'codehilite'])
-                slide_sections.append(f"<section>\n{html_content}\n</section>")
+        # Split on '---' lines outside code fences, or on top-level headings
+        slide_sections = [
+            f"<section>\n{html_content}\n</section>"
+            for html_content in render_slides(iter_slides(markdown), ("extra", "codehilite"))
+        ]
         
         return "\n".join(slide_sections)
-
-# Create singleton instance
-hf_service = HuggingFaceService()
\ No newline at end of file
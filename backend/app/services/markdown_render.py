@@ -0,0 +1,235 @@
+# backend/app/services/markdown_render.py
+"""
+Markdown rendering shared by every service.
+
+`markdown.markdown()` builds a new `Markdown` instance and loads its
+extensions on every call. Here converters are built once per extension set,
+kept in a thread-safe pool and `reset()` between uses, and rendered slide
+HTML is memoized in an LRU keyed by (hash of the text, extension set), so
+re-rendering a deck after a small edit only converts the changed slides.
+
+`render_slides` renders a whole deck. Large or code-heavy decks (Pygments
+highlighting dominates their CPU time) are spread across a process pool so
+they neither block one core nor hold the GIL; small decks stay serial because
+the IPC costs more than it saves. Output order always matches the input.
+
+`markdown` and Pygments are imported when the first converter is built, not
+when this module is imported, to keep the server's cold start short.
+"""
+import hashlib
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from ..logs import get_logger
+
+logger = get_logger("render")
+
+# Extension sets used by the services
+SLIDE_EXTENSIONS = ("extra", "tables", "codehilite", "fenced_code", "toc")
+LOCAL_EXTENSIONS = ("extra", "sane_lists", "toc")
+
+
+_highlight_installed = False
+
+
+def _new_converter(extensions: Tuple[str, ...]):
+    global _highlight_installed
+    import markdown
+
+    if not _highlight_installed:
+        from . import highlight
+        # Code blocks are highlighted through the shared cache (also in render pool workers)
+        highlight.install()
+        _highlight_installed = True
+    return markdown.Markdown(extensions=list(extensions))
+
+
+class ConverterPool:
+    """Thread-safe pool of preconfigured Markdown converters, one free-list per extension set."""
+
+    def __init__(self, max_idle: int = 8):
+        self.max_idle = max_idle
+        self.idle: Dict[Tuple[str, ...], List["markdown.Markdown"]] = {}
+        self.lock = threading.Lock()
+        self.created = 0
+
+    @contextmanager
+    def converter(self, extensions: Tuple[str, ...]) -> Iterator["markdown.Markdown"]:
+        with self.lock:
+            free = self.idle.setdefault(extensions, [])
+            md = free.pop() if free else None
+        if md is None:
+            md = _new_converter(extensions)
+            with self.lock:
+                self.created += 1
+        try:
+            yield md
+        finally:
+            md.reset()
+            with self.lock:
+                free = self.idle[extensions]
+                if len(free) < self.max_idle:
+                    free.append(md)
+
+
+class RenderCache:
+    """Bounded, thread-safe LRU of rendered HTML."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple[str, Tuple[str, ...]], str]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[str]:
+        with self.lock:
+            html = self.entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def put(self, key, html: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self.lock:
+            self.entries[key] = html
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+converter_pool = ConverterPool(max_idle=settings.markdown_pool_size)
+render_cache = RenderCache(max_entries=settings.markdown_cache_size)
+
+
+def render_key(text: str, extensions: Tuple[str, ...]) -> Tuple[str, Tuple[str, ...]]:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest(), extensions
+
+
+def render_markdown(text: str, extensions: Tuple[str, ...] = SLIDE_EXTENSIONS) -> str:
+    """Convert markdown to HTML through the memo and the converter pool."""
+    key = render_key(text, extensions)
+    html = render_cache.get(key)
+    if html is None:
+        with converter_pool.converter(extensions) as md:
+            html = md.convert(text)
+        render_cache.put(key, html)
+    return html
+
+
+def iter_render(slides: Iterable[str], extensions: Tuple[str, ...] = SLIDE_EXTENSIONS) -> Iterator[str]:
+    """Render slides one at a time as they are consumed, for streamed documents."""
+    for text in slides:
+        yield render_markdown(text, extensions)
+
+
+def _count_code_blocks(text: str) -> int:
+    return (text.count("```") + text.count("~~~")) // 2
+
+
+def _render_in_worker(job: Tuple[str, Tuple[str, ...]]) -> str:
+    # Runs in a pool process, which keeps its own converter pool
+    text, extensions = job
+    with converter_pool.converter(extensions) as md:
+        return md.convert(text)
+
+
+class ProcessRenderer:
+    """Lazily started process pool for rendering many slides at once."""
+
+    def __init__(self, processes: int, min_slides: int, min_code_blocks: int):
+        self.processes = processes
+        self.min_slides = min_slides
+        self.min_code_blocks = min_code_blocks
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.lock = threading.Lock()
+        self.parallel_renders = 0
+
+    def should_parallelize(self, texts: List[str]) -> bool:
+        if self.processes <= 1 or len(texts) < 2:
+            return False
+        if len(texts) >= self.min_slides:
+            return True
+        return sum(_count_code_blocks(t) for t in texts) >= self.min_code_blocks
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                # spawn: forking would copy locks held by the server's worker threads
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self.executor
+
+    def render(self, texts: List[str], extensions: Tuple[str, ...]) -> List[str]:
+        chunksize = max(len(texts) // (self.processes * 4), 1)
+        try:
+            results = list(self._executor().map(_render_in_worker, [(t, extensions) for t in texts], chunksize=chunksize))
+        except BrokenProcessPool:
+            with self.lock:
+                self.executor = None
+            raise
+        self.parallel_renders += 1
+        return results
+
+    def shutdown(self) -> None:
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
+
+
+process_renderer = ProcessRenderer(
+    processes=settings.render_processes,
+    min_slides=settings.render_parallel_min_slides,
+    min_code_blocks=settings.render_parallel_min_code_blocks,
+)
+
+
+def render_slides(slides: Iterable[str], extensions: Tuple[str, ...] = SLIDE_EXTENSIONS) -> List[str]:
+    """
+    Render every slide of a deck, in order. Memoized slides are reused; the
+    rest go through the process pool when the deck is past a threshold.
+    """
+    texts = list(slides)
+    keys = [render_key(t, extensions) for t in texts]
+    results: List[Optional[str]] = [render_cache.get(k) for k in keys]
+    missing = [i for i, html in enumerate(results) if html is None]
+
+    rendered: Optional[List[str]] = None
+    if process_renderer.should_parallelize([texts[i] for i in missing]):
+        try:
+            rendered = process_renderer.render([texts[i] for i in missing], extensions)
+        except BrokenProcessPool:
+            logger.warning("Render pool failed; rendering serially")
+    if rendered is None:
+        rendered = []
+        for i in missing:
+            with converter_pool.converter(extensions) as md:
+                rendered.append(md.convert(texts[i]))
+
+    for i, html in zip(missing, rendered):
+        results[i] = html
+        render_cache.put(keys[i], html)
+    return results
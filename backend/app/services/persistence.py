@@ -0,0 +1,233 @@
+# backend/app/services/persistence.py
+"""
+How generation jobs write their results.
+
+A job's outcome is one conditional UPDATE keyed by presentation id, so the
+row is never fetched first: a normal job only overwrites a row that is
+still pending, and a job upgrading a local preview only overwrites it if
+neither its markdown nor its theme has been edited since. Either way the row must still carry
+the job's id (`job_id`, set with the pending state when the job was
+submitted), so a superseded job can't write over a newer one, even from the
+write-behind queue. The new content is also recorded as a version in the
+same transaction.
+
+Interactive jobs commit their write immediately. Bulk jobs hand it to the
+write-behind writer, which groups the writes of many jobs into one commit
+(up to WRITE_BEHIND_MAX_BATCH writes or WRITE_BEHIND_MAX_DELAY_MS after the
+first) and frees the worker to start its next job. Queued writes are lost
+if the process dies before they are flushed; those rows stay pending, like
+a job that died mid-generation. Shutdown flushes the queue.
+"""
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db import SessionLocal
+from ..logs import get_logger
+from ..models import Presentation
+from . import versions
+from .presentation_cache import presentation_cache
+
+logger = get_logger("persistence")
+
+
+@dataclass
+class PresentationWrite:
+    presentation_id: str
+    user_id: str
+    values: Dict[str, Any]
+    # Only write if the row is still in this status...
+    expect_status: Optional[str] = "pending"
+    # ...or, when set, still has this markdown (upgrading an unedited preview)
+    expect_markdown: Optional[str] = None
+    # ...and this theme, so a theme edit on the preview also survives the upgrade
+    expect_theme: Optional[str] = None
+    # ...and still belongs to this job (None for writes not made by a job)
+    expect_job_id: Optional[str] = None
+    # Record the new content as a version with this source
+    version_source: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+
+
+def apply_write(db: Session, write: PresentationWrite) -> bool:
+    """Issue the conditional UPDATE; returns whether it matched. The caller commits."""
+    statement = update(Presentation).where(
+        Presentation.id == uuid.UUID(write.presentation_id),
+        Presentation.user_id == uuid.UUID(write.user_id),
+    )
+    if write.expect_job_id is not None:
+        statement = statement.where(Presentation.job_id == write.expect_job_id)
+    if write.expect_theme is not None:
+        statement = statement.where(Presentation.theme == write.expect_theme)
+    if write.expect_markdown is not None:
+        statement = statement.where(Presentation.markdown_content == write.expect_markdown)
+    elif write.expect_status is not None:
+        statement = statement.where(Presentation.status == write.expect_status)
+    row = db.execute(
+        statement.values(**write.values).returning(Presentation.title, Presentation.theme)
+    ).first()
+    if row is None:
+        return False
+    if write.version_source:
+        # Only holds the values record_version reads; never added to the session
+        snapshot = Presentation(
+            id=uuid.UUID(write.presentation_id),
+            title=row.title,
+            theme=row.theme,
+            markdown_content=write.values.get("markdown_content", ""),
+            html_content=write.values.get("html_content", ""),
+        )
+        versions.record_version(db, snapshot, source=write.version_source)
+    return True
+
+
+class WriteBehindWriter:
+    """Background thread that applies queued writes in grouped commits."""
+
+    def __init__(self, session_factory: Callable[[], Session], max_batch: int = 50, max_delay: float = 0.05):
+        self.session_factory = session_factory
+        self.max_batch = max(max_batch, 1)
+        self.max_delay = max_delay
+        self.queue: "queue.Queue[Optional[Tuple[PresentationWrite, Future]]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        self.commits = 0
+        self.writes = 0
+        self.unmatched = 0
+        self.failed = 0
+        self.largest_batch = 0
+        self.total_lag = 0.0
+
+    def submit(self, write: PresentationWrite) -> Future:
+        """Queue a write; the future resolves to whether it matched, once committed."""
+        self._ensure_started()
+        future: Future = Future()
+        self.queue.put((write, future))
+        return future
+
+    def _ensure_started(self) -> None:
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self.thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self.queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+
+    def _apply(self, batch: List[Tuple[PresentationWrite, Future]]) -> List[bool]:
+        db = self.session_factory()
+        try:
+            matched = []
+            for write, _ in batch:
+                matched.append(apply_write(db, write))
+                # The next write may record a version of the same deck
+                db.flush()
+            db.commit()
+            return matched
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _commit(self, batch: List[Tuple[PresentationWrite, Future]]) -> None:
+        try:
+            results = list(zip(batch, self._apply(batch)))
+            commits = 1
+        except Exception as e:
+            # Retry one by one so a single bad write doesn't lose the rest of the group
+            logger.warning(f"Write-behind batch of {len(batch)} failed ({e}); retrying individually")
+            results, commits = [], 0
+            for item in batch:
+                try:
+                    results.append((item, self._apply([item])[0]))
+                    commits += 1
+                except Exception as item_error:
+                    logger.error(f"Write-behind write for {item[0].presentation_id} failed: {item_error}")
+                    item[1].set_exception(item_error)
+                    with self.lock:
+                        self.failed += 1
+
+        now = time.time()
+        for (write, future), matched in results:
+            if matched:
+                presentation_cache.invalidate(write.user_id, write.presentation_id)
+            future.set_result(matched)
+        with self.lock:
+            self.commits += commits
+            self.writes += len(results)
+            self.unmatched += sum(1 for _, matched in results if not matched)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.total_lag += sum(now - write.submitted_at for (write, _), _ in results)
+
+    def stop(self) -> None:
+        """Flush everything queued so far and stop the thread."""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join()
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            return {
+                "queued": self.queue.qsize(),
+                "writes": self.writes,
+                "commits": self.commits,
+                "writes_per_commit": round(self.writes / self.commits, 2) if self.commits else 0.0,
+                "largest_batch": self.largest_batch,
+                "unmatched": self.unmatched,
+                "failed": self.failed,
+                "avg_lag_ms": round(self.total_lag / self.writes * 1000, 2) if self.writes else 0.0,
+                "max_batch": self.max_batch,
+                "max_delay_ms": self.max_delay * 1000,
+            }
+
+
+write_behind = WriteBehindWriter(
+    SessionLocal,
+    max_batch=settings.write_behind_max_batch,
+    max_delay=settings.write_behind_max_delay_ms / 1000,
+)
+
+
+def persist(db: Session, write: PresentationWrite, priority: str = "interactive") -> Optional[bool]:
+    """
+    Write a job's outcome. Returns whether the row matched, or None when the
+    write was queued behind (bulk jobs).
+    """
+    if priority == "bulk" and settings.write_behind_enabled:
+        write_behind.submit(write)
+        return None
+    matched = apply_write(db, write)
+    db.commit()
+    if matched:
+        presentation_cache.invalidate(write.user_id, write.presentation_id)
+    return matched
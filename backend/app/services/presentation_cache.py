@@ -0,0 +1,313 @@
+# backend/app/services/presentation_cache.py
+"""
+Read-through cache of serialized presentation payloads for the get and
+status routes, keyed by (user_id, presentation_id) so a hit is also an
+ownership check.
+
+A completed deck rarely changes, so its JSON stays cached until a write
+invalidates it: update, restore, delete, a new /generate or bulk upsert,
+and the pipeline's persist step. Pending rows change under the client that
+is polling them and only get a short TTL.
+
+The in-process LRU can sit in front of an optional SQLite file shared by
+the worker processes on a host (PRESENTATION_CACHE_SHARED_PATH). Another
+process's invalidation only reaches the shared file, so with it enabled
+local entries also expire after PRESENTATION_CACHE_LOCAL_TTL_SECONDS.
+The file can block on another worker's lock, so with it enabled async
+callers check `get_local` on the event loop and hand `get_shared`, `put`
+and `invalidate` to the thread pool (`blocking`).
+
+A read that started before an invalidation must not put the row it loaded
+back in the cache. `begin()` returns a stamp to pass to `put()`, which drops
+the payload if the key was invalidated after the stamp was taken.
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from ..config import settings
+from ..logs import get_logger
+
+logger = get_logger("cache")
+
+PENDING_STATUSES = {"pending", None}
+
+
+def cache_key(user_id, presentation_id) -> str:
+    """Canonical key; raises ValueError for malformed ids."""
+    return f"{uuid.UUID(str(user_id))}:{uuid.UUID(str(presentation_id))}"
+
+
+class SQLitePresentationCacheStore:
+    """Payloads in a SQLite file shared by every worker process on the host."""
+
+    PURGE_EVERY = 1000
+    # Every call may wait on the file lock held by another worker
+    blocking = True
+    # Invalidations are remembered this long to reject writes from reads that started earlier
+    TOMBSTONE_SECONDS = 60
+
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.local()
+        self.writes = 0
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().execute("""
+            CREATE TABLE IF NOT EXISTS presentation_cache (
+                key TEXT PRIMARY KEY,
+                payload BLOB,
+                status TEXT,
+                expires_at REAL,
+                invalidated_at REAL
+            )
+        """)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def get(self, key: str, now: float) -> Optional[Tuple[bytes, Optional[str], Optional[float]]]:
+        row = self._connection().execute(
+            "SELECT payload, status, expires_at FROM presentation_cache WHERE key = ? AND payload IS NOT NULL",
+            (key,),
+        ).fetchone()
+        if row is None or (row[2] is not None and row[2] <= now):
+            return None
+        return bytes(row[0]), row[1], row[2]
+
+    def put(self, key: str, payload: bytes, status: Optional[str], expires_at: Optional[float], started_at: float) -> bool:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT invalidated_at FROM presentation_cache WHERE key = ?", (key,)).fetchone()
+            if row and row[0] is not None and row[0] >= started_at:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO presentation_cache VALUES (?, ?, ?, ?, NULL)",
+                (key, payload, status, expires_at),
+            )
+            self._maybe_purge(conn, time.time())
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def invalidate(self, key: str, now: float) -> None:
+        # Keep a tombstone so an in-flight read can't repopulate the key
+        self._connection().execute(
+            "INSERT OR REPLACE INTO presentation_cache VALUES (?, NULL, NULL, ?, ?)",
+            (key, now + self.TOMBSTONE_SECONDS, now),
+        )
+
+    def _maybe_purge(self, conn: sqlite3.Connection, now: float) -> None:
+        with self.lock:
+            self.writes += 1
+            due = self.writes % self.PURGE_EVERY == 0
+        if due:
+            conn.execute("DELETE FROM presentation_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+
+    def size(self) -> int:
+        return self._connection().execute(
+            "SELECT count(*) FROM presentation_cache WHERE payload IS NOT NULL"
+        ).fetchone()[0]
+
+
+class PresentationCache:
+    """In-process LRU of presentation payloads, optionally backed by a shared store."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        pending_ttl: float = 2.0,
+        shared: Optional[SQLitePresentationCacheStore] = None,
+        local_ttl: float = 5.0,
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.pending_ttl = pending_ttl
+        self.shared = shared
+        # Async callers run get_shared, put and invalidate in the thread pool when set
+        self.blocking = shared is not None and shared.blocking
+        # Bounds how long another process's invalidation can go unseen here
+        self.local_ttl = local_ttl if shared else None
+        # key -> (payload, expires_at or None)
+        self.entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        # Invalidation stamps per key; `floor` covers the ones evicted from the dict
+        self.counter = 0
+        self.invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self.floor = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.stale_puts = 0
+        self.invalidations = 0
+
+    def begin(self) -> Tuple[int, float]:
+        """Stamp to take before reading the row from the database."""
+        with self.lock:
+            return self.counter, time.time()
+
+    def get(self, key: str) -> Optional[bytes]:
+        payload = self.get_local(key)
+        if payload is None:
+            payload = self.get_shared(key)
+        return payload
+
+    def get_local(self, key: str) -> Optional[bytes]:
+        """The in-process tier only; never blocks. Follow a miss with get_shared()."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > now:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._drop(key)
+        return None
+
+    def get_shared(self, key: str) -> Optional[bytes]:
+        """The shared tier after a local miss (blocking when `self.blocking`); counts the miss."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self.lock:
+            counter = self.counter
+        if self.shared is not None:
+            try:
+                found = self.shared.get(key, now)
+            except sqlite3.Error as e:
+                logger.warning(f"Shared presentation cache read failed: {e}")
+                found = None
+            if found is not None:
+                payload, status, expires_at = found
+                with self.lock:
+                    self.shared_hits += 1
+                    if not self._invalidated_since(key, counter):
+                        self._store(key, payload, self._local_expiry(expires_at, now))
+                return payload
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, payload: bytes, status: Optional[str], stamp: Tuple[int, float]) -> None:
+        if not self.enabled or len(payload) > self.max_bytes:
+            return
+        counter, started_at = stamp
+        now = time.time()
+        expires_at = now + self.pending_ttl if status in PENDING_STATUSES else None
+        with self.lock:
+            if self._invalidated_since(key, counter):
+                self.stale_puts += 1
+                return
+            self._store(key, payload, self._local_expiry(expires_at, now))
+        if self.shared is not None:
+            try:
+                if not self.shared.put(key, payload, status, expires_at, started_at):
+                    with self.lock:
+                        self.stale_puts += 1
+            except sqlite3.Error as e:
+                logger.warning(f"Shared presentation cache write failed: {e}")
+
+    def invalidate(self, user_id, presentation_id) -> None:
+        """Drop a presentation after a write to it has committed."""
+        if not self.enabled:
+            return
+        key = cache_key(user_id, presentation_id)
+        with self.lock:
+            self.counter += 1
+            self.invalidations += 1
+            self.invalidated[key] = self.counter
+            self.invalidated.move_to_end(key)
+            while len(self.invalidated) > self.max_entries:
+                _, stamp = self.invalidated.popitem(last=False)
+                self.floor = max(self.floor, stamp)
+            self._drop(key)
+        if self.shared is not None:
+            try:
+                self.shared.invalidate(key, time.time())
+            except sqlite3.Error as e:
+                logger.warning(f"Shared presentation cache invalidation failed: {e}")
+
+    def _invalidated_since(self, key: str, counter: int) -> bool:
+        return counter < self.floor or self.invalidated.get(key, -1) > counter
+
+    def _local_expiry(self, expires_at: Optional[float], now: float) -> Optional[float]:
+        if self.local_ttl is None:
+            return expires_at
+        local = now + self.local_ttl
+        return local if expires_at is None else min(expires_at, local)
+
+    def _store(self, key: str, payload: bytes, expires_at: Optional[float]) -> None:
+        self._drop(key)
+        self.entries[key] = (payload, expires_at)
+        self.size += len(payload)
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, (evicted, _) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def _drop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            stats = {
+                "enabled": self.enabled,
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "stale_puts": self.stale_puts,
+            }
+        if self.shared is not None:
+            try:
+                stats["shared_entries"] = self.shared.size()
+            except sqlite3.Error:
+                pass
+        return stats
+
+
+def _build_cache() -> PresentationCache:
+    shared = None
+    if settings.presentation_cache_enabled and settings.presentation_cache_shared_path:
+        shared = SQLitePresentationCacheStore(settings.presentation_cache_shared_path)
+    return PresentationCache(
+        enabled=settings.presentation_cache_enabled,
+        max_entries=settings.presentation_cache_size,
+        max_bytes=settings.presentation_cache_bytes,
+        pending_ttl=settings.presentation_cache_pending_ttl_seconds,
+        shared=shared,
+        local_ttl=settings.presentation_cache_local_ttl_seconds,
+    )
+
+
+presentation_cache = _build_cache()
@@ -0,0 +1,271 @@
+# backend/app/services/profiling.py
+"""
+On-demand sampling profiler for one request and the generation it starts.
+
+A request is profiled when an admin sends `X-Profile: 1` (or every
+presentation request when PROFILING_ENABLED is set). The middleware opens a
+session and stores it in a context variable; the generation scheduler
+copies the submitting context into its jobs, so `run_generation_pipeline`
+finds the same session and attaches its worker thread. While any session is
+open, one sampler thread reads `sys._current_frames()` every
+PROFILING_INTERVAL_MS and counts the stack of each attached thread.
+
+The session ends when the request and every job it started have finished.
+Its collapsed stacks ("frame;frame;frame count", the input of flamegraph.pl
+and speedscope) are saved as JSON under each presentation id it touched,
+keeping the newest PROFILING_KEEP per presentation, and served by
+/admin/profiles.
+
+Handlers run on the event loop thread, which is sampled while the request
+is in flight, so concurrent requests on the same loop also show up in its
+samples. With no session open nothing runs but a context variable lookup
+per job and a header scan per request.
+"""
+import contextvars
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from ..config import settings
+from ..logs import get_logger
+
+logger = get_logger("profiling")
+
+_current: "contextvars.ContextVar[Optional[ProfileSession]]" = contextvars.ContextVar("profile_session", default=None)
+
+
+class ProfileSession:
+    def __init__(self, route: str):
+        self.id = uuid.uuid4().hex
+        self.route = route
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration_ms = 0.0
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.presentation_ids: Set[str] = set()
+        # thread id -> number of attachments (a thread can attach twice, e.g. local render in a handler)
+        self.threads: Dict[int, int] = {}
+        self.refs = 0
+        self.lock = threading.Lock()
+
+
+class ProfileStore:
+    """Finished profiles as JSON files, one directory per presentation."""
+
+    def __init__(self, directory: str, keep: int):
+        self.directory = directory
+        self.keep = max(keep, 1)
+
+    def _dir(self, presentation_id: str) -> str:
+        # Canonical UUIDs only, so an id can never escape the directory
+        return os.path.join(self.directory, str(uuid.UUID(presentation_id)))
+
+    def save(self, presentation_id: str, profile: Dict[str, Any]) -> None:
+        directory = self._dir(presentation_id)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{profile['started_at']:.6f}-{profile['id']}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        os.replace(path + ".tmp", path)
+        for stale in sorted(self._files(directory))[:-self.keep]:
+            os.remove(os.path.join(directory, stale))
+
+    def _files(self, directory: str) -> List[str]:
+        if not os.path.isdir(directory):
+            return []
+        return [name for name in os.listdir(directory) if name.endswith(".json")]
+
+    def list(self, presentation_id: str) -> List[Dict[str, Any]]:
+        """Summaries, newest first. Raises ValueError for a malformed id."""
+        directory = self._dir(presentation_id)
+        summaries = []
+        for name in sorted(self._files(directory), reverse=True):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                profile = json.load(f)
+            profile.pop("stacks", None)
+            summaries.append(profile)
+        return summaries
+
+    def get(self, presentation_id: str, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Raises ValueError for a malformed id."""
+        directory = self._dir(presentation_id)
+        if not re.fullmatch(r"[0-9a-f]{32}", profile_id):
+            raise ValueError("Invalid profile id")
+        for name in self._files(directory):
+            if name.endswith(f"-{profile_id}.json"):
+                with open(os.path.join(directory, name), encoding="utf-8") as f:
+                    return json.load(f)
+        return None
+
+
+class Profiler:
+    def __init__(self, store: ProfileStore, interval: float):
+        self.store = store
+        self.interval = interval
+        self.sessions: Set[ProfileSession] = set()
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        # code object -> frame label, bounded by the code the app runs
+        self.labels: Dict[Any, str] = {}
+        self.profiles_saved = 0
+
+    def begin(self, route: str) -> ProfileSession:
+        session = ProfileSession(route)
+        session.refs = 1
+        with self.lock:
+            self.sessions.add(session)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self.thread.start()
+        return session
+
+    def retain(self, session: ProfileSession) -> None:
+        """Keep the session open for work that will run later (a queued job)."""
+        with session.lock:
+            session.refs += 1
+
+    def release(self, session: ProfileSession) -> None:
+        with session.lock:
+            session.refs -= 1
+            if session.refs > 0:
+                return
+        with self.lock:
+            self.sessions.discard(session)
+        session.duration_ms = (time.perf_counter() - session.started) * 1000
+        self._save(session)
+
+    @contextmanager
+    def attach(self, presentation_id: Optional[str] = None) -> Iterator[Optional[ProfileSession]]:
+        """Sample the current thread for the session of the context, if there is one."""
+        session = _current.get()
+        if session is None:
+            yield None
+            return
+        tid = threading.get_ident()
+        with session.lock:
+            session.refs += 1
+            session.threads[tid] = session.threads.get(tid, 0) + 1
+            if presentation_id:
+                session.presentation_ids.add(str(presentation_id))
+        try:
+            yield session
+        finally:
+            with session.lock:
+                session.threads[tid] -= 1
+                if not session.threads[tid]:
+                    del session.threads[tid]
+            self.release(session)
+
+    def _label(self, code) -> str:
+        label = self.labels.get(code)
+        if label is None:
+            # co_qualname (Class.method) is Python 3.11+; older interpreters only have the bare name
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self.labels[code] = label
+        return label
+
+    def _collapse(self, frame, thread_name: str) -> str:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.append(thread_name)
+        labels.reverse()
+        return ";".join(labels)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                sessions = list(self.sessions)
+                if not sessions:
+                    self.thread = None
+                    return
+            frames = sys._current_frames()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for session in sessions:
+                with session.lock:
+                    tids = list(session.threads)
+                stacks = [
+                    self._collapse(frames[tid], names.get(tid, f"thread-{tid}"))
+                    for tid in tids if tid in frames
+                ]
+                with session.lock:
+                    session.stacks.update(stacks)
+                    session.samples += 1
+
+    def _save(self, session: ProfileSession) -> None:
+        if not session.presentation_ids:
+            logger.info(
+                "Profile touched no presentation; not stored",
+                extra={"fields": {"profile_id": session.id, "route": session.route}},
+            )
+            return
+        profile = {
+            "id": session.id,
+            "route": session.route,
+            "started_at": session.started_at,
+            "duration_ms": round(session.duration_ms, 1),
+            "interval_ms": self.interval * 1000,
+            "samples": session.samples,
+            "presentation_ids": sorted(session.presentation_ids),
+            "stacks": dict(session.stacks.most_common()),
+        }
+        for presentation_id in session.presentation_ids:
+            try:
+                self.store.save(presentation_id, profile)
+            except (OSError, ValueError) as e:
+                logger.warning(
+                    "Saving profile failed: %s", e,
+                    extra={"fields": {"profile_id": session.id, "presentation_id": presentation_id}},
+                )
+        self.profiles_saved += 1
+
+
+def current_session() -> Optional[ProfileSession]:
+    return _current.get()
+
+
+def collapsed(profile: Dict[str, Any]) -> str:
+    """flamegraph.pl / speedscope input: one "stack count" line per distinct stack."""
+    return "".join(f"{stack} {count}\n" for stack, count in profile["stacks"].items())
+
+
+profiler = Profiler(
+    ProfileStore(settings.profiling_dir, settings.profiling_keep),
+    interval=settings.profiling_interval_ms / 1000,
+)
+
+
+def profiled_job(fn):
+    """Attach the worker thread running `fn(presentation_id=..., ...)` to the submitter's profile."""
+    @wraps(fn)
+    def run(*args, **kwargs):
+        if _current.get() is None:
+            return fn(*args, **kwargs)
+        with profiler.attach(kwargs.get("presentation_id", args[0] if args else None)):
+            return fn(*args, **kwargs)
+    return run
+
+
+@contextmanager
+def profile_request(route: str, presentation_id: Optional[str] = None) -> Iterator[ProfileSession]:
+    """Open a session for the current request and sample this thread until it ends."""
+    session = profiler.begin(route)
+    token = _current.set(session)
+    try:
+        with profiler.attach(presentation_id):
+            yield session
+    finally:
+        _current.reset(token)
+        profiler.release(session)
@@ -0,0 +1,52 @@
+# backend/app/services/providers.py
+"""
+Factories for provider clients and service singletons.
+
+Nothing here is built at import time: heavy SDKs (supabase, huggingface_hub,
+requests) are imported and clients are created on first use, so importing
+`app.main` stays fast for serverless and autoscaled cold starts.
+"""
+import threading
+from functools import lru_cache
+
+from ..config import settings
+from ..logs import get_logger
+
+logger = get_logger("providers")
+
+_supabase_lock = threading.Lock()
+_supabase = None
+_supabase_failed = False
+
+
+def supabase_configured() -> bool:
+    return bool(settings.supabase_url and settings.supabase_service_key)
+
+
+def get_supabase():
+    """Shared Supabase client (service role), or None when not configured or it failed to start."""
+    global _supabase, _supabase_failed
+    if _supabase is not None or _supabase_failed or not supabase_configured():
+        return _supabase
+    with _supabase_lock:
+        if _supabase is None and not _supabase_failed:
+            try:
+                from supabase import create_client
+                _supabase = create_client(settings.supabase_url, settings.supabase_service_key)
+                logger.info("Supabase client initialized with the service role")
+            except Exception as e:
+                logger.error(f"Failed to initialize Supabase client: {e}")
+                _supabase_failed = True
+    return _supabase
+
+
+@lru_cache(maxsize=None)
+def get_groq_service():
+    from .groq_service import GroqService
+    return GroqService()
+
+
+@lru_cache(maxsize=None)
+def get_hf_service():
+    from .huggingface import HuggingFaceService
+    return HuggingFaceService()
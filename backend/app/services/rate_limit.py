@@ -0,0 +1,303 @@
+# backend/app/services/rate_limit.py
+"""
+Sliding-window rate limiting per (user, route).
+
+Each key keeps two counters: requests in the current fixed window and in the
+previous one. The sliding estimate weights the previous window by how much
+of it still overlaps the last `window` seconds:
+
+    estimate = previous * (1 - elapsed / window) + current
+
+That is O(1) memory per key (no per-request timestamps) and is accurate to
+within a few percent of a true sliding log. Keys idle for two windows have
+nothing left to count and are evicted.
+
+Requests are counted per route template: configured rule paths such as
+'/api/presentations/{presentation_id}/status' match any id, and other paths
+have their UUID and numeric segments folded into '{id}', so polling many
+presentations draws from one budget.
+
+The in-memory store is per process. With several workers, the SQLite store
+keeps one set of counters in a shared file; each hit is a single short
+`BEGIN IMMEDIATE` transaction. That can wait up to 5 s on another worker's
+lock, so the middleware runs SQLite hits in the thread pool rather than on
+the event loop.
+"""
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..config import settings
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    limit: int
+    window: float  # seconds
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int = 0
+
+
+def parse_rule(spec: str) -> Optional[RateLimitRule]:
+    """'10/60' -> 10 requests per 60 seconds; empty or a zero limit disables it."""
+    if not spec or "/" not in spec:
+        return None
+    limit, window = spec.split("/", 1)
+    if int(limit) <= 0 or float(window) <= 0:
+        return None
+    return RateLimitRule(int(limit), float(window))
+
+
+def parse_rules(spec: str) -> Dict[Tuple[str, str], Optional[RateLimitRule]]:
+    """'POST /api/presentations/generate=10/60,...' -> {(method, route path): rule}"""
+    rules = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        route, rule = part.split("=", 1)
+        method, _, path = route.strip().partition(" ")
+        rules[(method.upper(), path.strip())] = parse_rule(rule.strip())
+    return rules
+
+
+_ID_SEGMENT_RE = re.compile(r"/(?:[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}|\d+)(?=/|$)")
+_PARAM_RE = re.compile(r"\{[^}/]+\}")
+
+
+def _template_regex(path: str) -> "re.Pattern":
+    parts = _PARAM_RE.split(path)
+    return re.compile("[^/]+".join(re.escape(p) for p in parts) + "$")
+
+
+def _advance(window_index: int, current: int, previous: int, now_index: int) -> Tuple[int, int]:
+    """Roll the counters forward to `now_index`; returns (current, previous)."""
+    if now_index == window_index:
+        return current, previous
+    if now_index == window_index + 1:
+        return 0, current
+    return 0, 0
+
+
+def _decide(rule: RateLimitRule, current: int, previous: int, now: float) -> Tuple[bool, int, int]:
+    """Returns (allowed, remaining, retry_after) for one more request."""
+    elapsed = now % rule.window
+    weight = 1 - elapsed / rule.window
+    estimate = previous * weight + current
+    if estimate + 1 <= rule.limit:
+        return True, int(rule.limit - estimate - 1), 0
+    if current + 1 > rule.limit or not previous:
+        wait = rule.window - elapsed
+    else:
+        # Time until the previous window's share has decayed enough
+        wait = rule.window * (1 - (rule.limit - current - 1) / previous) - elapsed
+    return False, 0, max(math.ceil(wait), 1)
+
+
+class MemoryRateLimitStore:
+    """
+    Per-process counters. Rules have different windows, so the entry touched
+    longest ago is not necessarily the first to expire: expired entries are
+    found through a heap of expiry times, and only when there are still more
+    than `max_keys` live ones is the least recently used evicted.
+    """
+
+    # hit() only takes an in-process lock, so it can run on the event loop
+    blocking = False
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [window index, current, previous, expires_at], least recently used first
+        self.entries: "OrderedDict[str, List]" = OrderedDict()
+        # (expires_at, key); an item is stale once the key's entry has moved on
+        self.expiries: List[Tuple[float, str]] = []
+        self.lock = threading.Lock()
+        self.evicted = 0
+
+    def hit(self, key: str, rule: RateLimitRule, now: float) -> Tuple[bool, int, int]:
+        now_index = int(now // rule.window)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                current, previous = 0, 0
+            else:
+                current, previous = _advance(entry[0], entry[1], entry[2], now_index)
+                self.entries.move_to_end(key)
+            allowed, remaining, retry_after = _decide(rule, current, previous, now)
+            if allowed:
+                current += 1
+            # Both counters are zero once two windows have passed
+            expires_at = (now_index + 2) * rule.window
+            if entry is None or entry[3] != expires_at:
+                heapq.heappush(self.expiries, (expires_at, key))
+            self.entries[key] = [now_index, current, previous, expires_at]
+            self._evict(now)
+        return allowed, remaining, retry_after
+
+    def _evict(self, now: float) -> None:
+        while self.expiries and self.expiries[0][0] <= now:
+            expires_at, key = heapq.heappop(self.expiries)
+            entry = self.entries.get(key)
+            if entry is not None and entry[3] == expires_at:
+                del self.entries[key]
+                self.evicted += 1
+        while len(self.entries) > self.max_keys:
+            # Its heap item is skipped as stale when it comes up
+            self.entries.popitem(last=False)
+            self.evicted += 1
+        if len(self.expiries) > 2 * max(self.max_keys, len(self.entries)):
+            # Drop stale items so a flood of one-off keys can't grow the heap past the LRU bound
+            self.expiries = [(entry[3], key) for key, entry in self.entries.items()]
+            heapq.heapify(self.expiries)
+
+    def size(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+
+class SQLiteRateLimitStore:
+    """Counters in a SQLite file shared by every worker process on the host."""
+
+    PURGE_EVERY = 1000
+    # hit() may wait on the file lock held by another worker
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.local()
+        self.hits = 0
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_windows (
+                    key TEXT PRIMARY KEY,
+                    window_index INTEGER NOT NULL,
+                    current INTEGER NOT NULL,
+                    previous INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly in hit()
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def hit(self, key: str, rule: RateLimitRule, now: float) -> Tuple[bool, int, int]:
+        now_index = int(now // rule.window)
+        conn = self._connection()
+        # IMMEDIATE takes the write lock up front so two workers can't both read the old count
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT window_index, current, previous FROM rate_limit_windows WHERE key = ?", (key,)
+            ).fetchone()
+            current, previous = _advance(*row, now_index) if row else (0, 0)
+            allowed, remaining, retry_after = _decide(rule, current, previous, now)
+            if allowed:
+                current += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_windows VALUES (?, ?, ?, ?, ?)",
+                (key, now_index, current, previous, (now_index + 2) * rule.window),
+            )
+            with self.lock:
+                self.hits += 1
+                purge = self.hits % self.PURGE_EVERY == 0
+            if purge:
+                conn.execute("DELETE FROM rate_limit_windows WHERE expires_at <= ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, remaining, retry_after
+
+    def size(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM rate_limit_windows").fetchone()[0]
+
+
+class RateLimiter:
+    """Looks up the rule for a route and counts the hit against (identity, route)."""
+
+    def __init__(self, store, default_rule: Optional[RateLimitRule], rules: Dict[Tuple[str, str], Optional[RateLimitRule]]):
+        self.store = store
+        self.blocking = store.blocking
+        self.default_rule = default_rule
+        self.rules = rules
+        # Literal paths first, so '/presentations/search' wins over '/presentations/{id}'
+        self.patterns = sorted(
+            ((method, _template_regex(path), path, rule) for (method, path), rule in rules.items()),
+            key=lambda item: item[2].count("{"),
+        )
+        self.lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def resolve(self, method: str, path: str) -> Tuple[str, Optional[RateLimitRule]]:
+        """Return (route template, rule) for a request path."""
+        for rule_method, pattern, template, rule in self.patterns:
+            if rule_method == method and pattern.match(path):
+                return template, rule
+        return _ID_SEGMENT_RE.sub("/{id}", path), self.default_rule
+
+    def hit(self, identity: str, method: str, path: str, now: Optional[float] = None) -> Optional[RateLimitResult]:
+        """Count one request; None when the route is not limited."""
+        route_path, rule = self.resolve(method, path)
+        if rule is None:
+            return None
+        allowed, remaining, retry_after = self.store.hit(
+            f"{identity}|{method} {route_path}", rule, time.time() if now is None else now
+        )
+        with self.lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.rejected += 1
+        return RateLimitResult(allowed, rule.limit, remaining, retry_after)
+
+    def stats(self) -> Dict[str, object]:
+        with self.lock:
+            allowed, rejected = self.allowed, self.rejected
+        return {
+            "backend": type(self.store).__name__,
+            "active_keys": self.store.size(),
+            "allowed": allowed,
+            "rejected": rejected,
+            "default_rule": f"{self.default_rule.limit}/{self.default_rule.window:g}" if self.default_rule else None,
+            "rules": {
+                f"{method} {path}": f"{rule.limit}/{rule.window:g}" if rule else None
+                for (method, path), rule in self.rules.items()
+            },
+        }
+
+
+def _create_store():
+    if settings.rate_limit_backend == "sqlite":
+        return SQLiteRateLimitStore(settings.rate_limit_sqlite_path)
+    return MemoryRateLimitStore(max_keys=settings.rate_limit_max_keys)
+
+
+rate_limiter = RateLimiter(
+    store=_create_store(),
+    default_rule=parse_rule(settings.rate_limit_default),
+    rules=parse_rules(settings.rate_limit_rules),
+)
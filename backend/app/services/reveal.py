@@ -1,62 +1,50 @@
 # backend/app/services/reveal.py
-import re
-from typing import List
-from markdown import markdown as md_to_html
-from .groq_service import groq_service
+from .groq_service import keyword_theme
+from .providers import get_groq_service
+from .document import LAYOUT_CSS, iter_reveal_document, reveal_document
+from .markdown_render import iter_render, render_slides, LOCAL_EXTENSIONS
+from .slides import iter_slides
 
 VALID_THEMES = {
     "black", "white", "league", "sky", "beige",
     "simple", "serif", "blood", "night", "moon", "solarized"
 }
 
-REVEAL_CSS_CDN = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/reveal.min.css"
-REVEAL_JS_CDN = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/reveal.min.js"
-REVEAL_THEME_BASE = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.0.4/theme"
-
-def _split_markdown_into_slides(markdown_text: str) -> List[str]:
+def convert_markdown_to_reveal(title: str, markdown_text: str, theme: str = "black", job=None) -> str:
     """
-    Split markdown into slides using:
-    - Explicit '---' slide separator lines, OR
-    - Fallback: top-level headings '# ' as slide starts.
+    Generate a complete Reveal.js HTML document from markdown and theme.
     """
-    text = markdown_text.strip()
-    if not text:
-        return []
-
-    # Prefer explicit separators
-    if re.search(r"(?m)^\s*---\s*$", text):
-        parts = re.split(r"(?m)^\s*---\s*$", text)
-        return [p.strip() for p in parts if p.strip()]
+    theme = theme if theme in VALID_THEMES else "black"
+    html = get_groq_service().generateStyledHTML(title, markdown_text, theme, job)
+    return html
 
-    # Fallback: split on top-level headings
-    lines = text.splitlines()
-    slides = []
-    current: List[str] = []
-    for line in lines:
-        if line.startswith("# "):  # new slide
-            if current:
-                slides.append("\n".join(current).strip())
-                current = []
-        current.append(line)
-    if current:
-        slides.append("\n".join(current).strip())
-    return slides if slides else [text]
+def resolve_local_theme(markdown_text: str, theme: str) -> str:
+    """The theme the local renderer uses for a requested theme (or 'ai-suggest')."""
+    if theme in VALID_THEMES:
+        return theme
+    return keyword_theme(markdown_text) if theme == "ai-suggest" else "black"
 
-def _section_html_from_markdown(md_section: str) -> str:
+def render_local_reveal(title: str, markdown_text: str, theme: str = "ai-suggest") -> tuple:
     """
-    Convert a markdown section to HTML content for a <section>.
+    Build a themed Reveal.js document entirely locally (no LLM calls), laid
+    out with the fixed LAYOUT_CSS stylesheet. Takes milliseconds.
+    Returns (html, theme); 'ai-suggest' is resolved from content keywords.
     """
-    # Allow basic extensions for better formatting if needed
-    html = md_to_html(md_section, extensions=["extra", "sane_lists", "toc"])
-    return f"<section>\n{html}\n</section>"
-
-def convert_markdown_to_reveal(title: str, markdown_text: str, theme: str = "black") -> str:
+    theme = resolve_local_theme(markdown_text, theme)
+    sections_html = "\n".join(
+        f"<section>\n{html}\n</section>"
+        for html in render_slides(iter_slides(markdown_text), LOCAL_EXTENSIONS)
+    )
+    return reveal_document(title, sections_html, theme, LAYOUT_CSS), theme
+
+def stream_local_reveal(title: str, markdown_text: str, theme: str = "ai-suggest"):
     """
-    Generate a complete Reveal.js HTML document from markdown and theme.
+    Same document as `render_local_reveal`, yielded piece by piece: each slide
+    is split off, rendered and emitted before the next one is touched.
     """
-    theme = theme if theme in VALID_THEMES else "black"
-    slides = _split_markdown_into_slides(markdown_text)
-    sections_html = "\n".join(_section_html_from_markdown(s) for s in slides)
-
-    html = groq_service.generateStyledHTML(title, markdown_text, theme)
-    return html
\ No newline at end of file
+    theme = resolve_local_theme(markdown_text, theme)
+    sections = (
+        f"<section>\n{html}\n</section>"
+        for html in iter_render(iter_slides(markdown_text), LOCAL_EXTENSIONS)
+    )
+    return iter_reveal_document(title, sections, theme, LAYOUT_CSS)
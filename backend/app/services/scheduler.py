@@ -0,0 +1,207 @@
+# backend/app/services/scheduler.py
+"""
+Per-user fair scheduler for generation jobs.
+
+Each user has their own FIFO queue. Workers pick the next job using weighted
+fair queueing: every user carries a virtual time that advances by 1/weight
+each time one of their jobs is dispatched, and the user with the smallest
+virtual time goes next. A user who submits 50 decks therefore only delays
+others by one job at a time, and higher tiers (larger weights) get
+proportionally more turns. Users are also capped at
+`settings.generation_per_user_limit` running jobs.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..config import settings
+from ..logs import get_logger
+from .profiling import ProfileSession, current_session, profiler
+
+logger = get_logger("scheduler")
+
+
+@dataclass
+class ScheduledJob:
+    user_id: str
+    fn: Callable[..., Any]
+    kwargs: Dict[str, Any]
+    tier: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    # The job runs in the submitter's context, so a profiled request's jobs are profiled too
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+    profile: Optional[ProfileSession] = None
+
+
+@dataclass
+class UserQueue:
+    jobs: Deque[ScheduledJob] = field(default_factory=deque)
+    running: int = 0
+    vtime: float = 0.0
+    # Wait-time statistics (seconds between submit and start)
+    dispatched: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    recent_waits: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+
+def _parse_weights(spec: str) -> Dict[str, float]:
+    weights = {}
+    for part in spec.split(","):
+        if "=" in part:
+            tier, weight = part.split("=", 1)
+            weights[tier.strip()] = max(float(weight), 0.01)
+    return weights
+
+
+class GenerationScheduler:
+    def __init__(
+        self,
+        workers: int,
+        per_user_limit: int,
+        tier_weights: Dict[str, float],
+        strict_priority: bool = False,
+        initial_job_seconds: float = 20.0,
+    ):
+        self.workers = max(workers, 1)
+        self.per_user_limit = max(per_user_limit, 1)
+        self.tier_weights = tier_weights
+        self.strict_priority = strict_priority
+        self.queues: Dict[str, UserQueue] = {}
+        self.vtime = 0.0  # virtual time of the last dispatched job
+        self.cond = threading.Condition()
+        self.threads: List[threading.Thread] = []
+        # Moving average of job run time, used to estimate how long the queue takes to drain
+        self.avg_job_seconds = initial_job_seconds
+        # Until a job has finished, avg_job_seconds is only the configured guess
+        self.jobs_measured = 0
+
+    def _weight(self, tier: str) -> float:
+        return self.tier_weights.get(tier, 1.0)
+
+    def _ensure_workers(self) -> None:
+        # Started lazily so importing the module never spawns threads
+        if self.threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"generation-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, user_id: str, fn: Callable[..., Any], kwargs: Optional[Dict[str, Any]] = None, tier: str = "interactive") -> ScheduledJob:
+        """Queue `fn(**kwargs)` on behalf of `user_id`."""
+        job = ScheduledJob(user_id=user_id, fn=fn, kwargs=kwargs or {}, tier=tier, profile=current_session())
+        if job.profile:
+            # The profile ends once this job has run, not when the request returns
+            profiler.retain(job.profile)
+        with self.cond:
+            self._ensure_workers()
+            queue = self.queues.setdefault(user_id, UserQueue())
+            if not queue.jobs and not queue.running:
+                # An idle user re-enters at the current virtual time instead of
+                # spending credit banked while they were away
+                queue.vtime = max(queue.vtime, self.vtime)
+            queue.jobs.append(job)
+            self.cond.notify()
+        return job
+
+    def _next_job(self) -> Optional[ScheduledJob]:
+        # Called with the lock held
+        candidates = [
+            (user_id, queue) for user_id, queue in self.queues.items()
+            if queue.jobs and queue.running < self.per_user_limit
+        ]
+        if not candidates:
+            return None
+
+        if self.strict_priority:
+            top = max(self._weight(q.jobs[0].tier) for _, q in candidates)
+            candidates = [(u, q) for u, q in candidates if self._weight(q.jobs[0].tier) == top]
+
+        _, queue = min(candidates, key=lambda c: (c[1].vtime, c[1].jobs[0].enqueued_at))
+        job = queue.jobs.popleft()
+        self.vtime = queue.vtime
+        queue.vtime += 1.0 / self._weight(job.tier)
+        queue.running += 1
+
+        job.started_at = time.monotonic()
+        wait = job.started_at - job.enqueued_at
+        queue.dispatched += 1
+        queue.total_wait += wait
+        queue.max_wait = max(queue.max_wait, wait)
+        queue.recent_waits.append(wait)
+        return job
+
+    def _worker(self) -> None:
+        while True:
+            with self.cond:
+                job = self._next_job()
+                while job is None:
+                    self.cond.wait()
+                    job = self._next_job()
+
+            try:
+                job.context.run(job.fn, **job.kwargs)
+            except Exception:
+                logger.exception(f"Scheduled job for user {job.user_id} failed")
+            finally:
+                if job.profile:
+                    profiler.release(job.profile)
+                duration = time.monotonic() - job.started_at
+                with self.cond:
+                    self.avg_job_seconds += 0.2 * (duration - self.avg_job_seconds)
+                    self.jobs_measured += 1
+                    self.queues[job.user_id].running -= 1
+                    # A slot for this user (and a worker) just freed up
+                    self.cond.notify_all()
+
+    def queue_depth(self) -> int:
+        with self.cond:
+            return sum(len(q.jobs) for q in self.queues.values())
+
+    def estimated_drain_seconds(self, depth: Optional[int] = None) -> float:
+        """Rough time until the currently queued jobs have all started."""
+        if depth is None:
+            depth = self.queue_depth()
+        return depth * self.avg_job_seconds / self.workers
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-user queue lengths and wait times, for tuning the tier weights."""
+        now = time.monotonic()
+        with self.cond:
+            users = {}
+            for user_id, queue in self.queues.items():
+                waits = sorted(queue.recent_waits)
+                users[user_id] = {
+                    "queued": len(queue.jobs),
+                    "running": queue.running,
+                    "dispatched": queue.dispatched,
+                    "oldest_queued_seconds": round(now - queue.jobs[0].enqueued_at, 3) if queue.jobs else 0.0,
+                    "avg_wait_seconds": round(queue.total_wait / queue.dispatched, 3) if queue.dispatched else 0.0,
+                    "p95_wait_seconds": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else 0.0,
+                    "max_wait_seconds": round(queue.max_wait, 3),
+                }
+            return {
+                "workers": self.workers,
+                "per_user_limit": self.per_user_limit,
+                "tier_weights": self.tier_weights,
+                "strict_priority": self.strict_priority,
+                "avg_job_seconds": round(self.avg_job_seconds, 3),
+                "jobs_measured": self.jobs_measured,
+                "queued": sum(u["queued"] for u in users.values()),
+                "running": sum(u["running"] for u in users.values()),
+                "users": users,
+            }
+
+
+generation_scheduler = GenerationScheduler(
+    workers=settings.generation_workers,
+    per_user_limit=settings.generation_per_user_limit,
+    tier_weights=_parse_weights(settings.scheduler_tier_weights),
+    strict_priority=settings.scheduler_strict_priority,
+    initial_job_seconds=settings.admission_initial_job_seconds,
+)
@@ -0,0 +1,169 @@
+# backend/app/services/search.py
+"""
+Full-text search over a user's presentations (title and markdown).
+
+SQLite uses an FTS5 table with external content (the presentations table
+itself) kept in sync by triggers. Postgres uses a stored, generated tsvector
+column with a GIN index. Either way, every write to a presentation
+(pipeline persist, update, restore, delete) updates the index in the same
+transaction, so nothing in the application has to remember to reindex.
+The index itself is created by migration 0002 (app/migrations/steps.py).
+"""
+import html
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_WORDS = 24
+# Title matches count this many times more than body matches
+TITLE_WEIGHT = 10.0
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class SearchHit:
+    id: str
+    title: str
+    status: Optional[str]
+    updated_at: Optional[datetime]
+    snippet: str
+    rank: float
+
+
+def _stem(word: str) -> str:
+    # Rough stand-in for the index's stemmer, only used to pick words to highlight
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def make_snippet(content: str, terms: List[str], words: int = SNIPPET_WORDS) -> str:
+    """
+    HTML-escaped excerpt of `content` around the first matching word, with
+    matches wrapped in SNIPPET_START / SNIPPET_END.
+    """
+    stems = [_stem(t) for t in terms]
+    tokens = list(_TOKEN_RE.finditer(content))
+    matches = [
+        i for i, m in enumerate(tokens)
+        if any(m.group().lower().startswith(stem) for stem in stems)
+    ]
+    if not tokens:
+        return ""
+    first = matches[0] if matches else 0
+    start = max(first - words // 4, 0)
+    end = min(start + words, len(tokens))
+    marked = set(matches)
+
+    parts = ["…" if start else ""]
+    cursor = tokens[start].start()
+    for i in range(start, end):
+        m = tokens[i]
+        parts.append(html.escape(content[cursor:m.start()]))
+        word = html.escape(m.group())
+        parts.append(f"{SNIPPET_START}{word}{SNIPPET_END}" if i in marked else word)
+        cursor = m.end()
+    if end < len(tokens):
+        parts.append("…")
+    return " ".join("".join(parts).split())
+
+
+def _terms(query: str) -> List[str]:
+    return _TOKEN_RE.findall(query.lower())[:16]
+
+
+def _fts5_query(user_id: uuid.UUID, terms: List[str]) -> str:
+    # Every term is quoted so user input can't inject FTS5 syntax; the last
+    # one is a prefix so results show up while the user is still typing
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return f'user_id : "{user_id.hex}" AND {{title markdown_content}} : ({" ".join(quoted)})'
+
+
+def _tsquery(terms: List[str]) -> str:
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+
+def search_presentations(db: Session, user_id: str, query: str, limit: int = 20, offset: int = 0):
+    """Return (total, hits) for the user's decks matching `query`, best matches first."""
+    terms = _terms(query)
+    if not terms:
+        return 0, []
+    uid = uuid.UUID(user_id)
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        match = _fts5_query(uid, terms)
+        # ORDER BY the FTS5 `rank` column lets it sort on bm25 alone and the
+        # total comes from the same pass. snippet() would re-run the MATCH for
+        # every row, so snippets are built from the page's markdown instead
+        page = db.execute(
+            text(f"""
+                SELECT rowid, rank, count(*) OVER () AS total
+                FROM presentations_fts
+                WHERE presentations_fts MATCH :q AND rank MATCH 'bm25({TITLE_WEIGHT}, 1.0, 0.0)'
+                ORDER BY rank
+                LIMIT :limit OFFSET :offset
+            """),
+            {"q": match, "limit": limit, "offset": offset},
+        ).all()
+        if not page:
+            total = db.execute(
+                text("SELECT count(*) FROM presentations_fts WHERE presentations_fts MATCH :q"), {"q": match}
+            ).scalar() if offset else 0
+            return total, []
+        total = page[0].total
+        ranks = {row.rowid: -row.rank for row in page}
+        rows = db.execute(
+            text(f"""
+                SELECT rowid, id, title, status, updated_at, markdown_content
+                FROM presentations WHERE rowid IN ({", ".join(str(r) for r in ranks)})
+            """)
+        ).all()
+        # bm25 is lower-is-better; report it as higher-is-better like ts_rank
+        ranked = sorted(((row, ranks[row.rowid]) for row in rows), key=lambda hit: -hit[1])
+    elif dialect == "postgresql":
+        params = {"uid": uid, "q": _tsquery(terms), "limit": limit, "offset": offset}
+        total = db.execute(
+            text("""
+                SELECT count(*) FROM presentations
+                WHERE user_id = :uid AND search_vector @@ to_tsquery('english', :q)
+            """),
+            params,
+        ).scalar()
+        rows = db.execute(
+            text("""
+                SELECT id, title, status, updated_at, markdown_content,
+                       ts_rank_cd(search_vector, to_tsquery('english', :q)) AS rank
+                FROM presentations
+                WHERE user_id = :uid AND search_vector @@ to_tsquery('english', :q)
+                ORDER BY rank DESC
+                LIMIT :limit OFFSET :offset
+            """),
+            params,
+        ).all()
+        ranked = [(row, row.rank) for row in rows]
+    else:
+        raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+
+    hits = [
+        SearchHit(
+            id=str(uuid.UUID(str(row.id))),
+            title=row.title,
+            status=row.status,
+            updated_at=row.updated_at,
+            snippet=make_snippet(row.markdown_content or "", terms),
+            rank=float(rank),
+        )
+        for row, rank in ranked
+    ]
+    return total, hits
@@ -0,0 +1,143 @@
+# backend/app/services/slides.py
+"""
+The one slide splitter used by every service.
+
+Rules:
+- A line that is exactly '---' (surrounding whitespace allowed) separates slides.
+- Separators inside fenced code blocks (``` or ~~~) are ignored, and so are
+  table delimiter rows such as '|---|---|' since they are not bare '---' lines.
+- A leading YAML front matter block is skipped: '---', then lowercase
+  'key: value' lines (with indented, list or blank lines between them), then
+  a closing '---' or '...'. Until the closing line is seen the block is only
+  a candidate; anything else, including the end of the input, replays it as
+  slide content and the opening '---' counts as a separator.
+- Decks with no separator at all start a new slide at each top-level '# ' heading.
+
+The input is scanned once, line by line, with no regular expressions.
+Slides are yielded as soon as their closing separator is seen. Decks in the
+heading fallback mode are only known to have no separators at the end, so
+those slides are yielded after the scan.
+"""
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Lines of `text` without their line endings, without copying the whole text."""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end == -1:
+            end = length
+        line = text[start:end]
+        yield line[:-1] if line.endswith("\r") else line
+        start = end + 1
+
+
+def _fence_marker(line: str) -> Optional[Tuple[str, int, str]]:
+    """Return (fence char, fence length, info string) if `line` opens or closes a fence."""
+    stripped = line.lstrip(" ")
+    if len(line) - len(stripped) > 3 or not stripped:
+        return None
+    char = stripped[0]
+    if char not in "`~":
+        return None
+    count = len(stripped) - len(stripped.lstrip(char))
+    if count < 3:
+        return None
+    return char, count, stripped[count:].strip()
+
+
+def _is_front_matter_key(line: str) -> bool:
+    # YAML front matter keys are lowercase identifiers ('title', 'theme'); a
+    # prose line such as 'Agenda: today we cover X' is slide content
+    key, sep, _ = line.partition(":")
+    return (
+        bool(sep) and key[:1].isalpha() and key == key.lower()
+        and key.replace("_", "").replace("-", "").isalnum()
+    )
+
+
+def _is_front_matter_line(line: str, first: bool) -> bool:
+    if first:
+        return _is_front_matter_key(line)
+    return not line.strip() or line.startswith((" ", "\t", "- ")) or _is_front_matter_key(line)
+
+
+def _strip_front_matter(lines: Iterator[str]) -> Iterator[str]:
+    """`lines` without a leading front matter block (see the module docstring)."""
+    first = next(lines, None)
+    if first is None:
+        return iter(())
+    first = first.lstrip("\ufeff")
+    if first.strip() != "---":
+        return chain((first,), lines)
+
+    held = [first]
+    for line in lines:
+        if len(held) > 1 and line.strip() in ("---", "..."):
+            # Closed: it was front matter, drop it
+            return lines
+        held.append(line)
+        if not _is_front_matter_line(line, len(held) == 2):
+            break
+    return chain(held, lines)
+
+
+def _slide(lines: List[str]) -> str:
+    return "\n".join(lines).strip()
+
+
+def iter_slides(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Yield the non-empty slides of a markdown deck.
+    `source` is either the whole text or an iterable of lines (e.g. an open file).
+    """
+    lines = _iter_lines(source) if isinstance(source, str) else (l.rstrip("\r\n") for l in source)
+    lines = _strip_front_matter(lines)
+
+    current: List[str] = []
+    # Where '# ' headings start in `current`; only used if no separator ever appears
+    heading_breaks: List[int] = []
+    saw_separator = False
+    fence: Optional[Tuple[str, int]] = None
+
+    for line in lines:
+        # Cheap pre-check: fences start with ` or ~ after at most 3 spaces
+        marker = _fence_marker(line) if line[:4].lstrip(" ")[:1] in ("`", "~") else None
+        if fence is not None:
+            if marker and marker[0] == fence[0] and marker[1] >= fence[1] and not marker[2]:
+                fence = None
+            current.append(line)
+            continue
+        if marker and (marker[0] != "`" or "`" not in marker[2]):
+            fence = (marker[0], marker[1])
+            current.append(line)
+            continue
+
+        if line.strip() == "---":
+            saw_separator = True
+            heading_breaks = []
+            slide = _slide(current)
+            current = []
+            if slide:
+                yield slide
+            continue
+
+        if not saw_separator and line.startswith(("# ", "#\t")) and current:
+            heading_breaks.append(len(current))
+        current.append(line)
+
+    if saw_separator or not heading_breaks:
+        slide = _slide(current)
+        if slide:
+            yield slide
+        return
+
+    starts = [0] + heading_breaks
+    ends = heading_breaks + [len(current)]
+    for start, end in zip(starts, ends):
+        slide = _slide(current[start:end])
+        if slide:
+            yield slide
@@ -0,0 +1,50 @@
+# backend/app/services/throttle.py
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to share a provider's request budget across
+    all jobs. Callers with a `reserve` only proceed while more than `reserve`
+    tokens remain, which keeps headroom for higher priority callers.
+    """
+
+    def __init__(self, rate_per_minute: int, burst: int = 0):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(rate_per_minute // 6, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, reserve: int = 0, cancel_token=None) -> float:
+        """
+        Block until a token is available; returns the time spent waiting.
+        Waiting stops early (without taking a token) if `cancel_token` fires.
+        """
+        if not self.enabled:
+            return 0.0
+
+        reserve = min(reserve, self.capacity - 1)
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens - 1 >= reserve:
+                    self.tokens -= 1
+                    return waited
+                delay = (reserve + 1 - self.tokens) / self.rate
+            if cancel_token:
+                if cancel_token.wait(delay):
+                    return waited
+            else:
+                time.sleep(delay)
+            waited += delay
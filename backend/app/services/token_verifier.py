@@ -0,0 +1,168 @@
+# backend/app/services/token_verifier.py
+"""
+Local verification of Supabase access tokens.
+
+Tokens are checked in-process: HS256 tokens against the project's JWT
+secret, asymmetric ones (RS256/ES256) against the project's JWKS, which is
+fetched once and cached. Verified tokens are kept in a bounded LRU until they
+expire, so repeat requests (status polls) cost a dictionary lookup. The
+remote `get_user` call is only used to catch revoked sessions, at most once
+per `revocation_interval` seconds per token. When no key can verify a token
+(no secret for HS256, JWKS unreachable) the remote call decides instead and
+its answer is cached the same way.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import jwt
+
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256"]
+
+
+class TokenRejected(Exception):
+    """The token is invalid, expired or revoked."""
+
+
+class KeyUnavailable(Exception):
+    """No local key can verify this token."""
+
+
+@dataclass
+class VerifiedToken:
+    user: Dict[str, Any]
+    expires_at: float
+    checked_at: float  # last remote revocation check (or first verification)
+
+
+class TokenVerifier:
+    def __init__(
+        self,
+        secret: str = "",
+        jwks_url: str = "",
+        audience: Optional[str] = None,
+        revocation_interval: float = 300,
+        max_entries: int = 10000,
+        remote_check: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+    ):
+        self.secret = secret
+        self.jwks_client = jwt.PyJWKClient(jwks_url, cache_keys=True) if jwks_url else None
+        self.audience = audience
+        self.revocation_interval = revocation_interval
+        self.max_entries = max_entries
+        # Returns the user for a live token, None (or raises) for a revoked one
+        self.remote_check = remote_check
+        self.entries: "OrderedDict[str, VerifiedToken]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.remote_checks = 0
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        try:
+            algorithm = jwt.get_unverified_header(token).get("alg")
+            if algorithm == "HS256" and self.secret:
+                key = self.secret
+            elif algorithm in ASYMMETRIC_ALGORITHMS and self.jwks_client:
+                key = self.jwks_client.get_signing_key_from_jwt(token).key
+            else:
+                raise KeyUnavailable(f"No key configured for {algorithm} tokens")
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                options={"require": ["exp", "sub"], "verify_aud": bool(self.audience)},
+            )
+        except jwt.PyJWKClientConnectionError as e:
+            raise KeyUnavailable(str(e)) from e
+        except jwt.PyJWTError as e:
+            raise TokenRejected(str(e)) from e
+
+    def _check_remote(self, token: str) -> Dict[str, Any]:
+        if not self.remote_check:
+            raise TokenRejected("Token cannot be verified")
+        with self.lock:
+            self.remote_checks += 1
+        try:
+            user = self.remote_check(token)
+        except Exception as e:
+            raise TokenRejected(f"Remote check failed: {e}") from e
+        if not user:
+            raise TokenRejected("Session has been revoked")
+        return user
+
+    def _verify_uncached(self, token: str, now: float) -> VerifiedToken:
+        try:
+            claims = self._decode(token)
+            user = {"id": claims["sub"], "email": claims.get("email")}
+        except KeyUnavailable:
+            user = self._check_remote(token)
+            claims = jwt.decode(token, options={"verify_signature": False})
+        return VerifiedToken(user=user, expires_at=float(claims.get("exp") or now), checked_at=now)
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Return {"id", "email"} for a valid token or raise TokenRejected."""
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry.expires_at <= now:
+                del self.entries[key]
+                entry = None
+            if entry:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            entry = self._verify_uncached(token, now)
+            self._store(key, entry)
+        elif self.remote_check and self.revocation_interval and now - entry.checked_at >= self.revocation_interval:
+            try:
+                self._check_remote(token)
+            except TokenRejected:
+                self.forget(token)
+                raise
+            entry.checked_at = now
+        return entry.user
+
+    def is_cached(self, token: str) -> bool:
+        """Whether verify() would answer from the cache, without a key fetch or revocation check."""
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is None or entry.expires_at <= now:
+            return False
+        return not (self.remote_check and self.revocation_interval and now - entry.checked_at >= self.revocation_interval)
+
+    def _store(self, key: str, entry: VerifiedToken) -> None:
+        if self.max_entries <= 0:
+            return
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def forget(self, token: str) -> None:
+        """Drop a token from the cache (e.g. on logout)."""
+        with self.lock:
+            self.entries.pop(hashlib.sha256(token.encode("utf-8")).hexdigest(), None)
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "remote_checks": self.remote_checks,
+            }
@@ -0,0 +1,342 @@
+# backend/app/services/usage.py
+"""
+Token usage and cost accounting for LLM provider calls.
+
+Every call records prompt/completion tokens, latency and model, tagged with
+the user, presentation, pipeline node and stage (the prompt that was sent).
+Records are aggregated in memory (totals and token histograms per stage,
+since the process started) and flushed to the llm_usage table in batches by
+a background thread, every USAGE_FLUSH_SECONDS or once USAGE_FLUSH_BATCH
+records are waiting. Recording never blocks a job on the database.
+
+Cost uses LLM_PRICES, "model=input/output" in USD per million tokens.
+"""
+import bisect
+import threading
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db import engine as default_engine
+from ..logs import get_logger
+from ..models import LlmUsage
+
+logger = get_logger("usage")
+
+# Upper bounds of the histogram buckets; the last bucket is open-ended
+TOKEN_BUCKETS = [64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768]
+LATENCY_BUCKETS_MS = [250, 500, 1000, 2000, 5000, 10000, 20000, 30000]
+
+
+def parse_prices(spec: str) -> Dict[str, Tuple[float, float]]:
+    """'model=0.20/0.60,...' -> {model: (input, output)} in USD per million tokens."""
+    prices = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        model, _, rates = part.rpartition("=")
+        prompt_rate, _, completion_rate = rates.partition("/")
+        try:
+            prices[model.strip()] = (float(prompt_rate), float(completion_rate or prompt_rate))
+        except ValueError:
+            logger.warning(f"Ignoring malformed LLM price: {part!r}")
+    return prices
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English prose and markup
+    return max(len(text) // 4, 1) if text else 0
+
+
+@dataclass
+class UsageRecord:
+    stage: str
+    provider: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: int
+    ok: bool = True
+    estimated: bool = False
+    user_id: Optional[str] = None
+    presentation_id: Optional[str] = None
+    node: Optional[str] = None
+    cost_usd: float = 0.0
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def row(self) -> Dict[str, Any]:
+        return {
+            "user_id": uuid.UUID(self.user_id) if self.user_id else None,
+            "presentation_id": uuid.UUID(self.presentation_id) if self.presentation_id else None,
+            "node": self.node,
+            "stage": self.stage,
+            "provider": self.provider,
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "estimated": self.estimated,
+            "latency_ms": self.latency_ms,
+            "ok": self.ok,
+            "cost_usd": self.cost_usd,
+            "created_at": self.created_at,
+        }
+
+
+class Histogram:
+    def __init__(self, bounds: List[int]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        labels = [f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"]
+        return dict(zip(labels, self.counts))
+
+
+class StageStats:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.latency_ms = 0
+        self.prompt_histogram = Histogram(TOKEN_BUCKETS)
+        self.completion_histogram = Histogram(TOKEN_BUCKETS)
+        self.latency_histogram = Histogram(LATENCY_BUCKETS_MS)
+
+    def add(self, record: UsageRecord) -> None:
+        self.calls += 1
+        self.failures += 0 if record.ok else 1
+        self.prompt_tokens += record.prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cost_usd += record.cost_usd
+        self.latency_ms += record.latency_ms
+        self.prompt_histogram.add(record.prompt_tokens)
+        self.completion_histogram.add(record.completion_tokens)
+        self.latency_histogram.add(record.latency_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / self.calls, 1) if self.calls else 0.0,
+            "avg_completion_tokens": round(self.completion_tokens / self.calls, 1) if self.calls else 0.0,
+            "avg_latency_ms": round(self.latency_ms / self.calls, 1) if self.calls else 0.0,
+            "cost_usd": round(self.cost_usd, 6),
+            "prompt_tokens_histogram": self.prompt_histogram.snapshot(),
+            "completion_tokens_histogram": self.completion_histogram.snapshot(),
+            "latency_ms_histogram": self.latency_histogram.snapshot(),
+        }
+
+
+class UsageTracker:
+    def __init__(self, engine=None, prices: Optional[Dict[str, Tuple[float, float]]] = None,
+                 flush_seconds: float = 5.0, flush_batch: int = 200, max_pending: int = 100000):
+        self.engine = engine
+        self.prices = prices or {}
+        self.flush_seconds = flush_seconds
+        self.flush_batch = flush_batch
+        # Oldest records are dropped past this if the database stays unavailable
+        self.max_pending = max_pending
+        self.pending: List[UsageRecord] = []
+        self.stages: Dict[str, StageStats] = defaultdict(StageStats)
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stop_event = threading.Event()
+        # Serializes flushes between the background thread and stop()
+        self.flush_lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.flushed = 0
+        self.flushes = 0
+        self.dropped = 0
+        self.flush_errors = 0
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        prompt_rate, completion_rate = self.prices.get(model, (0.0, 0.0))
+        return (prompt_tokens * prompt_rate + completion_tokens * completion_rate) / 1_000_000
+
+    def record(
+        self,
+        stage: str,
+        provider: str,
+        model: str,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+        latency_ms: float,
+        ok: bool = True,
+        job=None,
+        prompt: str = "",
+        completion: str = "",
+    ) -> UsageRecord:
+        """
+        Record one provider call. Token counts the provider didn't report are
+        estimated from the prompt and completion text.
+        """
+        estimated = prompt_tokens is None or completion_tokens is None
+        if prompt_tokens is None:
+            prompt_tokens = estimate_tokens(prompt)
+        if completion_tokens is None:
+            completion_tokens = estimate_tokens(completion) if ok else 0
+        record = UsageRecord(
+            stage=stage,
+            provider=provider,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=int(latency_ms),
+            ok=ok,
+            estimated=estimated,
+            user_id=(job.user_id or None) if job else None,
+            presentation_id=(job.presentation_id or None) if job else None,
+            node=(job.node or None) if job else None,
+            cost_usd=self.cost(model, prompt_tokens, completion_tokens),
+        )
+        with self.lock:
+            self.stages[stage].add(record)
+            if self.engine is not None:
+                self.pending.append(record)
+                overflow = len(self.pending) - self.max_pending
+                if overflow > 0:
+                    del self.pending[:overflow]
+                    self.dropped += overflow
+                full = len(self.pending) >= self.flush_batch
+            else:
+                full = False
+        if self.engine is not None:
+            self._ensure_started()
+            if full:
+                self.wake.set()
+        return record
+
+    def pending_for_user(self, user_id: str) -> List[UsageRecord]:
+        """Records of this user not written to the database yet."""
+        with self.lock:
+            return [r for r in self.pending if r.user_id == user_id]
+
+    def flush(self) -> int:
+        """Write pending records in one insert; returns how many were written."""
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, []
+            if not batch:
+                return 0
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(insert(LlmUsage), [r.row() for r in batch])
+            except Exception as e:
+                logger.warning(f"Usage flush of {len(batch)} records failed: {e}")
+                with self.lock:
+                    # Retried on the next flush, ahead of newer records
+                    self.pending[:0] = batch
+                    self.flush_errors += 1
+                return 0
+            with self.lock:
+                self.flushed += len(batch)
+                self.flushes += 1
+            return len(batch)
+
+    def _ensure_started(self) -> None:
+        with self.lock:
+            if self.thread is None:
+                self.stop_event.clear()
+                self.thread = threading.Thread(target=self._run, name="usage-flush", daemon=True)
+                self.thread.start()
+
+    def _run(self) -> None:
+        while not self.stop_event.is_set():
+            self.wake.wait(self.flush_seconds)
+            self.wake.clear()
+            self.flush()
+
+    def stop(self) -> None:
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.stop_event.set()
+            self.wake.set()
+            thread.join()
+        if self.engine is not None:
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stages = {name: stage.snapshot() for name, stage in self.stages.items()}
+            return {
+                "stages": dict(sorted(stages.items(), key=lambda item: -item[1]["prompt_tokens"] - item[1]["completion_tokens"])),
+                "pending": len(self.pending),
+                "flushed": self.flushed,
+                "flushes": self.flushes,
+                "flush_errors": self.flush_errors,
+                "dropped": self.dropped,
+            }
+
+
+def _empty() -> Dict[str, Any]:
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cost_usd": 0.0}
+
+
+def _add(bucket: Dict[str, Any], calls: int, prompt_tokens: int, completion_tokens: int, cost_usd: float) -> None:
+    bucket["calls"] += calls
+    bucket["prompt_tokens"] += prompt_tokens
+    bucket["completion_tokens"] += completion_tokens
+    bucket["total_tokens"] += prompt_tokens + completion_tokens
+    bucket["cost_usd"] = round(bucket["cost_usd"] + cost_usd, 6)
+
+
+def usage_summary(db: Session, user_id: str, days: int, tracker: "UsageTracker") -> Dict[str, Any]:
+    """
+    A user's usage over the last `days`: totals, per stage and per presentation.
+    One grouped query over ix_llm_usage_user_created, plus the records still
+    waiting to be flushed. Raises ValueError for a malformed user id.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    rows = db.execute(
+        select(
+            LlmUsage.stage,
+            LlmUsage.presentation_id,
+            func.count(),
+            func.sum(LlmUsage.prompt_tokens),
+            func.sum(LlmUsage.completion_tokens),
+            func.sum(LlmUsage.cost_usd),
+        )
+        .where(LlmUsage.user_id == uuid.UUID(user_id), LlmUsage.created_at >= since)
+        .group_by(LlmUsage.stage, LlmUsage.presentation_id)
+    ).all()
+    groups = [(stage, str(pid) if pid else None, calls, prompt or 0, completion or 0, cost or 0.0)
+              for stage, pid, calls, prompt, completion, cost in rows]
+    groups += [(r.stage, r.presentation_id, 1, r.prompt_tokens, r.completion_tokens, r.cost_usd)
+               for r in tracker.pending_for_user(user_id) if r.created_at >= since]
+
+    totals = _empty()
+    by_stage: Dict[str, Dict[str, Any]] = defaultdict(_empty)
+    by_presentation: Dict[str, Dict[str, Any]] = defaultdict(_empty)
+    for stage, pid, *counts in groups:
+        _add(totals, *counts)
+        _add(by_stage[stage], *counts)
+        if pid:
+            _add(by_presentation[pid], *counts)
+    return {"since": since, "totals": totals, "by_stage": dict(by_stage), "by_presentation": dict(by_presentation)}
+
+
+# Without a database (USAGE_TRACKING_ENABLED=false) only the in-memory aggregates are kept
+usage_tracker = UsageTracker(
+    engine=default_engine if settings.usage_tracking_enabled else None,
+    prices=parse_prices(settings.llm_prices),
+    flush_seconds=settings.usage_flush_seconds,
+    flush_batch=settings.usage_flush_batch,
+)
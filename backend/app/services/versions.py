@@ -0,0 +1,219 @@
+# backend/app/services/versions.py
+"""
+Version history for presentations.
+
+Every revision is stored as a line-based delta against the previous version,
+with a full snapshot every `settings.version_snapshot_interval` versions so
+reconstructing any version never replays more than one interval of deltas.
+"""
+import difflib
+import json
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Presentation, PresentationVersion
+
+
+def encode_delta(old: str, new: str) -> str:
+    """
+    Encode `new` as a JSON list of ops against `old`:
+    - [start, end] copies old lines[start:end]
+    - "text" inserts literal text
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops: List = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(new_lines[j1:j2]))
+    return json.dumps(ops, separators=(",", ":"))
+
+
+def apply_delta(old: str, delta: str) -> str:
+    """Rebuild the new text from `old` and a delta produced by `encode_delta`."""
+    old_lines = old.splitlines(keepends=True)
+    parts: List[str] = []
+    for op in json.loads(delta):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(old_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+def _latest_version(db: Session, presentation_id) -> Optional[PresentationVersion]:
+    return db.query(PresentationVersion).filter(
+        PresentationVersion.presentation_id == presentation_id
+    ).order_by(PresentationVersion.version.desc()).first()
+
+
+def get_version_content(db: Session, presentation_id, version: int) -> Optional[Dict[str, str]]:
+    """
+    Reconstruct a version by starting from the nearest snapshot at or below it
+    and replaying the deltas that follow.
+    """
+    snapshot = db.query(PresentationVersion).filter(
+        PresentationVersion.presentation_id == presentation_id,
+        PresentationVersion.version <= version,
+        PresentationVersion.is_snapshot.is_(True),
+    ).order_by(PresentationVersion.version.desc()).first()
+    if not snapshot:
+        return None
+
+    markdown_text = snapshot.markdown_data
+    html_text = snapshot.html_data
+    target = snapshot
+    if snapshot.version < version:
+        deltas = db.query(PresentationVersion).filter(
+            PresentationVersion.presentation_id == presentation_id,
+            PresentationVersion.version > snapshot.version,
+            PresentationVersion.version <= version,
+        ).order_by(PresentationVersion.version.asc()).all()
+        for row in deltas:
+            markdown_text = apply_delta(markdown_text, row.markdown_data)
+            html_text = apply_delta(html_text, row.html_data)
+            target = row
+        if target.version != version:
+            return None
+
+    return {
+        "version": target.version,
+        "title": target.title,
+        "theme": target.theme,
+        "source": target.source,
+        "created_at": target.created_at,
+        "markdown_content": markdown_text,
+        "html_content": html_text,
+    }
+
+
+# Attempts at taking the next version number before a conflict is re-raised
+_RECORD_ATTEMPTS = 5
+
+
+def _lock_presentation(db: Session, presentation_id) -> None:
+    """
+    Hold the parent row until commit so concurrent writers number versions one
+    at a time. SQLite has no row locks; there the writer's BEGIN IMMEDIATE
+    already serializes them.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        db.execute(select(Presentation.id).where(Presentation.id == presentation_id).with_for_update())
+
+
+def record_version(db: Session, presentation: Presentation, source: str = "generate") -> Optional[PresentationVersion]:
+    """
+    Append the presentation's current content as a new version.
+    Nothing is recorded if the content is unchanged since the last version.
+    The caller is responsible for committing.
+
+    The version is inserted in a savepoint: if another writer took the same
+    number first, only the savepoint is rolled back and the number is taken
+    again, so the caller's own changes are kept.
+    """
+    for attempt in range(_RECORD_ATTEMPTS):
+        try:
+            # begin_nested flushes the caller's pending changes before the savepoint
+            with db.begin_nested():
+                _lock_presentation(db, presentation.id)
+                return _append_version(db, presentation, source)
+        except IntegrityError:
+            if attempt == _RECORD_ATTEMPTS - 1:
+                raise
+
+
+def _append_version(db: Session, presentation: Presentation, source: str) -> Optional[PresentationVersion]:
+    markdown_text = presentation.markdown_content or ""
+    html_text = presentation.html_content or ""
+    theme = presentation.theme or "default"
+
+    latest = _latest_version(db, presentation.id)
+    previous = get_version_content(db, presentation.id, latest.version) if latest else None
+    if previous and (
+        previous["markdown_content"] == markdown_text
+        and previous["html_content"] == html_text
+        and previous["theme"] == theme
+        and previous["title"] == presentation.title
+    ):
+        return None
+
+    version_number = latest.version + 1 if latest else 1
+    interval = max(settings.version_snapshot_interval, 1)
+    is_snapshot = previous is None or (version_number - 1) % interval == 0
+
+    markdown_data = markdown_text
+    html_data = html_text
+    if not is_snapshot:
+        markdown_data = encode_delta(previous["markdown_content"], markdown_text)
+        html_data = encode_delta(previous["html_content"], html_text)
+        # A delta that is no smaller than the text itself is not worth replaying
+        if len(markdown_data) + len(html_data) >= len(markdown_text) + len(html_text):
+            is_snapshot = True
+            markdown_data = markdown_text
+            html_data = html_text
+
+    version = PresentationVersion(
+        presentation_id=presentation.id,
+        version=version_number,
+        is_snapshot=is_snapshot,
+        markdown_data=markdown_data,
+        html_data=html_data,
+        title=presentation.title,
+        theme=theme,
+        source=source,
+    )
+    db.add(version)
+    return version
+
+
+def list_versions(db: Session, presentation_id) -> List[PresentationVersion]:
+    return db.query(PresentationVersion).filter(
+        PresentationVersion.presentation_id == presentation_id
+    ).order_by(PresentationVersion.version.desc()).all()
+
+
+def diff_versions(db: Session, presentation_id, from_version: int, to_version: int, field: str = "markdown") -> Optional[str]:
+    """Unified diff of the markdown or html of two versions."""
+    old = get_version_content(db, presentation_id, from_version)
+    new = get_version_content(db, presentation_id, to_version)
+    if old is None or new is None:
+        return None
+
+    key = "html_content" if field == "html" else "markdown_content"
+    return "".join(difflib.unified_diff(
+        old[key].splitlines(keepends=True),
+        new[key].splitlines(keepends=True),
+        fromfile=f"v{from_version}",
+        tofile=f"v{to_version}",
+    ))
+
+
+def restore_version(db: Session, presentation: Presentation, version: int) -> Optional[PresentationVersion]:
+    """
+    Copy an old version back onto the presentation and record it as a new
+    version, so restores are themselves part of the history.
+    """
+    content = get_version_content(db, presentation.id, version)
+    if content is None:
+        return None
+
+    presentation.title = content["title"]
+    presentation.theme = content["theme"]
+    presentation.markdown_content = content["markdown_content"]
+    presentation.html_content = content["html_content"]
+    presentation.status = "complete"
+    return record_version(db, presentation, source="restore") or _latest_version(db, presentation.id)
+
+
+def delete_versions(db: Session, presentation_id) -> None:
+    """Remove all versions of a presentation (SQLite does not enforce the FK cascade)."""
+    db.query(PresentationVersion).filter(
+        PresentationVersion.presentation_id == presentation_id
+    ).delete(synchronize_session=False)
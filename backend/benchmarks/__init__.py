@@ -0,0 +1,5 @@
+# backend/benchmarks/__init__.py
+"""
+Offline benchmarks. Run from the backend directory, e.g.:
+    python -m benchmarks.version_chain
+"""
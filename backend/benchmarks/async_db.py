@@ -0,0 +1,149 @@
+# backend/benchmarks/async_db.py
+"""
+Throughput of an async handler reading a presentation under concurrent load:
+the previous pattern (synchronous Session inside `async def`, so every query
+blocks the event loop) versus the AsyncSession from app.db.
+
+Both handlers run the same owned-presentation lookup as the /status route.
+SQLite answers in microseconds, so `--latency-ms` adds a simulated database
+round trip inside the driver (a SQL function that sleeps), which is what a
+network hop to Postgres costs. With the async engine the sleep happens on the
+driver's thread and the event loop keeps serving other requests.
+
+Keep --concurrency under the pool size (5 + 10 overflow). Past it the sync
+pattern stalls for the pool timeout: the request waiting for a connection
+blocks the loop that the connection holders need to finish.
+
+Usage: python -m benchmarks.async_db [--requests 400] [--concurrency 10] [--latency-ms 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+db_path = os.path.join(tempfile.mkdtemp(), "async_db.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, func, insert, select
+
+from app.db import AsyncSessionLocal, Base, SessionLocal, async_engine, async_read_engine, engine, read_engine
+from app.models import Presentation
+
+LATENCY_MS = 0.0
+
+
+def _register_latency(dbapi_connection, connection_record):
+    def bench_latency():
+        time.sleep(LATENCY_MS / 1000)
+        return 0
+    dbapi_connection.create_function("bench_latency", 0, bench_latency)
+
+
+# Reads may go to a separate pool (tuned SQLite), so every engine gets the function
+for sync_engine in {engine, read_engine, async_engine.sync_engine, async_read_engine.sync_engine}:
+    event.listen(sync_engine, "connect", _register_latency)
+
+
+def _lookup(presentation_id: uuid.UUID, user_id: uuid.UUID):
+    return select(Presentation).where(
+        Presentation.id == presentation_id,
+        Presentation.user_id == user_id,
+        func.bench_latency() == 0,
+    )
+
+
+def get_sync_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _app(user_id: uuid.UUID) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/{presentation_id}")
+    async def sync_status(presentation_id: str, db=Depends(get_sync_db)):
+        presentation = db.execute(_lookup(uuid.UUID(presentation_id), user_id)).scalars().first()
+        return {"status": presentation.status}
+
+    @app.get("/async/{presentation_id}")
+    async def async_status(presentation_id: str, db=Depends(get_async_db)):
+        presentation = (await db.execute(_lookup(uuid.UUID(presentation_id), user_id))).scalars().first()
+        return {"status": presentation.status}
+
+    return app
+
+
+def _populate(decks: int):
+    Base.metadata.create_all(bind=engine)
+    user_id = uuid.uuid4()
+    ids = [uuid.uuid4() for _ in range(decks)]
+    with engine.begin() as conn:
+        conn.execute(insert(Presentation), [
+            {"id": pid, "user_id": user_id, "title": f"Deck {i}", "markdown_content": "# Slide",
+             "html_content": "", "theme": "black", "status": "complete"}
+            for i, pid in enumerate(ids)
+        ])
+    return user_id, ids
+
+
+async def _load(client: httpx.AsyncClient, prefix: str, ids, requests: int, concurrency: int):
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with limit:
+            t0 = time.perf_counter()
+            response = await client.get(f"/{prefix}/{ids[i % len(ids)]}")
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    return requests / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+async def _run(args, user_id, ids):
+    transport = httpx.ASGITransport(app=_app(user_id))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for prefix in ("sync", "async"):
+            await _load(client, prefix, ids, min(args.requests, 50), args.concurrency)  # warm the pools
+            throughput, p50, p95 = await _load(client, prefix, ids, args.requests, args.concurrency)
+            label = "sync Session in async def" if prefix == "sync" else "AsyncSession"
+            print(f"  {label:28s} {throughput:8.1f} req/s  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms")
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+
+
+def main():
+    global LATENCY_MS
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--decks", type=int, default=1000)
+    args = parser.parse_args()
+
+    user_id, ids = _populate(args.decks)
+    for latency in sorted({0.0, args.latency_ms}):
+        LATENCY_MS = latency
+        print(f"{args.requests} requests, concurrency {args.concurrency}, simulated query latency {latency:g} ms")
+        asyncio.run(_run(args, user_id, ids))
+
+
+if __name__ == "__main__":
+    main()
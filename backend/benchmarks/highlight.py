@@ -0,0 +1,64 @@
+# backend/benchmarks/highlight.py
+"""
+Code-block highlighting: stock `codehilite` versus the cache installed by
+app/services/highlight.py, on decks that repeat the same boilerplate snippets.
+The slide memo is bypassed so only the highlight cache can help.
+
+Usage: python -m benchmarks.highlight [--slides 200] [--snippets 10]
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import markdown
+
+from app.services import highlight
+
+LANGS = ["python", "javascript", "java", "sql", "bash"]
+
+
+def _deck(slides: int, snippets: int):
+    deck = []
+    for i in range(slides):
+        n = i % snippets
+        lang = LANGS[n % len(LANGS)]
+        deck.append(f"## Slide {i}\n\n```{lang}\n// snippet {n}\nfunction f{n}(x) {{ return x * {n}; }}\n```\n")
+    return deck
+
+
+def _time(deck, repeats: int) -> float:
+    md = markdown.Markdown(extensions=["fenced_code", "codehilite"])
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for text in deck:
+            md.reset()
+            md.convert(text)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--snippets", type=int, default=10, help="distinct code blocks in the deck")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    deck = _deck(args.slides, args.snippets)
+    highlight.uninstall()
+    stock = _time(deck, args.repeats)
+    highlight.install()
+    cached = _time(deck, args.repeats)
+
+    print(f"{args.slides} slides, {args.snippets} distinct snippets")
+    print(f"  codehilite          {stock:9.2f} ms")
+    print(f"  cached highlighting {cached:9.2f} ms  ({stock / cached:.1f}x)")
+    print(f"  cache: {highlight.highlight_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
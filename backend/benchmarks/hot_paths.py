@@ -0,0 +1,257 @@
+# backend/benchmarks/hot_paths.py
+"""
+Rendering and pipeline hot paths on synthetic decks of 5 to 2,000 slides,
+offline (the LLM provider is replaced by an echo stub):
+
+- split            iter_slides over the whole deck
+- render           render_slides with SLIDE_EXTENSIONS (codehilite)
+- render-plain     the same extensions without codehilite
+- styled-html      generateStyledHTML: slide sections, reveal skeleton with
+                   the Pygments CSS, and cleanup of the (echoed) response
+- improve-post     improve_markdown: prompt assembly and response cleanup
+- build-pipeline   build_pipeline compile, LLM and local graphs
+- round-trip       POST /generate (llm mode) until /status is complete
+
+Each case reports p50/p95 wall time and the peak Python heap of one extra
+run (tracemalloc; render pool workers are separate processes and not
+counted). Every run renders text it has not seen, so the memo and highlight
+caches stay cold.
+
+Results are compared with benchmarks/baselines/hot_paths.json: a case
+regresses when its p50 or peak memory is more than --tolerance above the
+baseline (p50 also by more than --min-delta-ms, to ignore timer noise), and
+the command exits 1. Baselines are machine-specific; refresh them with
+--save-baseline on the machine that runs the comparison.
+
+Usage: python -m benchmarks.hot_paths [--sizes 5,50,500,2000] [--cases split,render]
+                                      [--repeats 7] [--save-baseline]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import count
+from typing import Callable, Dict, List, Optional
+
+db_path = os.path.join(tempfile.mkdtemp(), "hot_paths.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["USAGE_TRACKING_ENABLED"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.services.groq_service import GroqService
+from app.services.markdown_render import SLIDE_EXTENSIONS, render_slides
+from app.services.slides import iter_slides
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "hot_paths.json")
+PLAIN_EXTENSIONS = tuple(e for e in SLIDE_EXTENSIONS if e != "codehilite")
+CASES = ("split", "render", "render-plain", "styled-html", "improve-post", "build-pipeline", "round-trip")
+
+_salt = count()
+
+
+def _deck(slides: int) -> str:
+    """Mixed slides (bullets, a table, a code block); unique text on every call."""
+    salt = next(_salt)
+    parts = []
+    for i in range(slides):
+        parts.append(
+            f"# Slide {i}\n\n- first point {salt}\n- second point with **bold** and `code`\n\n"
+            + (f"| col | value |\n|-----|-------|\n| a | {i} |\n\n" if i % 3 == 0 else "")
+            + (f"```python\ndef f_{salt}_{i}(x):\n    return x * {i}\n```\n" if i % 2 == 0 else "")
+        )
+    return "\n---\n\n".join(parts)
+
+
+def _echo_provider(self, prompt: str, job=None, stage: str = "generate_text") -> str:
+    """Stands in for the Groq call: answers each prompt with what the real model would keep."""
+    if stage == "suggest_theme":
+        return "night"
+    if stage == "improve_markdown":
+        markdown = prompt.split("[MARKDOWN]", 1)[1].rsplit("[\\MARKDOWN]", 1)[0]
+        return f"```markdown\n{markdown}\n```\n"
+    return "Sure! Here is the presentation:\n\n" + prompt[prompt.find("<!doctype html>"):]
+
+
+GroqService.generate_text = _echo_provider
+
+
+def _service() -> GroqService:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return GroqService()
+
+
+def _build_pipeline_case(slides: int) -> Callable[[], None]:
+    from app.llm.graph import build_pipeline
+
+    def run():
+        build_pipeline(None, "bench-user", "llm")
+        build_pipeline(None, "bench-user", "local")
+    return run
+
+
+def _round_trip_case(slides: int) -> Callable[[], None]:
+    import httpx
+    from app.api.auth import MOCK_USERS, create_access_token
+    from app.main import app
+
+    user = next(iter(MOCK_USERS.values()))
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user['id'], 'email': user['email']})}"}
+
+    async def generate(client: httpx.AsyncClient):
+        response = await client.post("/api/presentations/generate", headers=headers, json={
+            # A new title each run: regenerating one deck would also time the version diff (benchmarks.version_chain)
+            "title": f"Bench {next(_salt)}", "markdown_input": _deck(slides), "theme": "ai-suggest", "render_mode": "llm", "enhance": True,
+        })
+        response.raise_for_status()
+        pid = response.json()["presentation_id"]
+        while True:
+            status = (await client.get(f"/api/presentations/{pid}/status", headers=headers)).json()["status"]
+            if status != "pending":
+                if status != "complete":
+                    raise RuntimeError(f"generation ended as {status}")
+                return
+            await asyncio.sleep(0.005)
+
+    # One loop for every run: the async engine's pooled connections belong to the loop that opened them
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=300)
+    return lambda: loop.run_until_complete(generate(client))
+
+
+def _case(name: str, slides: int, service: GroqService) -> Callable[[], None]:
+    if name == "split":
+        deck = _deck(slides)
+        return lambda: sum(1 for _ in iter_slides(deck))
+    if name == "render":
+        return lambda: render_slides(iter_slides(_deck(slides)), SLIDE_EXTENSIONS)
+    if name == "render-plain":
+        return lambda: render_slides(iter_slides(_deck(slides)), PLAIN_EXTENSIONS)
+    if name == "styled-html":
+        return lambda: service.generateStyledHTML("Bench", _deck(slides), "night")
+    if name == "improve-post":
+        deck = _deck(slides)
+        return lambda: service.improve_markdown("Bench", deck)
+    if name == "build-pipeline":
+        return _build_pipeline_case(slides)
+    if name == "round-trip":
+        return _round_trip_case(slides)
+    raise ValueError(f"unknown case {name!r}")
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def _measure(fn: Callable[[], None], repeats: int) -> Dict[str, float]:
+    fn()  # warm up: imports, converter pool, render pool, graph compile
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(_percentile(timings, 0.95), 3),
+        "peak_mb": round(peak / 1024 / 1024, 3),
+    }
+
+
+def _regressions(results: Dict, baseline: Dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    problems = []
+    for name, sizes in results.items():
+        for size, current in sizes.items():
+            previous = baseline.get(name, {}).get(size)
+            if previous is None:
+                continue
+            slower = current["p50_ms"] - previous["p50_ms"]
+            if current["p50_ms"] > previous["p50_ms"] * (1 + tolerance) and slower > min_delta_ms:
+                problems.append(f"{name} @ {size} slides: p50 {previous['p50_ms']:.2f} -> {current['p50_ms']:.2f} ms")
+            if current["peak_mb"] > previous["peak_mb"] * (1 + tolerance) and current["peak_mb"] - previous["peak_mb"] > 0.5:
+                problems.append(f"{name} @ {size} slides: peak {previous['peak_mb']:.2f} -> {current['peak_mb']:.2f} MB")
+    return problems
+
+
+def _load_baseline(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="5,50,500,2000", help="comma-separated slide counts")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated subset of: " + ", ".join(CASES))
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown/growth as a fraction")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    names = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = set(names) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    from app.db import engine
+    from app.migrations import run_migrations
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_migrations(engine)
+
+    service = _service()
+    baseline = None if args.save_baseline else _load_baseline(args.baseline)
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    print(f"{'case':16s} {'slides':>6s} {'p50 ms':>10s} {'p95 ms':>10s} {'peak MB':>9s}  vs baseline p50")
+    for name in names:
+        for size in sizes:
+            # The auth and pipeline debug prints (from any thread) would interleave with the table
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                current = _measure(_case(name, size, service), args.repeats)
+            results.setdefault(name, {})[str(size)] = current
+            previous = (baseline or {}).get(name, {}).get(str(size))
+            change = f"{(current['p50_ms'] / previous['p50_ms'] - 1) * 100:+6.1f}%" if previous and previous["p50_ms"] else ""
+            print(f"{name:16s} {size:6d} {current['p50_ms']:10.2f} {current['p95_ms']:10.2f} {current['peak_mb']:9.2f}  {change}")
+
+    from app.services.markdown_render import process_renderer
+    process_renderer.shutdown()
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        # Merge so a partial run (--cases/--sizes) only replaces what it measured
+        merged = _load_baseline(args.baseline) or {}
+        for name, by_size in results.items():
+            merged.setdefault(name, {}).update(by_size)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "repeats": args.repeats, "results": merged}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    problems = _regressions(results, baseline, args.tolerance, args.min_delta_ms)
+    if problems:
+        print(f"REGRESSION (over {args.tolerance:.0%} of baseline):")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print(f"OK: no case over {args.tolerance:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# backend/benchmarks/import_time.py
+"""
+Cold-start import time of `app.main`, measured with `python -X importtime`
+in fresh interpreters. Reports the median total, the most expensive modules
+by cumulative time and the app's own modules.
+
+Exits with status 1 when the median total is over `--budget-ms` or when a
+module that should only load on first use (LLM SDKs, LangGraph, markdown,
+Pygments) is imported at startup, so it can run as a CI gate.
+
+Usage: python -m benchmarks.import_time [--repeats 5] [--budget-ms 450]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Loaded on first use, never while importing the app
+LAZY_MODULES = ("langgraph", "supabase", "huggingface_hub", "requests", "markdown", "pygments")
+
+
+def _run_once() -> Dict[str, Tuple[int, int]]:
+    """Return {module: (self_us, cumulative_us)} for one fresh import of app.main."""
+    env = {**os.environ, "DATABASE_URL": "sqlite://", "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def _is_lazy(name: str) -> bool:
+    return any(name == m or name.startswith(m + ".") for m in LAZY_MODULES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=450)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs: List[Dict[str, Tuple[int, int]]] = [_run_once() for _ in range(args.repeats)]
+    totals = [run["app.main"][1] / 1000 for run in runs]
+    total = statistics.median(totals)
+
+    # Per-module medians over the runs
+    names = set().union(*runs)
+    cumulative = {
+        name: statistics.median(run[name][1] for run in runs if name in run) / 1000 for name in names
+    }
+
+    print(f"import app.main: {total:.1f} ms median over {args.repeats} runs (min {min(totals):.1f} ms)")
+    print(f"\nTop {args.top} modules by cumulative time:")
+    for name, ms in sorted(cumulative.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+    print("\nApp modules:")
+    for name, ms in sorted(cumulative.items(), key=lambda item: -item[1]):
+        if name.startswith("app."):
+            print(f"  {ms:8.1f} ms  {name}")
+
+    failed = False
+    eager = sorted(name for name in names if _is_lazy(name) and "." not in name)
+    if eager:
+        print(f"\nFAIL: imported at startup but should load on first use: {', '.join(eager)}")
+        failed = True
+    if total > args.budget_ms:
+        print(f"\nFAIL: {total:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print(f"\nOK: within the {args.budget_ms:.0f} ms budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+# backend/benchmarks/load_test.py
+"""
+End-to-end load test of one uvicorn process, as started by the Procfile.
+
+The harness starts the app in a subprocess (a temporary SQLite database,
+mock auth, the Groq call replaced by a sleep of --llm-latency-ms that echoes
+a plausible reply), registers --users users through /auth/register and then
+offers decks open-loop: arrivals follow a Poisson process at --rate decks/s
+for --duration seconds, whether or not earlier decks have finished, so a
+saturated server shows up as growing latency and errors instead of a
+politely slower client. Each arrival submits /generate, polls /status and
+fetches the finished deck.
+
+The report gives offered and achieved throughput, submit latency, queue
+wait (from /admin/scheduler), end-to-end p50/p95/p99 and the rate of each
+kind of error (429 from admission control, failed jobs, HTTP errors,
+timeouts). --url targets a server that is already running instead; it then
+uses whatever LLM provider that server has, and queue wait is only reported
+if --admin-email is in its ADMIN_EMAILS.
+
+Usage: python -m benchmarks.load_test [--rate 2] [--duration 60] [--users 20]
+                                      [--llm-latency-ms 1500] [--slides 10] [--json report.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+ADMIN_EMAIL = "loadtest-admin@example.com"
+
+
+def serve(port: int, latency_ms: float, jitter: float) -> None:
+    """Run the app with the fake provider; the harness starts this in a subprocess."""
+    import uvicorn
+
+    from app.services.groq_service import GroqService
+
+    def fake_generate_text(self, prompt: str, job=None, stage: str = "generate_text") -> str:
+        # Sleeping releases the GIL like a blocking HTTP call to the provider would
+        time.sleep(max(random.gauss(latency_ms, latency_ms * jitter), 0) / 1000)
+        if job:
+            job.check()
+        if stage == "suggest_theme":
+            return "night"
+        if stage == "improve_markdown":
+            return prompt.split("[MARKDOWN]", 1)[1].rsplit("[\\MARKDOWN]", 1)[0]
+        return prompt[prompt.find("<!doctype html>"):]
+
+    GroqService.generate_text = fake_generate_text
+    uvicorn.run("app.main:app", host="127.0.0.1", port=port, log_level="warning")
+
+
+@dataclass
+class DeckResult:
+    arrived_at: float
+    submit_ms: Optional[float] = None
+    end_to_end_ms: Optional[float] = None
+    outcome: str = "pending"
+    polls: int = 0
+
+
+@dataclass
+class Run:
+    args: argparse.Namespace
+    tokens: List[str] = field(default_factory=list)
+    results: List[DeckResult] = field(default_factory=list)
+
+
+def _deck(slides: int, n: int) -> str:
+    return "\n\n---\n\n".join(
+        f"# Slide {i}\n\n- point {n}.{i}\n- detail\n\n```python\nprint({i})\n```" for i in range(slides)
+    )
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+    pick = lambda q: round(ordered[min(int(len(ordered) * q), len(ordered) - 1)], 1)
+    return {"p50": round(statistics.median(ordered), 1), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 1)}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(args) -> subprocess.Popen:
+    workdir = tempfile.mkdtemp()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'load_test.db')}",
+        "SUPABASE_URL": "",
+        "GROQ_API_KEY": "load-test",
+        "ADMIN_EMAILS": ADMIN_EMAIL,
+        "RATE_LIMIT_ENABLED": "true" if args.rate_limits else "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    command = [
+        sys.executable, "-m", "benchmarks.load_test", "--serve", str(args.port),
+        "--llm-latency-ms", str(args.llm_latency_ms), "--llm-jitter", str(args.llm_jitter),
+    ]
+    # The app prints per request (auth, pipeline); keep it out of the report
+    log = open(os.path.join(workdir, "server.log"), "w")
+    print(f"Server log: {log.name}")
+    return subprocess.Popen(
+        command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+
+
+async def _wait_until_up(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def _register(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/api/auth/register", json={"email": email, "password": "load-test", "name": email})
+    if response.status_code == 400:
+        # Already registered (a reused --url server); log in instead
+        response = await client.post("/api/auth/token", data={"username": email, "password": "load-test"})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _one_deck(client: httpx.AsyncClient, run: Run, n: int, result: DeckResult) -> None:
+    args = run.args
+    headers = {"Authorization": f"Bearer {run.tokens[n % len(run.tokens)]}"}
+    try:
+        started = time.monotonic()
+        response = await client.post("/api/presentations/generate", headers=headers, json={
+            "title": f"Load {n}", "markdown_input": _deck(args.slides, n),
+            "theme": "ai-suggest", "render_mode": "llm", "enhance": True,
+        })
+        result.submit_ms = (time.monotonic() - started) * 1000
+        if response.status_code == 429:
+            result.outcome = "rejected_429"
+            return
+        response.raise_for_status()
+        pid = response.json()["presentation_id"]
+
+        deadline = result.arrived_at + args.timeout
+        while True:
+            await asyncio.sleep(args.poll_interval)
+            result.polls += 1
+            status = await client.get(f"/api/presentations/{pid}/status", headers=headers)
+            status.raise_for_status()
+            state = status.json()["status"]
+            if state == "complete":
+                break
+            if state == "failed":
+                result.outcome = "failed"
+                return
+            if time.monotonic() > deadline:
+                result.outcome = "timeout"
+                return
+
+        deck = await client.get(f"/api/presentations/{pid}", headers=headers)
+        deck.raise_for_status()
+        result.end_to_end_ms = (time.monotonic() - result.arrived_at) * 1000
+        result.outcome = "complete"
+    except httpx.HTTPStatusError as e:
+        result.outcome = f"http_{e.response.status_code}"
+    except httpx.HTTPError as e:
+        result.outcome = f"transport_{type(e).__name__}"
+
+
+async def _queue_wait(client: httpx.AsyncClient, admin_token: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not admin_token:
+        return None
+    response = await client.get("/api/admin/scheduler", headers={"Authorization": f"Bearer {admin_token}"})
+    if response.status_code != 200:
+        return None
+    stats = response.json()
+    users = [u for u in stats["users"].values() if u["dispatched"]]
+    dispatched = sum(u["dispatched"] for u in users)
+    return {
+        "workers": stats["workers"],
+        "avg_ms": round(sum(u["avg_wait_seconds"] * u["dispatched"] for u in users) / dispatched * 1000, 1) if dispatched else 0.0,
+        # Each user's p95 covers their last 200 jobs; the worst of them bounds the whole run's
+        "worst_user_p95_ms": round(max((u["p95_wait_seconds"] for u in users), default=0.0) * 1000, 1),
+        "max_ms": round(max((u["max_wait_seconds"] for u in users), default=0.0) * 1000, 1),
+        "still_queued": stats["queued"],
+    }
+
+
+async def _run(args) -> Dict[str, Any]:
+    run = Run(args)
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        await _wait_until_up(client)
+        tag = f"{int(time.time())}-{random.randrange(10**6)}"
+        run.tokens = await asyncio.gather(*(_register(client, f"load-{tag}-{i}@example.com") for i in range(args.users)))
+        admin_token = await _register(client, args.admin_email)
+
+        # Open loop: arrival times are fixed up front from the Poisson process
+        rng = random.Random(args.seed)
+        arrivals, t = [], rng.expovariate(args.rate)
+        while t < args.duration:
+            arrivals.append(t)
+            t += rng.expovariate(args.rate)
+
+        print(f"Offering {len(arrivals)} decks over {args.duration:.0f} s ({args.rate} decks/s, {args.users} users)")
+        tasks = []
+        began = time.monotonic()
+        for n, offset in enumerate(arrivals):
+            delay = began + offset - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            result = DeckResult(arrived_at=time.monotonic())
+            run.results.append(result)
+            tasks.append(asyncio.create_task(_one_deck(client, run, n, result)))
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - began
+        queue_wait = await _queue_wait(client, admin_token)
+
+    outcomes = Counter(r.outcome for r in run.results)
+    total = len(run.results)
+    completed = outcomes.get("complete", 0)
+    return {
+        "config": {
+            "rate": args.rate, "duration_s": args.duration, "users": args.users, "slides": args.slides,
+            "llm_latency_ms": args.llm_latency_ms if not args.external else None,
+        },
+        "decks": total,
+        "elapsed_s": round(elapsed, 2),
+        "offered_per_s": round(total / args.duration, 3) if args.duration else 0.0,
+        "throughput_per_s": round(completed / elapsed, 3) if elapsed else 0.0,
+        "submit_ms": _percentiles([r.submit_ms for r in run.results if r.submit_ms is not None]),
+        "queue_wait": queue_wait,
+        "end_to_end_ms": _percentiles([r.end_to_end_ms for r in run.results if r.end_to_end_ms is not None]),
+        "avg_polls": round(statistics.mean(r.polls for r in run.results), 1) if run.results else 0.0,
+        "outcomes": dict(outcomes),
+        "error_rate": round((total - completed) / total, 4) if total else 0.0,
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    def row(label: str, stats: Dict[str, Optional[float]]):
+        values = "  ".join(f"{key} {value:9.1f}" if value is not None else f"{key} {'-':>9s}" for key, value in stats.items())
+        print(f"  {label:18s} {values}")
+
+    print(f"\n{report['decks']} decks in {report['elapsed_s']} s")
+    print(f"  offered            {report['offered_per_s']:.3f} decks/s")
+    print(f"  throughput         {report['throughput_per_s']:.3f} decks/s completed")
+    row("submit (ms)", report["submit_ms"])
+    row("end-to-end (ms)", report["end_to_end_ms"])
+    wait = report["queue_wait"]
+    if wait:
+        print(f"  queue wait (ms)    avg {wait['avg_ms']:9.1f}  worst user p95 {wait['worst_user_p95_ms']:9.1f}  "
+              f"max {wait['max_ms']:9.1f}  ({wait['workers']} workers)")
+    else:
+        print("  queue wait         n/a (no admin access to /admin/scheduler)")
+    print(f"  error rate         {report['error_rate']:.2%}  {report['outcomes']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=2.0, help="mean deck arrivals per second")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of arrivals")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--llm-latency-ms", type=float, default=1500.0, help="mean fake latency per LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="latency standard deviation as a fraction of the mean")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--timeout", type=float, default=300.0, help="per deck, from arrival")
+    parser.add_argument("--max-connections", type=int, default=500)
+    parser.add_argument("--rate-limits", action="store_true", help="keep the app's request rate limits on")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--url", help="load a running server instead of starting one")
+    parser.add_argument("--admin-email", default=ADMIN_EMAIL)
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.llm_latency_ms, args.llm_jitter)
+        return
+
+    args.external = bool(args.url)
+    server = None
+    if not args.url:
+        args.port = _free_port()
+        args.url = f"http://127.0.0.1:{args.port}"
+        server = _start_server(args)
+    try:
+        report = asyncio.run(_run(args))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# backend/benchmarks/markdown_render.py
+"""
+Per-slide markdown rendering: fresh `markdown.markdown()` per slide versus the
+converter pool, and re-rendering a deck after editing one slide (memo hits).
+
+Usage: python -m benchmarks.markdown_render [--slides 100]
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import markdown
+
+from app.services.markdown_render import SLIDE_EXTENSIONS, render_cache, render_markdown
+
+
+def _deck(slides: int, tag: str = ""):
+    return [
+        f"## Slide {i}{tag}\n- point {i}\n- detail {i}\n\n```python\ndef f{i}(x):\n    return x * {i}\n```\n"
+        for i in range(slides)
+    ]
+
+
+def _time(fn, repeats: int = 5) -> float:
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=100)
+    args = parser.parse_args()
+
+    deck = _deck(args.slides)
+    naive = _time(lambda: [markdown.markdown(s, extensions=list(SLIDE_EXTENSIONS)) for s in deck])
+
+    counter = iter(range(10**9))
+    # Unique text each run so every slide misses the memo and only the pool helps
+    pooled = _time(lambda: [render_markdown(s, SLIDE_EXTENSIONS) for s in _deck(args.slides, f"-{next(counter)}")])
+
+    [render_markdown(s, SLIDE_EXTENSIONS) for s in deck]
+
+    def edit_and_render():
+        deck[len(deck) // 2] += f"- edited {next(counter)}\n"
+        [render_markdown(s, SLIDE_EXTENSIONS) for s in deck]
+
+    edited = _time(edit_and_render)
+
+    print(f"{args.slides} slides, extensions={','.join(SLIDE_EXTENSIONS)}")
+    print(f"  markdown.markdown per slide   {naive:8.2f} ms")
+    print(f"  pooled converters (cold memo) {pooled:8.2f} ms")
+    print(f"  re-render after 1-slide edit  {edited:8.2f} ms")
+    print(f"  memo: {render_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# backend/benchmarks/parallel_render.py
+"""
+Rendering a code-heavy deck with codehilite: serial versus the process pool
+used by `render_slides` past its thresholds. The memo is cleared before each
+run so every slide is actually converted; pool start-up is excluded.
+
+Usage: python -m benchmarks.parallel_render [--slides 200] [--processes 4]
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.services.markdown_render import (
+    SLIDE_EXTENSIONS, ProcessRenderer, converter_pool, render_cache,
+)
+
+SNIPPET = '''class Node{i}:
+    def __init__(self, value, children=None):
+        self.value = value
+        self.children = children or []
+
+    def walk(self):
+        yield self.value
+        for child in self.children:
+            yield from child.walk()
+'''
+
+
+def _deck(slides: int):
+    return [f"## Slide {i}\n\n- detail {i}\n\n```python\n{SNIPPET.format(i=i)}```\n" for i in range(slides)]
+
+
+def _time(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        render_cache.entries.clear()
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    deck = _deck(args.slides)
+
+    def serial():
+        out = []
+        for text in deck:
+            with converter_pool.converter(SLIDE_EXTENSIONS) as md:
+                out.append(md.convert(text))
+        return out
+
+    renderer = ProcessRenderer(args.processes, min_slides=1, min_code_blocks=1)
+    try:
+        assert renderer.render(deck, SLIDE_EXTENSIONS) == serial()  # warm up, check order
+        serial_ms = _time(serial, args.repeats)
+        pooled_ms = _time(lambda: renderer.render(deck, SLIDE_EXTENSIONS), args.repeats)
+    finally:
+        renderer.shutdown()
+
+    print(f"{args.slides} code slides, {args.processes} processes")
+    print(f"  serial        {serial_ms:9.2f} ms")
+    print(f"  process pool  {pooled_ms:9.2f} ms  ({serial_ms / pooled_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
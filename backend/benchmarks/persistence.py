@@ -0,0 +1,128 @@
+# backend/benchmarks/persistence.py
+"""
+Cost of writing generation results, per job, from several worker threads:
+
+- two writes: the previous path (persist node looks the row up by title and
+  commits, then the job fetches it again by id, records a version, commits)
+- single UPDATE: one conditional UPDATE by id plus the version, one commit
+- write-behind: the same writes queued and committed in groups (bulk jobs)
+
+Usage: python -m benchmarks.persistence [--jobs 400] [--threads 4] [--html-kb 100]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+db_path = os.path.join(tempfile.mkdtemp(), "persistence.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+from sqlalchemy import insert, update
+
+from app.db import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models import Presentation, PresentationVersion
+from app.services import versions
+from app.services.persistence import PresentationWrite, WriteBehindWriter, apply_write
+
+
+def _populate(jobs: int):
+    user_id = uuid.uuid4()
+    ids = [uuid.uuid4() for _ in range(jobs)]
+    with engine.begin() as conn:
+        conn.execute(insert(Presentation), [
+            {"id": pid, "user_id": user_id, "title": f"Deck {i}", "markdown_content": "# Draft",
+             "html_content": "", "theme": "black", "status": "pending"}
+            for i, pid in enumerate(ids)
+        ])
+    return str(user_id), [str(pid) for pid in ids]
+
+
+def _reset():
+    with engine.begin() as conn:
+        conn.execute(PresentationVersion.__table__.delete())
+        conn.execute(update(Presentation).values(status="pending", html_content="", markdown_content="# Draft"))
+
+
+def _values(i: int, html: str):
+    return {"markdown_content": f"# Deck {i}\n\n- improved", "html_content": html + str(i), "theme": "night", "status": "complete"}
+
+
+def _two_writes(user_id: str, pid: str, i: int, html: str):
+    values = _values(i, html)
+    with SessionLocal() as db:
+        presentation = db.query(Presentation).filter(
+            Presentation.user_id == uuid.UUID(user_id),
+            Presentation.title == f"Deck {i}",
+            Presentation.status == "pending",
+        ).order_by(Presentation.created_at.desc()).first()
+        for key, value in values.items():
+            setattr(presentation, key, value)
+        db.commit()
+        presentation = db.query(Presentation).filter(Presentation.id == uuid.UUID(pid)).first()
+        for key, value in values.items():
+            setattr(presentation, key, value)
+        versions.record_version(db, presentation, source="generate")
+        db.commit()
+
+
+def _single_update(user_id: str, pid: str, i: int, html: str):
+    with SessionLocal() as db:
+        apply_write(db, PresentationWrite(pid, user_id, _values(i, html), version_source="generate"))
+        db.commit()
+
+
+def _run(name: str, job, user_id: str, ids, args, html: str, finish=None):
+    _reset()
+    cursor = iter(range(len(ids)))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                i = next(cursor, None)
+            if i is None:
+                return
+            job(user_id, ids[i], i, html)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if finish:
+        finish()
+    elapsed = time.perf_counter() - t0
+    print(f"  {name:16s} {len(ids) / elapsed:8.1f} jobs/s  {elapsed / len(ids) * 1000:7.2f} ms/job")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--html-kb", type=int, default=100)
+    args = parser.parse_args()
+
+    run_migrations(engine)
+    user_id, ids = _populate(args.jobs)
+    html = "<section>slide</section>" * (args.html_kb * 1024 // 24)
+    print(f"{args.jobs} jobs, {args.threads} threads, {args.html_kb} KB of HTML each")
+    _run("two writes", _two_writes, user_id, ids, args, html)
+    _run("single UPDATE", _single_update, user_id, ids, args, html)
+
+    writer = WriteBehindWriter(SessionLocal)
+
+    def queued(user_id: str, pid: str, i: int, html: str):
+        writer.submit(PresentationWrite(pid, user_id, _values(i, html), version_source="generate"))
+
+    # Timed until every queued write is committed
+    _run("write-behind", queued, user_id, ids, args, html, finish=writer.stop)
+    stats = writer.stats()
+    print(f"  {'':16s} {stats['writes_per_commit']:8.1f} writes/commit  avg lag {stats['avg_lag_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# backend/benchmarks/presentation_cache.py
+"""
+GET /presentations/{id} and /status through the full app (mock auth), with
+the read-through presentation cache on and off. Decks are completed and
+large, like a rendered deck with highlighted code, so a miss pays for the
+query, row load and JSON serialization of the HTML.
+
+Usage: python -m benchmarks.presentation_cache [--requests 2000] [--decks 50] [--slides 200]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+db_path = os.path.join(tempfile.mkdtemp(), "presentation_cache.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import httpx
+from sqlalchemy import insert
+
+from app.api.auth import MOCK_USERS, create_access_token
+from app.db import engine
+from app.main import app
+from app.migrations import run_migrations
+from app.models import Presentation
+from app.services.presentation_cache import presentation_cache
+
+
+def _populate(user_id: str, decks: int, slides: int):
+    run_migrations(engine)
+    markdown = "\n\n---\n\n".join(f"# Slide {i}\n\n- point\n\n```python\nprint({i})\n```" for i in range(slides))
+    html = "".join(f'<section><h1>Slide {i}</h1><div class="codehilite"><pre>{"x" * 400}</pre></div></section>' for i in range(slides))
+    ids = [uuid.uuid4() for _ in range(decks)]
+    with engine.begin() as conn:
+        conn.execute(insert(Presentation), [
+            {"id": pid, "user_id": uuid.UUID(user_id), "title": f"Deck {i}", "markdown_content": markdown,
+             "html_content": html, "theme": "black", "status": "complete"}
+            for i, pid in enumerate(ids)
+        ])
+    return ids
+
+
+async def _load(client: httpx.AsyncClient, headers, paths, requests: int):
+    latencies = []
+    t0 = time.perf_counter()
+    for i in range(requests):
+        started = time.perf_counter()
+        response = await client.get(paths[i % len(paths)], headers=headers)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    return requests / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+async def _run(args):
+    user = next(iter(MOCK_USERS.values()))
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user['id'], 'email': user['email']})}"}
+    ids = _populate(user["id"], args.decks, args.slides)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for route, suffix in (("get", ""), ("status", "/status")):
+            paths = [f"/api/presentations/{pid}{suffix}" for pid in ids]
+            for enabled in (False, True):
+                presentation_cache.enabled = enabled
+                await _load(client, headers, paths, len(paths))  # warm up (and fill the cache)
+                throughput, p50, p95 = await _load(client, headers, paths, args.requests)
+                label = f"{route:6s} cache {'on ' if enabled else 'off'}"
+                print(f"  {label}  {throughput:8.1f} req/s  p50 {p50:6.2f} ms  p95 {p95:6.2f} ms")
+    print(f"  cache: {presentation_cache.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--decks", type=int, default=50)
+    parser.add_argument("--slides", type=int, default=200)
+    args = parser.parse_args()
+    print(f"{args.decks} decks of {args.slides} slides, {args.requests} sequential requests per run")
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# backend/benchmarks/search.py
+"""
+Full-text search latency on a SQLite database with many decks (FTS5 index
+maintained by triggers, as in production SQLite deployments).
+
+Usage: python -m benchmarks.search [--decks 100000] [--users 100]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+db_path = os.path.join(tempfile.mkdtemp(), "search.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+from sqlalchemy import insert
+
+from app.db import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models import Presentation
+from app.services.search import search_presentations
+
+WORDS = (
+    "python rust kubernetes docker pipeline database index query latency cache "
+    "revenue marketing roadmap quarterly design system onboarding security audit "
+    "neural network training dataset gradient transformer attention embedding "
+    "history biology chemistry physics algebra geometry literature poetry music"
+).split()
+
+
+def _deck(rng: random.Random, i: int) -> str:
+    slides = []
+    for s in range(rng.randint(5, 15)):
+        bullets = "\n".join(f"- {' '.join(rng.choices(WORDS, k=8))}" for _ in range(4))
+        slides.append(f"## Slide {s}\n{bullets}")
+    return "\n---\n".join(slides)
+
+
+def _populate(decks: int, users: int):
+    rng = random.Random(7)
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        for start in range(0, decks, 5000):
+            conn.execute(insert(Presentation), [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_ids[i % users],
+                    "title": " ".join(rng.choices(WORDS, k=3)).title(),
+                    "markdown_content": _deck(rng, i),
+                    "html_content": "",
+                    "theme": "black",
+                    "status": "complete",
+                }
+                for i in range(start, min(start + 5000, decks))
+            ])
+    return user_ids, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--decks", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    run_migrations(engine)
+    user_ids, load_seconds = _populate(args.decks, args.users)
+    print(f"{args.decks} decks for {args.users} users indexed in {load_seconds:.1f} s ({db_path})")
+
+    rng = random.Random(11)
+    queries = [
+        ("one term", lambda: rng.choice(WORDS)),
+        ("two terms", lambda: f"{rng.choice(WORDS)} {rng.choice(WORDS)}"),
+        ("prefix", lambda: rng.choice(WORDS)[:4]),
+    ]
+    db = SessionLocal()
+    try:
+        for name, make_query in queries:
+            timings = []
+            for _ in range(args.queries):
+                user_id = str(rng.choice(user_ids))
+                q = make_query()
+                t0 = time.perf_counter()
+                search_presentations(db, user_id, q, limit=20)
+                timings.append((time.perf_counter() - t0) * 1000)
+            timings.sort()
+            p95 = timings[int(0.95 * (len(timings) - 1))]
+            print(f"  {name:10s} p50 {statistics.median(timings):7.2f} ms   p95 {p95:7.2f} ms")
+    finally:
+        db.close()
+        os.unlink(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# backend/benchmarks/slide_splitter.py
+"""
+Slide splitting on multi-megabyte decks: the two splitters the services used
+before (regex split in reveal.py, substring split in groq_service.py) versus
+the shared single-pass `iter_slides`, reading from a string and from a file.
+
+Usage: python -m benchmarks.slide_splitter [--megabytes 4]
+"""
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.services.slides import iter_slides
+
+
+def legacy_regex(text: str):
+    text = text.strip()
+    if re.search(r"(?m)^\s*---\s*$", text):
+        return [p.strip() for p in re.split(r"(?m)^\s*---\s*$", text) if p.strip()]
+    return [p.strip() for p in re.split(r"\n(?=#\s)", text) if p.strip()]
+
+
+def legacy_substring(text: str):
+    if "---" in text:
+        return [s.strip() for s in text.split("---") if s.strip()]
+    return [p.strip() for p in re.split(r"\n(?=#\s)", text) if p.strip()]
+
+
+def _deck(megabytes: float) -> str:
+    slide = (
+        "# Slide {i}\n\n- first point\n- second point\n\n"
+        "| col | value |\n|-----|-------|\n| a | {i} |\n\n"
+        "```python\ndef f(x):\n    return x * {i}\n```\n"
+    )
+    parts, size, i = [], 0, 0
+    while size < megabytes * 1024 * 1024:
+        part = slide.format(i=i)
+        parts.append(part)
+        size += len(part) + 5
+        i += 1
+    return "\n---\n".join(parts)
+
+
+def _measure(fn, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        count = fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, statistics.median(timings), peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=float, default=4)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    text = _deck(args.megabytes)
+    with tempfile.NamedTemporaryFile("w", suffix=".md", delete=False, encoding="utf-8") as f:
+        f.write(text)
+        path = f.name
+
+    def from_file():
+        with open(path, encoding="utf-8") as fh:
+            return sum(1 for _ in iter_slides(fh))
+
+    cases = [
+        ("legacy regex split", lambda: len(legacy_regex(text))),
+        ("legacy substring split", lambda: len(legacy_substring(text))),
+        ("iter_slides (string)", lambda: sum(1 for _ in iter_slides(text))),
+        ("iter_slides (file, streamed)", from_file),
+    ]
+    try:
+        print(f"{len(text) / 1024 / 1024:.1f} MB deck")
+        for name, fn in cases:
+            count, median, peak = _measure(fn, args.repeats)
+            print(f"  {name:30s} {median:9.2f} ms  peak {peak:7.2f} MB  slides={count}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
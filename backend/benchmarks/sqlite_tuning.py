@@ -0,0 +1,130 @@
+# backend/benchmarks/sqlite_tuning.py
+"""
+Mixed read/write load on a SQLite file: status polls from many threads while
+background-job threads persist results, as on a single-node deployment.
+
+Compares the previous configuration (one engine, driver defaults, rollback
+journal) with the tuned one from app.db (WAL, pragmas, read-only pool and a
+single BEGIN IMMEDIATE writer). Reports reads/s, writes/s, p50/p95 latency
+and "database is locked" errors.
+
+Usage: python -m benchmarks.sqlite_tuning [--seconds 10] [--readers 8] [--writers 4]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base, create_tuned_sqlite_engines, routing_session_class
+from app.models import Presentation
+
+
+def _baseline(url: str):
+    engine = create_engine(url, connect_args={"check_same_thread": False}, pool_pre_ping=True)
+    return engine, sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def _tuned(url: str):
+    writer, reader = create_tuned_sqlite_engines(url)
+    return writer, sessionmaker(class_=routing_session_class(writer, reader), autocommit=False, autoflush=False)
+
+
+def _populate(engine, decks: int):
+    Base.metadata.create_all(bind=engine)
+    ids = [uuid.uuid4() for _ in range(decks)]
+    user_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(insert(Presentation), [
+            {"id": pid, "user_id": user_id, "title": f"Deck {i}", "markdown_content": "# Slide\n" * 50,
+             "html_content": "<section>x</section>" * 500, "theme": "black", "status": "complete"}
+            for i, pid in enumerate(ids)
+        ])
+    return ids
+
+
+def _run(name: str, factory, args):
+    path = os.path.join(tempfile.mkdtemp(), f"{name}.db")
+    engine, Session = factory(f"sqlite:///{path}")
+    ids = _populate(engine, args.decks)
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {"read": [], "write": [], "locked": 0, "other": 0}
+
+    def record(kind, started):
+        with lock:
+            results[kind].append((time.perf_counter() - started) * 1000)
+
+    def reader(n: int):
+        i = n
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with Session() as db:
+                    db.execute(select(Presentation.status).where(Presentation.id == ids[i % len(ids)])).first()
+                record("read", started)
+            except OperationalError as e:
+                with lock:
+                    results["locked" if "locked" in str(e) else "other"] += 1
+            i += 7
+
+    def writer(n: int):
+        i = n
+        html = "<section>rendered</section>" * 2000
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with Session() as db:
+                    presentation = db.get(Presentation, ids[i % len(ids)])
+                    presentation.html_content = html + str(i)
+                    presentation.status = "complete"
+                    db.commit()
+                record("write", started)
+            except OperationalError as e:
+                with lock:
+                    results["locked" if "locked" in str(e) else "other"] += 1
+            i += 13
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(args.writers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    print(f"{name}")
+    for kind in ("read", "write"):
+        timings = sorted(results[kind])
+        if timings:
+            p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+            print(f"  {kind}s  {len(timings) / args.seconds:9.1f}/s  p50 {statistics.median(timings):7.2f} ms  p95 {p95:8.2f} ms")
+        else:
+            print(f"  {kind}s  none completed")
+    print(f"  'database is locked' errors: {results['locked']}  other errors: {results['other']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--decks", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{args.readers} reader threads, {args.writers} writer threads, {args.seconds:g}s each")
+    _run("default (rollback journal, driver defaults)", _baseline, args)
+    _run("tuned (WAL, read pool, single writer)", _tuned, args)
+
+
+if __name__ == "__main__":
+    main()
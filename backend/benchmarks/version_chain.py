@@ -0,0 +1,102 @@
+# backend/benchmarks/version_chain.py
+"""
+Reconstruction time for deep version chains.
+
+Builds a chain of edited revisions of a synthetic deck in an in-memory SQLite
+database, then times reconstructing versions at increasing depth for several
+snapshot intervals, alongside the storage used compared to full copies.
+
+Usage: python -m benchmarks.version_chain [--versions 500] [--slides 60]
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.db import Base
+from app.models import Presentation, PresentationVersion
+from app.services import versions
+
+
+def _deck(slides: int, rng: random.Random) -> str:
+    return "\n---\n".join(
+        f"## Slide {i}\n- point {rng.randint(0, 10**6)}\n- detail {rng.randint(0, 10**6)}\n"
+        for i in range(slides)
+    )
+
+
+def _edit(markdown: str, rng: random.Random) -> str:
+    lines = markdown.splitlines()
+    for _ in range(3):
+        lines[rng.randrange(len(lines))] = f"- edited {rng.randint(0, 10**6)}"
+    return "\n".join(lines)
+
+
+def _html(markdown: str) -> str:
+    return "<html>\n" + "\n".join(f"<p>{line}</p>" for line in markdown.splitlines()) + "\n</html>"
+
+
+def run(chain_length: int, slides: int, interval: int, repeats: int = 5) -> None:
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    settings.version_snapshot_interval = interval
+    rng = random.Random(42)
+
+    with Session() as db:
+        presentation = Presentation(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), title="Bench", theme="black",
+            status="complete", markdown_content=_deck(slides, rng), html_content="",
+        )
+        presentation.html_content = _html(presentation.markdown_content)
+        db.add(presentation)
+        db.commit()
+
+        full_bytes = 0
+        start = time.perf_counter()
+        for _ in range(chain_length):
+            versions.record_version(db, presentation)
+            db.commit()
+            full_bytes += len(presentation.markdown_content) + len(presentation.html_content)
+            presentation.markdown_content = _edit(presentation.markdown_content, rng)
+            presentation.html_content = _html(presentation.markdown_content)
+        write_s = time.perf_counter() - start
+
+        stored_bytes = sum(
+            len(v.markdown_data) + len(v.html_data)
+            for v in db.query(PresentationVersion).all()
+        )
+        print(f"\ninterval={interval}: {chain_length} versions written in {write_s:.2f}s, "
+              f"storage {stored_bytes / 1024:.0f} KiB vs {full_bytes / 1024:.0f} KiB full copies "
+              f"({stored_bytes / full_bytes:.1%})")
+
+        for depth in sorted({1, interval // 2 or 1, interval - 1 or 1, chain_length}):
+            timings = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                versions.get_version_content(db, presentation.id, depth)
+                timings.append((time.perf_counter() - t0) * 1000)
+            print(f"  reconstruct v{depth:<5} median {statistics.median(timings):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--versions", type=int, default=500)
+    parser.add_argument("--slides", type=int, default=60)
+    parser.add_argument("--intervals", type=int, nargs="+", default=[5, 20, 100])
+    args = parser.parse_args()
+
+    for interval in args.intervals:
+        run(args.versions, args.slides, interval)
+
+
+if __name__ == "__main__":
+    main()
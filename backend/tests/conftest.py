@@ -0,0 +1,37 @@
+# backend/tests/conftest.py
+import os
+import sys
+import tempfile
+
+# The engines are created when app.db is imported: point them at a scratch database first
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tests.db')}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+# Tests that need the limiter build their own; the app-wide one would throttle the suite
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def migrated():
+    from app.db import engine
+    from app.migrations import run_migrations
+    run_migrations(engine)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client(migrated):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    from app.api.auth import MOCK_USERS, create_access_token
+    user = next(iter(MOCK_USERS.values()))
+    token = create_access_token({"sub": user["id"], "email": user["email"]})
+    return {"Authorization": f"Bearer {token}"}
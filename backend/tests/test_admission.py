@@ -0,0 +1,60 @@
+# backend/tests/test_admission.py
+import pytest
+
+from app.config import settings
+from app.services import admission
+from app.services.scheduler import GenerationScheduler
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = GenerationScheduler(workers=2, per_user_limit=1, tier_weights={}, initial_job_seconds=10)
+    monkeypatch.setattr(admission, "generation_scheduler", scheduler)
+    for name, value in {
+        "admission_max_queue_depth": 10,
+        "admission_max_drain_seconds": 100,
+        "admission_soft_queue_depth": 5,
+        "admission_soft_drain_seconds": 50,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    return scheduler
+
+
+def _queue(monkeypatch, scheduler, depth):
+    monkeypatch.setattr(scheduler, "queue_depth", lambda: depth)
+
+
+def test_accepts_below_the_soft_limits(monkeypatch, scheduler):
+    _queue(monkeypatch, scheduler, 2)
+    assert admission.check_admission().action == "accept"
+
+
+def test_degrades_at_the_soft_depth(monkeypatch, scheduler):
+    _queue(monkeypatch, scheduler, 5)
+    assert admission.check_admission().action == "degrade"
+
+
+def test_rejects_at_the_max_depth_with_retry_after(monkeypatch, scheduler):
+    _queue(monkeypatch, scheduler, 12)
+    decision = admission.check_admission()
+    assert decision.action == "reject"
+    # Three jobs over the limit, 10 s each across 2 workers
+    assert decision.retry_after == 15
+
+
+def test_drain_limits_wait_for_a_measured_job_time(monkeypatch, scheduler):
+    # 4 jobs * 30 s / 2 workers = 60 s drain: over the soft limit, but only once measured
+    _queue(monkeypatch, scheduler, 4)
+    scheduler.avg_job_seconds = 30
+    assert admission.check_admission().action == "accept"
+    scheduler.jobs_measured = 1
+    assert admission.check_admission().action == "degrade"
+    scheduler.avg_job_seconds = 60
+    assert admission.check_admission().action == "reject"
+
+
+def test_zero_disables_a_limit(monkeypatch, scheduler):
+    monkeypatch.setattr(settings, "admission_max_queue_depth", 0)
+    monkeypatch.setattr(settings, "admission_soft_queue_depth", 0)
+    _queue(monkeypatch, scheduler, 1000)
+    assert admission.check_admission().action == "accept"
@@ -0,0 +1,54 @@
+# backend/tests/test_auth.py
+from types import SimpleNamespace
+
+import pytest
+
+from app.api import auth
+from app.config import settings
+
+
+class _Supabase:
+    """Answers auth.get_user like the Supabase client, from a token -> email map."""
+
+    def __init__(self, users):
+        self.calls = 0
+        self.auth = SimpleNamespace(get_user=self._get_user)
+        self.users = users
+
+    def _get_user(self, token):
+        self.calls += 1
+        if token not in self.users:
+            raise RuntimeError("invalid JWT")
+        return SimpleNamespace(user=SimpleNamespace(id="u-1", email=self.users[token]))
+
+
+@pytest.fixture
+def remote_only(monkeypatch):
+    supabase = _Supabase({"admin-token": "Admin@Example.com", "user-token": "user@example.com"})
+    monkeypatch.setattr(settings, "supabase_url", "https://example.supabase.co")
+    monkeypatch.setattr(settings, "supabase_service_key", "service-key")
+    monkeypatch.setattr(settings, "auth_local_verification", False)
+    monkeypatch.setattr(settings, "admin_emails", ["admin@example.com"])
+    monkeypatch.setattr(auth, "get_supabase", lambda: supabase)
+    return supabase
+
+
+def test_admin_check_asks_supabase_without_local_verification(remote_only):
+    assert auth.is_admin_token("admin-token")
+    assert not auth.is_admin_token("user-token")
+    assert not auth.is_admin_token("forged")
+    assert auth.token_check_may_block("admin-token", remote=True)
+
+
+def test_rate_limit_identity_never_calls_supabase(remote_only):
+    assert auth.user_id_from_token("user-token") is None
+    assert not auth.token_check_may_block("user-token")
+    assert remote_only.calls == 0
+
+
+def test_mock_auth_admin_check(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_url", "")
+    monkeypatch.setattr(settings, "admin_emails", ["admin@example.com"])
+    token = auth.create_access_token({"sub": "u-1", "email": "admin@example.com"})
+    assert auth.is_admin_token(token)
+    assert not auth.token_check_may_block(token, remote=True)
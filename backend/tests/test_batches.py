@@ -0,0 +1,30 @@
+# backend/tests/test_batches.py
+import time
+
+from app.config import settings
+from app.llm import nodes
+
+
+def test_batch_longer_than_one_deadline_completes(client, auth_headers, monkeypatch):
+    # Six 0.3 s items one at a time take longer than the 1 s deadline of each
+    monkeypatch.setattr(settings, "generation_deadline_seconds", 1)
+    monkeypatch.setattr(settings, "bulk_concurrency", 1)
+    render = nodes.render_local_reveal
+
+    def slow_render(*args, **kwargs):
+        time.sleep(0.3)
+        return render(*args, **kwargs)
+
+    monkeypatch.setattr(nodes, "render_local_reveal", slow_render)
+    decks = [{"title": f"Batch deck {i}", "markdown_input": f"# Deck {i}\n\n- point", "render_mode": "local"} for i in range(6)]
+    response = client.post("/api/presentations/bulk", json={"decks": decks}, headers=auth_headers)
+    assert response.status_code == 202
+    batch_id = response.json()["batch_id"]
+
+    for _ in range(100):
+        batch = client.get(f"/api/presentations/batches/{batch_id}", headers=auth_headers).json()
+        if batch["status"] == "complete":
+            break
+        time.sleep(0.1)
+    assert batch["status"] == "complete"
+    assert [item["status"] for item in batch["items"]] == ["complete"] * 6
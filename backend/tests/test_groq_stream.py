@@ -0,0 +1,70 @@
+# backend/tests/test_groq_stream.py
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import groq_service
+from app.services.cancellation import CancellationToken, JobCancelled, JobDeadlineExceeded
+
+CHUNKS = [
+    b'data: {"choices": [{"delta": {"content": "# Deck"}}]}\n\n',
+    b'data: {"choices": [{"delta": {"content": "\\n- point"}}], "x_groq": {"usage": {"prompt_tokens": 3}}}\n\n',
+    b"data: [DONE]\n\n",
+]
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """A local stand-in for the Groq endpoint; `stall` seconds pass before the headers."""
+    state = {"stall": 0.0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            time.sleep(state["stall"])
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for chunk in CHUNKS:
+                self.wfile.write(chunk)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    monkeypatch.setattr(groq_service, "GROQ_CHAT_URL", f"http://127.0.0.1:{httpd.server_port}/chat")
+    yield state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _stream(token):
+    return groq_service.GroqService()._stream_completion({"messages": []}, token)
+
+
+def test_streams_the_completion(server):
+    assert _stream(CancellationToken()) == ("# Deck\n- point", {"prompt_tokens": 3})
+
+
+def test_cancel_before_the_first_byte(server):
+    server["stall"] = 5
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel, args=("superseded",)).start()
+    started = time.monotonic()
+    with pytest.raises(JobCancelled):
+        _stream(token)
+    assert time.monotonic() - started < 1.5
+
+
+def test_deadline_before_the_first_byte(server):
+    server["stall"] = 5
+    token = CancellationToken(deadline_seconds=0.3)
+    token.arm()
+    started = time.monotonic()
+    with pytest.raises(JobDeadlineExceeded):
+        _stream(token)
+    assert time.monotonic() - started < 1.5
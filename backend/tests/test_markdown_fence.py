@@ -0,0 +1,36 @@
+# backend/tests/test_markdown_fence.py
+from app.services.groq_service import unwrap_markdown_fence
+
+DECK = "# Intro\n\n- point\n\n---\n\n## Code\n\n```python\nprint('hi')\n```\n\n---\n\n## End\n\n- done"
+
+
+def test_unwraps_a_markdown_fence_around_the_whole_reply():
+    assert unwrap_markdown_fence(f"```markdown\n{DECK}\n```\n") == DECK
+    assert unwrap_markdown_fence(f"\n```md\n{DECK}\n```") == DECK
+
+
+def test_unwraps_a_bare_fence_around_the_whole_reply():
+    assert unwrap_markdown_fence(f"```\n{DECK}\n```") == DECK
+
+
+def test_keeps_code_blocks_inside_the_deck():
+    reply = f"```markdown\n{DECK}\n\n```js\nx()\n```\n```"
+    assert unwrap_markdown_fence(reply) == f"{DECK}\n\n```js\nx()\n```"
+
+
+def test_leaves_a_deck_that_opens_with_a_code_block():
+    deck = "```\nsetup.sh\n```\n\n# Slide\n\n- text\n\n```\nmore code\n```"
+    assert unwrap_markdown_fence(deck) == deck
+
+
+def test_leaves_a_deck_that_is_not_wrapped():
+    assert unwrap_markdown_fence(DECK) == DECK
+    reply = f"Here is the deck:\n\n```markdown\n{DECK}\n```"
+    assert unwrap_markdown_fence(reply) == reply
+
+
+def test_leaves_other_languages_and_trailing_text():
+    code = "```python\nprint('hi')\n```"
+    assert unwrap_markdown_fence(code) == code
+    reply = f"```markdown\n{DECK}\n```\nLet me know if you want changes."
+    assert unwrap_markdown_fence(reply) == reply
@@ -0,0 +1,104 @@
+# backend/tests/test_persistence.py
+import uuid
+from types import SimpleNamespace
+
+from app.db import SessionLocal
+from app.models import Presentation
+from app.services.persistence import PresentationWrite, WriteBehindWriter, apply_write
+
+
+def _pending(job_id: str, **values) -> SimpleNamespace:
+    row = dict(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), title="Deck", theme="night",
+        status="pending", markdown_content="# Deck", html_content="", job_id=job_id,
+    )
+    row.update(values)
+    with SessionLocal() as db:
+        db.add(Presentation(**row))
+        db.commit()
+    return SimpleNamespace(id=row["id"], user_id=row["user_id"])
+
+
+def _result(presentation: SimpleNamespace, job_id: str, **fields) -> PresentationWrite:
+    return PresentationWrite(
+        str(presentation.id), str(presentation.user_id),
+        {"markdown_content": "# Done", "html_content": "<h1>Done</h1>", "status": "complete"},
+        expect_job_id=job_id, **fields,
+    )
+
+
+def _row(presentation: SimpleNamespace) -> Presentation:
+    with SessionLocal(expire_on_commit=False) as db:
+        row = db.get(Presentation, presentation.id)
+        db.expunge(row)
+        return row
+
+
+def _apply(write: PresentationWrite) -> bool:
+    with SessionLocal() as db:
+        matched = apply_write(db, write)
+        db.commit()
+        return matched
+
+
+def test_the_owning_job_completes_a_pending_row(migrated):
+    presentation = _pending("current")
+    assert _apply(_result(presentation, "current"))
+    assert _row(presentation).status == "complete"
+
+
+def test_a_superseded_job_cannot_complete_the_newer_pending_row(migrated):
+    # The row was reset to pending for a newer job before the old one wrote
+    presentation = _pending("newer")
+    assert not _apply(_result(presentation, "older"))
+    row = _row(presentation)
+    assert (row.status, row.markdown_content) == ("pending", "# Deck")
+    assert _apply(_result(presentation, "newer"))
+
+
+def test_only_pending_rows_take_a_normal_result(migrated):
+    presentation = _pending("current", status="complete")
+    assert not _apply(_result(presentation, "current"))
+
+
+def test_the_wrong_user_never_matches(migrated):
+    presentation = _pending("current")
+    write = _result(presentation, "current")
+    write.user_id = str(uuid.uuid4())
+    assert not _apply(write)
+
+
+def test_write_behind_drops_queued_writes_of_superseded_jobs(migrated):
+    stale, current = _pending("newer"), _pending("current")
+    writer = WriteBehindWriter(SessionLocal, max_batch=10, max_delay=0.05)
+    try:
+        futures = [writer.submit(_result(stale, "older")), writer.submit(_result(current, "current"))]
+        assert [future.result(timeout=5) for future in futures] == [False, True]
+    finally:
+        writer.stop()
+    assert _row(stale).status == "pending"
+    assert _row(current).status == "complete"
+
+
+def _upgrade(presentation: SimpleNamespace, job_id: str) -> PresentationWrite:
+    # The LLM render replacing a local preview of "# Deck" rendered with "night"
+    return _result(presentation, job_id, expect_markdown="# Deck", expect_theme="night")
+
+
+def test_an_upgrade_replaces_an_unedited_preview(migrated):
+    presentation = _pending("current", status="complete", html_content="<h1>Preview</h1>")
+    assert _apply(_upgrade(presentation, "current"))
+    assert _row(presentation).markdown_content == "# Done"
+
+
+def test_an_upgrade_keeps_a_preview_whose_markdown_was_edited(migrated):
+    presentation = _pending("current", status="complete", markdown_content="# Edited")
+    assert not _apply(_upgrade(presentation, "current"))
+    assert _row(presentation).markdown_content == "# Edited"
+
+
+def test_an_upgrade_keeps_a_preview_whose_theme_was_edited(migrated):
+    presentation = _pending("current", status="complete", theme="moon")
+    assert not _apply(_upgrade(presentation, "current"))
+    row = _row(presentation)
+    assert (row.theme, row.markdown_content) == ("moon", "# Deck")
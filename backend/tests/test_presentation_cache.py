@@ -0,0 +1,104 @@
+# backend/tests/test_presentation_cache.py
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.api import presentations
+from app.services.presentation_cache import PresentationCache, SQLitePresentationCacheStore, cache_key
+
+USER = uuid.uuid4()
+
+
+@pytest.fixture
+def shared_path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def _cache(shared_path=None, **kwargs):
+    shared = SQLitePresentationCacheStore(shared_path) if shared_path else None
+    return PresentationCache(shared=shared, **kwargs)
+
+
+def _key():
+    return cache_key(USER, uuid.uuid4())
+
+
+def test_completed_decks_stay_until_invalidated():
+    cache = _cache()
+    key = _key()
+    cache.put(key, b"deck", "complete", cache.begin())
+    assert cache.get(key) == b"deck"
+    cache.invalidate(*key.split(":"))
+    assert cache.get(key) is None
+
+
+def test_pending_decks_expire():
+    cache = _cache(pending_ttl=0.05)
+    key = _key()
+    cache.put(key, b"deck", "pending", cache.begin())
+    assert cache.get(key) == b"deck"
+    time.sleep(0.1)
+    assert cache.get(key) is None
+
+
+def test_a_read_started_before_an_invalidation_is_not_cached(shared_path):
+    cache = _cache(shared_path)
+    key = _key()
+    stamp = cache.begin()
+    cache.invalidate(*key.split(":"))
+    cache.put(key, b"old row", "complete", stamp)
+    assert cache.get(key) is None
+    assert cache.stats()["stale_puts"] == 1
+
+
+def test_another_process_reads_through_the_shared_tier(shared_path):
+    writer, reader = _cache(shared_path), _cache(shared_path)
+    key = _key()
+    writer.put(key, b"deck", "complete", writer.begin())
+    assert reader.get_local(key) is None
+    assert reader.get_shared(key) == b"deck"
+    assert reader.get_local(key) == b"deck"
+    writer.invalidate(*key.split(":"))
+    assert writer.get_shared(key) is None
+
+
+def test_only_the_shared_tier_is_blocking(shared_path):
+    assert not _cache().blocking
+    assert _cache(shared_path).blocking
+
+
+def test_shared_tier_waits_off_the_event_loop(shared_path, monkeypatch):
+    cache = _cache(shared_path)
+    monkeypatch.setattr(presentations, "presentation_cache", cache)
+    key = _key()
+
+    # Another worker holds the file's write lock for half a second
+    holder = sqlite3.connect(shared_path, isolation_level=None, check_same_thread=False)
+    holder.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.5, holder.execute, args=("COMMIT",)).start()
+
+    async def main():
+        gaps = []
+
+        async def tick():
+            last = time.monotonic()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                gaps.append(now - last)
+                last = now
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0.02)
+        await presentations._cache_call(cache.put, key, b"deck", "complete", cache.begin())
+        # Let the ticker record the gap a blocked loop would have left
+        await asyncio.sleep(0.05)
+        ticker.cancel()
+        return max(gaps)
+
+    assert asyncio.run(main()) < 0.2
+    assert cache.get_shared(key) == b"deck"
@@ -0,0 +1,18 @@
+# backend/tests/test_query_plans.py
+from sqlalchemy import select
+
+from app.migrations.explain import HotQuery, _compiled, check_query_plans
+from app.models import LlmUsage
+
+
+def test_hot_queries_use_indexes(migrated):
+    results = check_query_plans(migrated)
+    assert results
+    assert {r.query.name: r.problems for r in results if not r.ok} == {}
+
+
+def test_reports_a_full_scan(migrated):
+    scan = HotQuery("usage by node", _compiled(select(LlmUsage).where(LlmUsage.node == "persist")))
+    [result] = check_query_plans(migrated, [scan])
+    assert not result.ok
+    assert "llm_usage" in result.problems[0]
@@ -0,0 +1,31 @@
+# backend/tests/test_rate_limit.py
+from app.services.rate_limit import MemoryRateLimitStore, RateLimitRule
+
+
+def test_limits_within_a_window():
+    store = MemoryRateLimitStore()
+    rule = RateLimitRule(3, 10)
+    results = [store.hit("user:/x", rule, 100.0 + i * 0.1)[0] for i in range(4)]
+    assert results == [True, True, True, False]
+    # Two windows later nothing is left to count
+    assert store.hit("user:/x", rule, 125.0)[0]
+
+
+def test_evicts_short_windows_behind_a_long_one():
+    store = MemoryRateLimitStore()
+    # Touched first, but its 1-hour window keeps it for two hours
+    store.hit("user:/export", RateLimitRule(10, 3600), 0.0)
+    for i in range(50):
+        store.hit(f"user{i}:/status", RateLimitRule(10, 1), 1.0)
+    store.hit("user:/poll", RateLimitRule(10, 1), 10.0)
+    assert set(store.entries) == {"user:/export", "user:/poll"}
+    assert store.evicted == 50
+
+
+def test_keeps_the_key_count_bounded():
+    store = MemoryRateLimitStore(max_keys=3)
+    rule = RateLimitRule(10, 60)
+    for i in range(10):
+        store.hit(f"user{i}:/x", rule, 100.0)
+    assert list(store.entries) == ["user7:/x", "user8:/x", "user9:/x"]
+    assert len(store.expiries) <= 2 * store.max_keys
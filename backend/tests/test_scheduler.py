@@ -0,0 +1,78 @@
+# backend/tests/test_scheduler.py
+import threading
+import time
+
+from app.services.scheduler import GenerationScheduler, _parse_weights
+
+
+def _run(scheduler, jobs, timeout=5):
+    """Hold the workers on one gate job, queue `jobs` ((user, tier) pairs), then record the start order."""
+    gate, started = threading.Event(), threading.Event()
+    order, done = [], threading.Semaphore(0)
+
+    def hold():
+        started.set()
+        gate.wait(timeout)
+
+    def record(label):
+        order.append(label)
+        done.release()
+
+    scheduler.submit("gate", hold)
+    assert started.wait(timeout)
+    for user, tier in jobs:
+        scheduler.submit(user, record, {"label": user}, tier)
+    gate.set()
+    for _ in jobs:
+        assert done.acquire(timeout=timeout)
+    return order
+
+
+def test_parse_weights():
+    assert _parse_weights("paid=4, interactive=2,bulk=0,bad") == {"paid": 4.0, "interactive": 2.0, "bulk": 0.01}
+
+
+def test_a_large_submission_does_not_starve_another_user():
+    scheduler = GenerationScheduler(workers=1, per_user_limit=1, tier_weights={})
+    order = _run(scheduler, [("a", "bulk")] * 4 + [("b", "bulk")] * 2)
+    assert order == ["a", "b", "a", "b", "a", "a"]
+
+
+def test_heavier_tiers_get_more_turns():
+    scheduler = GenerationScheduler(workers=1, per_user_limit=1, tier_weights={"paid": 2, "bulk": 1})
+    order = _run(scheduler, [("paid", "paid")] * 4 + [("free", "bulk")] * 4)
+    assert order[:6].count("paid") == 4
+
+
+def test_per_user_limit_caps_running_jobs():
+    scheduler = GenerationScheduler(workers=3, per_user_limit=1, tier_weights={})
+    lock = threading.Lock()
+    running, peak, done = [0], [0], threading.Semaphore(0)
+
+    def job():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        done.release()
+
+    for _ in range(4):
+        scheduler.submit("a", job)
+    for _ in range(4):
+        assert done.acquire(timeout=5)
+    assert peak[0] == 1
+    assert scheduler.stats()["users"]["a"]["dispatched"] == 4
+
+
+def test_a_failing_job_frees_its_slot():
+    scheduler = GenerationScheduler(workers=1, per_user_limit=1, tier_weights={})
+    ran = threading.Event()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    scheduler.submit("a", fail)
+    scheduler.submit("a", ran.set)
+    assert ran.wait(5)
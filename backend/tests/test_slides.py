@@ -0,0 +1,63 @@
+# backend/tests/test_slides.py
+import io
+
+from app.services.slides import iter_slides
+
+
+def slides(text):
+    return list(iter_slides(text))
+
+
+def test_splits_on_separator_lines_only():
+    deck = "# One\n\n| a | b |\n|---|---|\n| 1 | 2 |\n\n---\n\n# Two\n\n```\n---\n```\n\n---\n"
+    assert slides(deck) == ["# One\n\n| a | b |\n|---|---|\n| 1 | 2 |", "# Two\n\n```\n---\n```"]
+
+
+def test_falls_back_to_top_level_headings():
+    assert slides("# One\nbody\n## Sub\n# Two\nmore") == ["# One\nbody\n## Sub", "# Two\nmore"]
+
+
+def test_skips_front_matter():
+    deck = "\ufeff---\ntitle: Deck\ntags:\n  - a\n- b\n\ntheme: night\n...\n# One\n---\n# Two"
+    assert slides(deck) == ["# One", "# Two"]
+
+
+def test_keeps_an_unterminated_front_matter_candidate():
+    assert slides("---\nAgenda: today we cover X\n\n# Slide 2\nbody") == [
+        "Agenda: today we cover X\n\n# Slide 2\nbody",
+    ]
+    assert slides("---\ntitle: today we cover X\n\n# Slide 2\nbody") == [
+        "title: today we cover X\n\n# Slide 2\nbody",
+    ]
+
+
+def test_keeps_a_first_slide_that_is_not_front_matter():
+    assert slides("---\nAgenda: ...\n---\n# Slide 2") == ["Agenda: ...", "# Slide 2"]
+    assert slides("---\n# Intro\n---\n# Slide 2") == ["# Intro", "# Slide 2"]
+
+
+def test_accepts_an_iterable_of_lines():
+    deck = "---\ntitle: Deck\n---\n# One\r\n---\r\n# Two\r\n"
+    assert list(iter_slides(io.StringIO(deck))) == ["# One", "# Two"]
+
+
+def test_fence_rules():
+    # A tilde fence, and a backtick fence closed only by one at least as long
+    deck = "# A\n~~~\n---\n~~~\n---\n# B\n````\n```\n---\n````\n---\n# C"
+    assert slides(deck) == ["# A\n~~~\n---\n~~~", "# B\n````\n```\n---\n````", "# C"]
+    # Backticks in the info string make it inline code, not a fence
+    assert slides("# A\n```x`y\n---\n# B") == ["# A\n```x`y", "# B"]
+
+
+def test_an_unclosed_fence_runs_to_the_end():
+    assert slides("# A\n```\n---\n# B") == ["# A\n```\n---\n# B"]
+
+
+def test_separators_with_whitespace_and_crlf():
+    assert slides("# A\r\n  ---  \r\n# B\r\n") == ["# A", "# B"]
+
+
+def test_empty_slides_are_dropped():
+    assert slides("") == []
+    assert slides("---\n---\n\n---") == []
+    assert slides("# A\n---\n\n---\n# B") == ["# A", "# B"]
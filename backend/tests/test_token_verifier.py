@@ -0,0 +1,71 @@
+# backend/tests/test_token_verifier.py
+import time
+
+import jwt
+import pytest
+
+from app.services.token_verifier import TokenRejected, TokenVerifier
+
+SECRET = "test-secret-that-is-long-enough-for-hs256"
+
+
+def _token(secret=SECRET, expires_in=3600, **claims):
+    payload = {"sub": "u-1", "email": "user@example.com", "exp": int(time.time()) + expires_in, **claims}
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def test_verifies_and_caches_a_token():
+    verifier = TokenVerifier(secret=SECRET)
+    token = _token()
+    assert not verifier.is_cached(token)
+    assert verifier.verify(token) == {"id": "u-1", "email": "user@example.com"}
+    assert verifier.is_cached(token)
+    assert verifier.verify(token)["id"] == "u-1"
+    assert verifier.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("token", [
+    _token(secret="another-secret-that-is-long-enough-too"),
+    _token(expires_in=-10),
+    "not a jwt",
+])
+def test_rejects_bad_tokens(token):
+    with pytest.raises(TokenRejected):
+        TokenVerifier(secret=SECRET).verify(token)
+
+
+def test_rechecks_revocation_after_the_interval():
+    live = {"yes": True}
+    verifier = TokenVerifier(
+        secret=SECRET, revocation_interval=300,
+        remote_check=lambda token: {"id": "u-1"} if live["yes"] else None,
+    )
+    token = _token()
+    verifier.verify(token)
+    assert verifier.stats()["remote_checks"] == 0
+
+    key = next(iter(verifier.entries))
+    verifier.entries[key].checked_at -= 301
+    assert not verifier.is_cached(token)
+    live["yes"] = False
+    with pytest.raises(TokenRejected):
+        verifier.verify(token)
+    assert verifier.stats()["remote_checks"] == 1
+    assert not verifier.entries
+
+
+def test_asks_remote_when_no_key_can_verify():
+    verifier = TokenVerifier(remote_check=lambda token: {"id": "u-2", "email": None})
+    token = _token()
+    assert verifier.verify(token) == {"id": "u-2", "email": None}
+    assert verifier.is_cached(token)
+    with pytest.raises(TokenRejected):
+        TokenVerifier().verify(token)
+
+
+def test_cache_is_bounded():
+    verifier = TokenVerifier(secret=SECRET, max_entries=2)
+    tokens = [_token(sub=f"u-{i}") for i in range(3)]
+    for token in tokens:
+        verifier.verify(token)
+    assert [verifier.is_cached(t) for t in tokens] == [False, True, True]
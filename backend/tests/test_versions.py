@@ -0,0 +1,90 @@
+# backend/tests/test_versions.py
+import threading
+import uuid
+
+from app.db import SessionLocal
+from app.models import Presentation, PresentationVersion
+from app.services import versions
+
+
+def _presentation(db) -> Presentation:
+    presentation = Presentation(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), title="Deck", theme="night",
+        status="complete", markdown_content="# One", html_content="<h1>One</h1>",
+    )
+    db.add(presentation)
+    versions.record_version(db, presentation)
+    db.commit()
+    return presentation
+
+
+def test_concurrent_writers_take_distinct_version_numbers(migrated, monkeypatch):
+    with SessionLocal() as db:
+        presentation_id = _presentation(db).id
+
+    # Both writers read the same latest version before either inserts
+    barrier = threading.Barrier(2, timeout=10)
+    latest = versions._latest_version
+    first_read = threading.local()
+
+    def racing_latest(db, pid):
+        row = latest(db, pid)
+        if not getattr(first_read, "done", False):
+            first_read.done = True
+            barrier.wait()
+        return row
+
+    monkeypatch.setattr(versions, "_latest_version", racing_latest)
+    errors = []
+
+    def update(markdown: str, theme: str):
+        # Like PUT /presentations/{id}: the caller's own change must survive a conflict
+        try:
+            with SessionLocal() as db:
+                presentation = db.get(Presentation, presentation_id)
+                presentation.markdown_content = markdown
+                presentation.theme = theme
+                versions.record_version(db, presentation, source="update")
+                db.commit()
+        except Exception as e:
+            errors.append(e)
+
+    def persist(markdown: str):
+        # Like persistence.apply_write: a detached snapshot of the values just written
+        try:
+            with SessionLocal() as db:
+                snapshot = Presentation(
+                    id=presentation_id, title="Deck", theme="night",
+                    markdown_content=markdown, html_content="<h1>Two</h1>",
+                )
+                versions.record_version(db, snapshot)
+                db.commit()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=persist, args=("# Two",)),
+        threading.Thread(target=update, args=("# Three", "moon")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with SessionLocal() as db:
+        numbers = [v.version for v in db.query(PresentationVersion).filter(
+            PresentationVersion.presentation_id == presentation_id
+        ).order_by(PresentationVersion.version)]
+        assert numbers == [1, 2, 3]
+        assert db.get(Presentation, presentation_id).theme == "moon"
+        contents = {versions.get_version_content(db, presentation_id, n)["markdown_content"] for n in (2, 3)}
+        assert contents == {"# Two", "# Three"}
+
+
+def test_unchanged_content_records_nothing(migrated):
+    with SessionLocal() as db:
+        presentation = _presentation(db)
+        assert versions.record_version(db, presentation) is None
+        db.commit()
+        assert [v.version for v in versions.list_versions(db, presentation.id)] == [1]